@@ -0,0 +1,64 @@
+import argparse
+import json
+import platform
+import sys
+
+from bispy.benchmarks.benchmark import FAMILIES, ALGORITHMS, run_benchmarks
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bispy.benchmarks",
+        description="Measure the algorithms of BisPy on generated graphs, "
+        "and print the results as JSON.",
+    )
+    parser.add_argument(
+        "--family",
+        action="append",
+        choices=list(FAMILIES.keys()),
+        help="family of graphs (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        action="append",
+        choices=list(ALGORITHMS.keys()),
+        help="algorithm (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplies the size of the graphs (default: 1)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the generators"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="number of timed runs"
+    )
+    parser.add_argument(
+        "--output", help="write the JSON to this file instead of stdout"
+    )
+    args = parser.parse_args(args)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": run_benchmarks(
+            args.family, args.algorithm, args.scale, args.seed, args.repeat
+        ),
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import gc
+import time
+import tracemalloc
+import numpy as np
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List
+
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
+    dovier_piazza_policriti,
+)
+from bispy.saha.saha_partition import saha
+from bispy.benchmarks.graph_generators import (
+    GeneratedGraph,
+    chain,
+    balanced_tree,
+    random_dag,
+    dense_cyclic,
+    many_sccs,
+    labeled_random_graph,
+)
+
+# number of edges added one by one in the benchmark of Saha's algorithm
+SAHA_NEW_EDGES = 20
+# each new edge may cost a pass over the whole partition in Saha's algorithm,
+# therefore its graphs are smaller
+SAHA_SCALE = 0.1
+
+
+def _scaled(value: int, scale: float) -> int:
+    return max(int(value * scale), 1)
+
+
+# each family takes the scale and the seed, and returns a generated graph
+FAMILIES = {
+    "chain": lambda scale, seed: chain(_scaled(20000, scale)),
+    "balanced_tree": lambda scale, seed: balanced_tree(
+        2, max(int(np.log2(_scaled(32768, scale))), 1)
+    ),
+    "random_dag": lambda scale, seed: random_dag(
+        _scaled(10000, scale), _scaled(40000, scale), seed
+    ),
+    "dense_cyclic": lambda scale, seed: dense_cyclic(
+        _scaled(500, scale), 0.1, seed
+    ),
+    "many_sccs": lambda scale, seed: many_sccs(
+        _scaled(2000, scale), 5, seed=seed
+    ),
+    "large_labeling_set": lambda scale, seed: labeled_random_graph(
+        _scaled(10000, scale),
+        _scaled(30000, scale),
+        _scaled(1000, scale),
+        seed,
+    ),
+}
+
+
+def _run_paige_tarjan(graph: GeneratedGraph, engine: str):
+    edges, nvertexes, initial_partition = graph
+    paige_tarjan(edges, initial_partition, nvertexes=nvertexes, engine=engine)
+
+
+def _run_dovier_piazza_policriti(graph: GeneratedGraph):
+    edges, nvertexes, initial_partition = graph
+    dovier_piazza_policriti(edges, initial_partition, nvertexes=nvertexes)
+
+
+def _setup_saha(graph: GeneratedGraph, seed: int):
+    edges, nvertexes, initial_partition = graph
+
+    # the last edges (in a random order) are added incrementally
+    order = np.random.default_rng(seed).permutation(len(edges))
+    new_edges = edges[order[:SAHA_NEW_EDGES]]
+    old_edges = edges[order[SAHA_NEW_EDGES:]]
+
+    partition = saha(old_edges, initial_partition, nvertexes=nvertexes)
+    return (partition, [tuple(edge) for edge in new_edges.tolist()])
+
+
+def _run_saha(state):
+    partition, new_edges = state
+    for edge in new_edges:
+        partition.add_edge(edge, verbose=False)
+
+
+# setup takes the graph and the seed, and its result (not timed) is passed to
+# run (timed). processed_edges gives the number of edges processed by run,
+# and scale multiplies the size of the graphs
+_Algorithm = namedtuple(
+    "_Algorithm", ["setup", "run", "processed_edges", "scale"]
+)
+
+
+def _no_setup(graph: GeneratedGraph, seed: int) -> GeneratedGraph:
+    return graph
+
+
+def _nedges(graph: GeneratedGraph) -> int:
+    return len(graph[0])
+
+
+ALGORITHMS = {
+    "paige_tarjan": _Algorithm(
+        _no_setup,
+        lambda graph: _run_paige_tarjan(graph, "object"),
+        _nedges,
+        1.0,
+    ),
+    "paige_tarjan_array": _Algorithm(
+        _no_setup,
+        lambda graph: _run_paige_tarjan(graph, "array"),
+        _nedges,
+        1.0,
+    ),
+    "paige_tarjan_signature": _Algorithm(
+        _no_setup,
+        lambda graph: _run_paige_tarjan(graph, "signature"),
+        _nedges,
+        1.0,
+    ),
+    "dovier_piazza_policriti": _Algorithm(
+        _no_setup, _run_dovier_piazza_policriti, _nedges, 1.0
+    ),
+    "saha": _Algorithm(
+        _setup_saha,
+        _run_saha,
+        lambda graph: min(SAHA_NEW_EDGES, len(graph[0])),
+        SAHA_SCALE,
+    ),
+}
+
+
+def measure(
+    run: Callable[[Any], Any],
+    setup: Callable[[], Any] = None,
+    repeat: int = 1,
+) -> Dict[str, float]:
+    """Measure the wall time and the peak memory of `run`. The wall time is
+    the best of `repeat` runs. The peak memory is measured by `tracemalloc`
+    in a separate run, which does not affect the wall time.
+
+    :param run: The function to be measured, which takes the result of
+        `setup`.
+    :param setup: A function which prepares the argument of `run` (not
+        measured), called before each run. Defaults to `None`, in which case
+        `run` takes `None`.
+    :param repeat: The number of timed runs. Defaults to 1.
+    :returns: A dictionary which contains `wall_time` (seconds) and
+        `peak_memory` (bytes).
+    """
+
+    wall_time = float("inf")
+    for _ in range(repeat):
+        argument = None if setup is None else setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(argument)
+        wall_time = min(wall_time, time.perf_counter() - start)
+
+    argument = None if setup is None else setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"wall_time": wall_time, "peak_memory": peak_memory}
+
+
+def benchmark(
+    family: str,
+    algorithm: str,
+    scale: float = 1.0,
+    seed: int = 0,
+    repeat: int = 1,
+) -> Dict[str, Any]:
+    """Run one benchmark: generate a graph of the given family, and measure
+    the given algorithm on it.
+
+    :param family: The name of a family of graphs (see `FAMILIES`).
+    :param algorithm: The name of an algorithm (see `ALGORITHMS`):
+        `"paige_tarjan"`, `"paige_tarjan_array"`, `"paige_tarjan_signature"`,
+        `"dovier_piazza_policriti"`, or `"saha"` (a sequence of calls to
+        :meth:`bispy.saha.saha_partition.SahaPartition.add_edge`).
+    :param scale: Multiplies the size of the graph (graphs used for Saha's
+        algorithm are further scaled by `SAHA_SCALE`). Defaults to 1.
+    :param seed: Seed of the generator of the graph. Defaults to 0.
+    :param repeat: The number of timed runs. Defaults to 1.
+    :returns: A dictionary which describes the result of the benchmark (if
+        the algorithm raises an exception, its representation is stored with
+        the key `error`).
+    """
+
+    if family not in FAMILIES:
+        raise ValueError("Unknown family of graphs: {}".format(family))
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown algorithm: {}".format(algorithm))
+
+    setup, run, processed_edges, algorithm_scale = ALGORITHMS[algorithm]
+    graph = FAMILIES[family](scale * algorithm_scale, seed)
+
+    result = {
+        "family": family,
+        "algorithm": algorithm,
+        "nvertexes": graph[1],
+        "nedges": len(graph[0]),
+        "nlabels": 1 if graph[2] is None else len(graph[2]),
+    }
+    try:
+        result.update(
+            measure(run, setup=lambda: setup(graph, seed), repeat=repeat)
+        )
+    except Exception as error:
+        result["error"] = repr(error)
+        return result
+
+    if result["wall_time"] > 0:
+        result["edges_per_second"] = (
+            processed_edges(graph) / result["wall_time"]
+        )
+    else:
+        result["edges_per_second"] = float("inf")
+    return result
+
+
+def run_benchmarks(
+    families: Iterable[str] = None,
+    algorithms: Iterable[str] = None,
+    scale: float = 1.0,
+    seed: int = 0,
+    repeat: int = 1,
+) -> List[Dict[str, Any]]:
+    """Run the benchmark of each algorithm on each family of graphs.
+
+    :param families: The names of the families of graphs. Defaults to
+        `None`, in which case all the families are used.
+    :param algorithms: The names of the algorithms. Defaults to `None`, in
+        which case all the algorithms are used.
+    :param scale: Multiplies the size of the graphs. Defaults to 1.
+    :param seed: Seed of the generators of the graphs. Defaults to 0.
+    :param repeat: The number of timed runs. Defaults to 1.
+    :returns: A list of results (see :func:`benchmark`).
+    """
+
+    if families is None:
+        families = FAMILIES.keys()
+    if algorithms is None:
+        algorithms = ALGORITHMS.keys()
+
+    return [
+        benchmark(family, algorithm, scale, seed, repeat)
+        for family in families
+        for algorithm in algorithms
+    ]
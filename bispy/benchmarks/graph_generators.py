@@ -0,0 +1,159 @@
+import numpy as np
+from typing import List, Tuple
+
+# a generated graph: edges (array of shape (m,2)), number of vertexes and
+# initial partition (None for the trivial labeling set)
+GeneratedGraph = Tuple[np.ndarray, int, List[Tuple[int]]]
+
+
+def _as_edges(sources: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """Stack sources and destinations in an array of shape `(m,2)` with no
+    duplicate edges.
+
+    :param sources: Sources of the edges.
+    :param destinations: Destinations of the edges.
+    """
+
+    edges = np.stack(
+        (
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(destinations, dtype=np.int64),
+        ),
+        axis=1,
+    )
+    return np.unique(edges, axis=0)
+
+
+def chain(nvertexes: int) -> GeneratedGraph:
+    """A chain :math:`0 \\to 1 \\to \\dots \\to (\\textit{nvertexes}-1)`.
+    Every vertex has a different rank, therefore the maximum bisimulation is
+    the discrete partition, and the refinement needs one split for each
+    vertex.
+
+    :param nvertexes: The number of vertexes.
+    """
+
+    vertexes = np.arange(max(nvertexes - 1, 0))
+    return (_as_edges(vertexes, vertexes + 1), nvertexes, None)
+
+
+def balanced_tree(branching: int, height: int) -> GeneratedGraph:
+    """A directed balanced tree, numbered like
+    :func:`networkx.balanced_tree` (the children of `i` are
+    `branching*i + 1, ..., branching*i + branching`). The maximum bisimulation
+    has one block for each level.
+
+    :param branching: The number of children of each internal vertex.
+    :param height: The height of the tree.
+    """
+
+    nvertexes = sum(branching**level for level in range(height + 1))
+    children = np.arange(1, nvertexes)
+    return (_as_edges((children - 1) // branching, children), nvertexes, None)
+
+
+def random_dag(nvertexes: int, nedges: int, seed: int = 0) -> GeneratedGraph:
+    """A random directed acyclic graph. Each edge goes from a vertex to a
+    vertex which comes later in a random order of the vertexes.
+
+    :param nvertexes: The number of vertexes.
+    :param nedges: The number of (possibly duplicate) random edges, duplicates
+        and self loops are removed.
+    :param seed: Seed of the random number generator.
+    """
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(nvertexes)
+    pairs = np.sort(rng.integers(0, nvertexes, size=(nedges, 2)), axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return (_as_edges(order[pairs[:, 0]], order[pairs[:, 1]]), nvertexes, None)
+
+
+def dense_cyclic(
+    nvertexes: int, density: float = 0.1, seed: int = 0
+) -> GeneratedGraph:
+    """A dense strongly connected graph: a cycle through all the vertexes,
+    plus random edges. All the vertexes are non-well-founded.
+
+    :param nvertexes: The number of vertexes.
+    :param density: The fraction of the :math:`\\textit{nvertexes}^2`
+        possible edges drawn at random.
+    :param seed: Seed of the random number generator.
+    """
+
+    rng = np.random.default_rng(seed)
+    vertexes = np.arange(nvertexes)
+    nrandom = int(density * nvertexes * nvertexes)
+    sources = np.concatenate(
+        (vertexes, rng.integers(0, nvertexes, size=nrandom))
+    )
+    destinations = np.concatenate(
+        (
+            (vertexes + 1) % max(nvertexes, 1),
+            rng.integers(0, nvertexes, size=nrandom),
+        )
+    )
+    return (_as_edges(sources, destinations), nvertexes, None)
+
+
+def many_sccs(
+    nsccs: int, scc_size: int, nedges: int = None, seed: int = 0
+) -> GeneratedGraph:
+    """A graph made of `nsccs` strongly connected components of `scc_size`
+    vertexes each (a cycle plus a random chord), connected by random edges
+    which go from an SCC to an SCC with a lower index (therefore the SCCs
+    are exactly the cycles).
+
+    :param nsccs: The number of SCCs.
+    :param scc_size: The number of vertexes in each SCC.
+    :param nedges: The number of random edges between SCCs. Defaults to
+        `None`, in which case we use `2*nsccs`.
+    :param seed: Seed of the random number generator.
+    """
+
+    rng = np.random.default_rng(seed)
+    if nedges is None:
+        nedges = 2 * nsccs
+    nvertexes = nsccs * scc_size
+
+    vertexes = np.arange(nvertexes)
+    first = vertexes - vertexes % scc_size
+    cycle = first + (vertexes - first + 1) % scc_size
+    chord = first + rng.integers(0, scc_size, size=nvertexes)
+
+    sccs = np.sort(rng.integers(0, max(nsccs, 1), size=(nedges, 2)), axis=1)
+    sccs = sccs[sccs[:, 0] != sccs[:, 1]]
+    offsets = rng.integers(0, scc_size, size=sccs.shape)
+    between = sccs * scc_size + offsets
+
+    sources = np.concatenate((vertexes, vertexes, between[:, 1]))
+    destinations = np.concatenate((cycle, chord, between[:, 0]))
+    return (_as_edges(sources, destinations), nvertexes, None)
+
+
+def labeled_random_graph(
+    nvertexes: int, nedges: int, nlabels: int, seed: int = 0
+) -> GeneratedGraph:
+    """A random graph whose vertexes have one of `nlabels` random labels (the
+    initial partition has `nlabels` blocks, fewer if some label isn't used).
+
+    :param nvertexes: The number of vertexes.
+    :param nedges: The number of (possibly duplicate) random edges,
+        duplicates are removed.
+    :param nlabels: The number of labels.
+    :param seed: Seed of the random number generator.
+    """
+
+    rng = np.random.default_rng(seed)
+    edges = _as_edges(
+        rng.integers(0, nvertexes, size=nedges),
+        rng.integers(0, nvertexes, size=nedges),
+    )
+
+    labels = rng.integers(0, nlabels, size=nvertexes)
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    initial_partition = [
+        tuple(block.tolist()) for block in np.split(order, boundaries)
+    ]
+    return (edges, nvertexes, initial_partition)
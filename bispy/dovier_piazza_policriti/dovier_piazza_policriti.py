@@ -1,18 +1,44 @@
 import networkx as nx
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Iterable, List, Tuple, Dict, Union
 from itertools import islice
-from llist import dllist
 from bispy.utilities.graph_entities import _QBlock as _Block, _Vertex, _XBlock
-from bispy.utilities.graph_decorator import decorate_nx_graph
-from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    decorate_edge_list,
+    check_output,
+)
+from bispy.utilities.edge_list import is_edge_list
+from bispy.utilities.stats import Stats
+from bispy.paige_tarjan.paige_tarjan import (
+    paige_tarjan,
+    paige_tarjan_qblocks,
+)
+from bispy.paige_tarjan.array_paige_tarjan import array_paige_tarjan
+from bispy.utilities.array_graph import (
+    array_graph_from_edges,
+    block_array_to_tuple_list,
+    weakly_connected_components,
+)
+from bispy.parallel import assign_components, coarsen_union
+from bispy.utilities.quotient import (
+    vertexes_to_edge_arrays,
+    quotient_edges,
+    quotient_to_nx_graph,
+)
 from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
-    convert_to_integer_graph,
-    back_to_original,
+    NodeIndex,
 )
 from bispy.utilities.graph_entities import _XBlock
 from bispy.dovier_piazza_policriti.ranked_partition import RankedPartition
 
+# in parallel mode, rank layers smaller than this (vertexes plus edges) are
+# processed in the main process: sending them to the pool would cost more
+# than the computation
+_PARALLEL_LAYER_SIZE = 10000
+
 
 def collapse(block: _Block) -> Tuple[_Vertex, List[_Vertex]]:
     """Collapse the given block to a single vertex chosen randomly from the
@@ -24,25 +50,22 @@ def collapse(block: _Block) -> Tuple[_Vertex, List[_Vertex]]:
     """
 
     if block.vertexes.size > 0:
+        vertexes = iter(block.vertexes)
         # "randomly" select a survivor node
-        survivor_node = block.vertexes.first.value
+        survivor_node = next(vertexes)
 
         collapsed_nodes = []
 
-        vertex = block.vertexes.first.next
         # set all the other nodes to collapsed
-        while vertex is not None:
-            collapsed_nodes.append(vertex.value)
+        for vertex in vertexes:
+            collapsed_nodes.append(vertex)
 
             # append the counterimage of vertex to survivor_node
-            survivor_node.counterimage.extend(vertex.value.counterimage)
+            survivor_node.counterimage.extend(vertex.counterimage)
 
-            # acquire a pointer to the next vertex in the list
-            next_vertex = vertex.next
-            # remove the current vertex from the block
+            # remove the current vertex from the block (the iterator already
+            # points to the next vertex)
             block.vertexes.remove(vertex)
-            # point vertex to the next vertex to be collapsed
-            vertex = next_vertex
 
         return (survivor_node, collapsed_nodes)
     else:
@@ -120,13 +143,130 @@ def split_upper_ranks(partition: RankedPartition, block: _Block):
         mod_block.split_helper_block = None
 
 
+def _refine_components(
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    block: np.ndarray,
+    nvertexes: int,
+) -> np.ndarray:
+    """Compute the RSCP of a group of weakly connected components of a rank
+    layer, using the array implementation of *Paige-Tarjan*'s algorithm. This
+    is executed by the worker processes.
+
+    :param sources: Sources of the edges of the group.
+    :param destinations: Destinations of the edges of the group.
+    :param block: The block of the current partition each vertex belongs to.
+    :param nvertexes: The number of vertexes of the group.
+    :returns: An array which maps each vertex to the index of its block.
+    """
+
+    graph = array_graph_from_edges(sources, destinations, nvertexes)
+    graph.block = block
+    return array_paige_tarjan(graph)
+
+
+def _parallel_layer_rscp(
+    layer: List[_Block], nvertexes: int, executor: Executor, workers: int
+) -> List[List[_Vertex]]:
+    """Compute the RSCP of a rank layer whose vertexes were scaled to the
+    integers in :math:`[0, \\textit{nvertexes})` and restricted to the layer.
+    The weakly connected components of the layer are distributed among
+    `workers` groups of similar size, whose RSCP is computed by `executor`.
+    Vertexes in different components may be bisimilar, therefore the union
+    of the results (which is a bisimulation) is then coarsened (see
+    :func:`bispy.parallel.coarsen_union`).
+
+    :param layer: The blocks of the partition at the current rank.
+    :param nvertexes: The number of vertexes in the layer.
+    :param executor: The pool of worker processes.
+    :param workers: The number of worker processes.
+    :returns: The RSCP of the layer as a list of lists of vertexes, or `None`
+        if the layer is too small, or too connected, to be split among the
+        workers.
+    """
+
+    vertexes = [None] * nvertexes
+    block = np.empty(nvertexes, dtype=np.int64)
+    sources = []
+    destinations = []
+    for block_idx, layer_block in enumerate(layer):
+        for vertex in layer_block.vertexes:
+            vertexes[vertex.label] = vertex
+            block[vertex.label] = block_idx
+            for edge in vertex.image:
+                sources.append(vertex.label)
+                destinations.append(edge.destination.label)
+
+    if nvertexes + len(sources) < _PARALLEL_LAYER_SIZE:
+        return None
+
+    sources = np.array(sources, dtype=np.int64)
+    destinations = np.array(destinations, dtype=np.int64)
+
+    component = weakly_connected_components(sources, destinations, nvertexes)
+    if component.max() == 0:
+        return None
+    group = assign_components(component, sources, workers)
+    edge_group = group[sources]
+
+    local_label = np.empty(nvertexes, dtype=np.int64)
+    group_vertexes = []
+    futures = []
+    for group_idx in range(workers):
+        members = np.flatnonzero(group == group_idx)
+        if len(members) == 0:
+            continue
+        local_label[members] = np.arange(len(members))
+        edges = edge_group == group_idx
+        group_vertexes.append(members)
+        futures.append(
+            executor.submit(
+                _refine_components,
+                local_label[sources[edges]],
+                local_label[destinations[edges]],
+                block[members],
+                len(members),
+            )
+        )
+
+    # the union of the RSCPs of the groups
+    union_block = np.empty(nvertexes, dtype=np.int64)
+    nblocks = 0
+    for members, future in zip(group_vertexes, futures):
+        group_block = future.result()
+        union_block[members] = group_block.astype(np.int64) + nblocks
+        nblocks += int(group_block.max()) + 1
+
+    rscp_block = coarsen_union(sources, destinations, block, union_block)
+
+    return [
+        [vertexes[label] for label in rscp_labels]
+        for rscp_labels in block_array_to_tuple_list(rscp_block)
+    ]
+
+
 def dovier_piazza_policriti_partition(
-    partition: RankedPartition,
+    partition: RankedPartition, stats: Stats = None, workers: int = None
 ) -> Tuple[RankedPartition, List[List[_Vertex]]]:
     """Apply *Dovier-Piazza-Policriti*'s algorithm to the given ranked
     partition.
 
+    If `workers` is greater than 1, the nested *Paige-Tarjan* of the large
+    rank layers runs in a pool of `workers` processes, each of which takes a
+    group of weakly connected components of the layer (see
+    :func:`_parallel_layer_rscp`). The ranks are still processed in order,
+    since the partition at a rank depends on the blocks of all the lower
+    ranks.
+
     :param partition: A ranked partition (:math:`P` in the paper).
+    :param stats: If not `None`, the time spent for each rank in `"collapse"`,
+        `"split_upper_ranks"` and in the nested *Paige-Tarjan* (`"pta"`,
+        whose phases are recorded as well) is added to this object, as well
+        as the number of layers processed by the worker processes
+        (`"parallel_layers"`, see :class:`bispy.utilities.stats.Stats`).
+        Defaults to `None`.
+    :param workers: The number of worker processes. Defaults to `None`, in
+        which case everything runs in the current process.
     :returns: A tuple such that the first item is the partition at the end of
         the algorithm (which at this point is made of blocks of size 1
         containing only the vertexes which survived the collapse), and the
@@ -137,56 +277,123 @@ def dovier_piazza_policriti_partition(
     # maps each survivor node to a list of nodes collapsed into it
     collapse_map = [None for _ in range(partition.nvertexes)]
 
+    if (
+        workers is not None
+        and workers > 1
+        and partition.nvertexes >= _PARALLEL_LAYER_SIZE
+    ):
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = None
+
+    try:
+        _dovier_piazza_policriti_ranks(
+            partition, collapse_map, stats, executor, workers
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return (partition, collapse_map)
+
+
+def _dovier_piazza_policriti_ranks(
+    partition: RankedPartition,
+    collapse_map: List[List[_Vertex]],
+    stats: Stats,
+    executor: Executor,
+    workers: int,
+):
     # loop over the ranks
     for partition_idx in range(len(partition)):
+        if stats is not None:
+            rank = partition_idx - 1 if partition_idx > 0 else float("-inf")
+            start = stats.clock()
+
         if len(partition[partition_idx]) == 1:
             block = partition[partition_idx][0]
             survivor_vertex, collapsed_vertexes = collapse(block)
+            if stats is not None:
+                start = stats.record("collapse", start, rank)
             if survivor_vertex is not None:
                 # update the collapsed nodes map
                 collapse_map[survivor_vertex.label] = collapsed_vertexes
                 # update the partition
                 split_upper_ranks(partition, block)
+                if stats is not None:
+                    stats.record("split_upper_ranks", start, rank)
         # OPTIMIZATION: if at the current rank we only have blocks of single
         # vertexes, skip this step.
         elif any(map(lambda block: block.size > 1, partition[partition_idx])):
             current_label = 0
+            leaf_blocks = []
             for block in partition[partition_idx]:
+                leafs = []
                 for vertex in block.vertexes:
                     # scale vertex
                     vertex.scale_label(current_label)
                     current_label += 1
 
                     # exclude nodes having the wrong rank from the image and
-                    # counterimage of the vertex. from now they're gone
-                    # forever.
+                    # counterimage of the vertex. the original counterimage is
+                    # restored after PTA, since split_upper_ranks needs the
+                    # predecessors in the upper ranks.
                     vertex.restrict_to_subgraph(
                         validation=lambda vx: vx.rank == vertex.rank
                     )
+                    if len(vertex.image) == 0:
+                        leafs.append(vertex)
+
+                # PTA needs blocks which do not contain both leafs and
+                # non-leafs of the subgraph
+                if 0 < len(leafs) < block.size:
+                    leaf_blocks.append(block.fast_mitosis(leafs))
+            for leaf_block in leaf_blocks:
+                partition.append_at_index(leaf_block, partition_idx)
+
+            rscp = None
+            if executor is not None:
+                rscp = _parallel_layer_rscp(
+                    partition[partition_idx], current_label, executor, workers
+                )
+                if rscp is not None and stats is not None:
+                    stats.count("parallel_layers")
+            if rscp is None:
+                # apply PTA to the subgraph at the current examined rank
+                # CAREFUL: if you debug here, you'll see that there are some
+                # "duplicate" nodes (nodes with the same label in different
+                # blocks of the partition). this happens becaus of the
+                # SCALING (which is used to pass a normal graph to PTA)
+                rscp = [
+                    list(block.vertexes)
+                    for block in paige_tarjan_qblocks(
+                        partition[partition_idx], stats
+                    )
+                ]
 
-            # apply PTA to the subgraph at the current examined rank
-            # CAREFUL: if you debug here, you'll see that there are some
-            # "duplicate" nodes (nodes with the same label in different blocks
-            # of the partition). this happens becaus of the SCALING (which is
-            # used to pass a normal graph to PTA)
-            rscp = paige_tarjan_qblocks(partition[partition_idx])
+            if stats is not None:
+                start = stats.record("pta", start, rank)
+                stats.count("pta_calls")
 
             # clear the partition at the current rank
             partition.clear_index(partition_idx)
 
             # insert the new blocks in the partition at the current rank, and
             # collapse each block.
-            for block in rscp:
-                block_vertexes = []
-                for scaled_vertex in block.vertexes:
+            for block_vertexes in rscp:
+                for scaled_vertex in block_vertexes:
                     scaled_vertex.back_to_original_label()
-                    block_vertexes.append(scaled_vertex)
+                    scaled_vertex.back_to_original_graph()
+                    # a vertex belongs to one block at a time
+                    scaled_vertex.qblock.remove_vertex(scaled_vertex)
 
                 # we can set XBlock to None because PTA won't be called again
                 # on these blocks
                 internal_block = _Block(block_vertexes, None)
 
                 survivor_vertex, collapsed_vertexes = collapse(internal_block)
+                if stats is not None:
+                    start = stats.record("collapse", start, rank)
 
                 if survivor_vertex is not None:
                     # update the collapsed nodes map
@@ -195,19 +402,27 @@ def dovier_piazza_policriti_partition(
                     partition.append_at_index(internal_block, partition_idx)
                     # update the upper ranks with respect to this block
                     split_upper_ranks(partition, internal_block)
+                    if stats is not None:
+                        start = stats.record("split_upper_ranks", start, rank)
         else:
             for block in partition[partition_idx]:
                 # update the upper ranks with respect to this block
                 split_upper_ranks(partition, block)
-
-    return (partition, collapse_map)
+            if stats is not None:
+                stats.record("split_upper_ranks", start, rank)
 
 
 def dovier_piazza_policriti(
     graph: nx.Graph,
     initial_partition: List[Tuple[int]] = None,
     is_integer_graph: bool = False,
-) -> List[Tuple]:
+    nvertexes: int = None,
+    stats: Stats = None,
+    workers: int = None,
+    max_depth: int = None,
+    output: str = "tuples",
+    return_quotient: bool = False,
+) -> Union[List[Tuple], np.ndarray, Tuple]:
     """Compute the RSCP/maximum bisimulation of the given graph using
     *Dovier-Piazza-Policriti*'s algorithm.
 
@@ -223,49 +438,133 @@ def dovier_piazza_policriti(
     after the end of the computation. For this reason nodes of `graph` **must**
     be hashable objects.
 
+    The graph may also be given as an edge list (see
+    :func:`bispy.utilities.edge_list.edge_list_to_arrays`) whose vertexes are
+    the integers in :math:`[0, \\textit{nvertexes})`, in which case no
+    *NetworkX* graph is created.
+
     .. warning::
         Using a non integer graph and setting `is_integer_graph` to `True`
         will probably make the function fail with an exception, or, even worse,
         return a wrong output.
 
-    :param graph: The input graph.
+    :param graph: The input graph, as a *NetworkX* directed graph or as an edge
+        list (a *NumPy* array of shape `(m,2)`, a list of couples of integers,
+        or a *SciPy* sparse adjacency matrix).
     :param initial_partition: The initial partition (or labeling set). Defaults
         to `None`, in which case the trivial labeling set (one block which
         contains all the nodes) is used.
     :param is_integer_graph: If `True`, we do not check if the given graph is
         integer (saves time). If `is_integer_graph` is `True` but the graph
         is not integer the output may be wrong. Defaults to False.
-    :returns: The RSCP/maximum bisimulation of the given labeling set as a
-        list of tuples, each of which contains bisimilar nodes.
+    :param nvertexes: The number of vertexes, used only if `graph` is an edge
+        list. Defaults to `None`, in which case it's inferred from `graph`.
+    :param stats: If not `None`, the time spent in each phase (including the
+        construction of the internal representation of the graph and the
+        computation of the rank, the phase `"decorate"`) is added to this
+        object (see :func:`dovier_piazza_policriti_partition` and
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
+    :param workers: If greater than 1, the large rank layers are processed
+        in parallel by this number of worker processes (see
+        :func:`dovier_piazza_policriti_partition`). Defaults to `None`.
+    :param max_depth: If not `None`, compute the *k-bisimulation* for
+        :math:`k = \\textit{max_depth}` instead of the maximum bisimulation.
+        Blocks are not split rank by rank in this case: the *k-bisimulation*
+        is computed level by level by
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`, which skips the
+        well-founded vertexes whose rank is smaller than the current level.
+        Defaults to `None`.
+    :param output: The format of the result, `"tuples"` or `"labels"` (see
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Defaults to
+        `"tuples"`.
+    :param return_quotient: If `True`, we also return the quotient of the
+        graph with respect to the result (see
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Defaults to
+        `False`.
+    :returns: The RSCP/maximum bisimulation (or the *k-bisimulation*) of the
+        given labeling set as a list of tuples, each of which contains
+        bisimilar nodes (or in the format given by `output`), and the
+        quotient graph if `return_quotient` is `True`.
     """
 
-    if not isinstance(graph, nx.DiGraph):
-        raise Exception("graph should be a directed graph (nx.DiGraph)")
+    check_output(output)
+    if max_depth is not None:
+        return paige_tarjan(
+            graph,
+            initial_partition,
+            is_integer_graph=is_integer_graph,
+            nvertexes=nvertexes,
+            stats=stats,
+            max_depth=max_depth,
+            output=output,
+            return_quotient=return_quotient,
+        )
 
-    # if True, the input graph is already an integer graph
-    original_graph_is_integer = is_integer_graph or check_normal_integer_graph(
-        graph
-    )
+    if stats is not None:
+        start = stats.clock()
 
-    if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
+    # if None, the graph is an integer graph
+    node_index = None
+    if is_edge_list(graph):
+        vertexes, _ = decorate_edge_list(graph, nvertexes, initial_partition)
     else:
-        integer_graph = graph
-
-    vertexes, _ = decorate_nx_graph(integer_graph, initial_partition)
+        if not isinstance(graph, nx.DiGraph):
+            raise Exception("graph should be a directed graph (nx.DiGraph)")
+
+        if not (is_integer_graph or check_normal_integer_graph(graph)):
+            # nodes are translated to integers on the fly
+            node_index = NodeIndex(graph.nodes)
+            initial_partition = node_index.to_integer_partition(
+                initial_partition
+            )
+
+        vertexes, _ = decorate_nx_graph(
+            graph, initial_partition, node_index=node_index
+        )
+    if stats is not None:
+        stats.record("decorate", start)
     partition = RankedPartition(vertexes)
 
-    tp = dovier_piazza_policriti_partition(partition)
-    collapsed_partition, collapse_map = tp
+    tp = dovier_piazza_policriti_partition(partition, stats, workers)
+    if output == "labels" or return_quotient:
+        block = _collapsed_partition_to_block_array(*tp, len(vertexes))
 
+    if output == "labels":
+        result = block if node_index is None else (block, node_index)
+    elif node_index is None:
+        result = _collapsed_partition_to_rscp(*tp)
+    else:
+        result = node_index.to_original_partition(
+            _collapsed_partition_to_rscp(*tp)
+        )
+
+    if return_quotient:
+        quotient_sources, quotient_destinations = quotient_edges(
+            *vertexes_to_edge_arrays(vertexes), block
+        )
+        if output == "labels":
+            return (result, (quotient_sources, quotient_destinations))
+        return (
+            result,
+            quotient_to_nx_graph(
+                quotient_sources,
+                quotient_destinations,
+                int(block.max()) + 1 if len(block) > 0 else 0,
+            ),
+        )
+    return result
+
+
+def _collapsed_partition_to_rscp(
+    collapsed_partition: List[List[_Block]], collapse_map: List[List[_Vertex]]
+) -> List[Tuple[int]]:
     # from the collapsed partition obtained from FBA, build the RSCP (external
     # representation, List[Tuple[int]])
     rscp = []
     for rank in collapsed_partition:
         for block in rank:
             if block.vertexes.size > 0:
-                block_survivor_node = block.vertexes.first.value
+                block_survivor_node = block.vertexes.first
                 block_vertexes = [block_survivor_node.label]
 
                 if collapse_map[block_survivor_node.label] is not None:
@@ -277,8 +576,26 @@ def dovier_piazza_policriti(
                     )
 
                 rscp.append(tuple(block_vertexes))
+    return rscp
+
+
+def _collapsed_partition_to_block_array(
+    collapsed_partition: List[List[_Block]],
+    collapse_map: List[List[_Vertex]],
+    nvertexes: int,
+) -> np.ndarray:
+    # like _collapsed_partition_to_rscp, but the RSCP is an array which maps
+    # each vertex to the index of its block
+    block = np.empty(nvertexes, dtype=np.int64)
+    block_idx = 0
+    for rank in collapsed_partition:
+        for rank_block in rank:
+            if rank_block.vertexes.size > 0:
+                block_survivor_node = rank_block.vertexes.first
+                block[block_survivor_node.label] = block_idx
 
-    if original_graph_is_integer:
-        return rscp
-    else:
-        return back_to_original(rscp, node_to_idx)
+                if collapse_map[block_survivor_node.label] is not None:
+                    for vertex in collapse_map[block_survivor_node.label]:
+                        block[vertex.label] = block_idx
+                block_idx += 1
+    return block
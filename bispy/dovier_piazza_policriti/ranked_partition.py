@@ -29,6 +29,10 @@ class RankedPartition:
         rank_label = [{} for _ in range(list_positions)]
 
         for vertex in vertexes:
+            # a vertex belongs to one block at a time
+            if vertex.qblock is not None:
+                vertex.qblock.remove_vertex(vertex)
+
             rank_idx = RankedPartition.rank_to_partition_idx(vertex.rank)
 
             if vertex.initial_partition_block_id not in rank_label[rank_idx]:
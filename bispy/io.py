@@ -0,0 +1,336 @@
+import gzip
+import queue
+import threading
+import numpy as np
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Tuple
+
+from bispy.utilities.array_graph import index_dtype
+from bispy.utilities.graph_normalization import NodeIndex
+
+# number of bytes read from the file at a time
+_CHUNK_BYTES = 1 << 24
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+_WHITESPACE = np.frombuffer(b" \t\n\r\x0b\x0c", dtype=np.uint8)
+
+
+def open_graph_file(path: str) -> BinaryIO:
+    """Open the given file for reading in binary mode. Files compressed with
+    *gzip* (recognized by their first bytes, not by the extension) are
+    decompressed on the fly.
+
+    :param path: The path of the file.
+    """
+
+    with open(path, "rb") as file:
+        magic = file.read(len(_GZIP_MAGIC))
+    if magic == _GZIP_MAGIC:
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _read_lines(
+    file: BinaryIO, comments: str, chunk_bytes: int
+) -> Iterator[list]:
+    """Read the lines of the given file in chunks of about `chunk_bytes`
+    bytes, without comments and without blank lines.
+    """
+
+    comment = comments.encode() if comments is not None else None
+    while True:
+        lines = file.readlines(chunk_bytes)
+        if not lines:
+            return
+        if comment is not None and comment in b"".join(lines):
+            lines = [line.split(comment, 1)[0] for line in lines]
+        yield [line for line in lines if not line.isspace() and line]
+
+
+def _max_tokens_per_line(data: bytes) -> int:
+    """The maximum number of items separated by whitespace in a line of the
+    given text.
+    """
+
+    characters = np.frombuffer(data, dtype=np.uint8)
+    if len(characters) == 0:
+        return 0
+    is_space = np.isin(characters, _WHITESPACE)
+    token_start = ~is_space
+    token_start[1:] &= is_space[:-1]
+    line = np.cumsum(characters == ord("\n"))
+    return int(np.bincount(line[token_start]).max(initial=0))
+
+
+def iter_edge_list_chunks(
+    path: str,
+    delimiter: str = None,
+    comments: str = "#",
+    chunk_bytes: int = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Read the edge list in the given file in chunks, in the format of
+    :func:`networkx.read_edgelist`: a line for each edge, made of the source
+    and the destination separated by `delimiter`. Further items in a line
+    (for instance the data of the edge) are ignored.
+
+    The memory used does not depend on the size of the file, but only on
+    the size of the chunk.
+
+    :param path: The path of the file (optionally compressed with *gzip*).
+    :param delimiter: The string which separates the items of a line (for
+        instance `","` for CSV files). Defaults to `None`, in which case any
+        whitespace is a separator.
+    :param comments: The string which marks the beginning of a comment.
+        Defaults to `"#"`.
+    :param chunk_bytes: The approximate number of bytes in a chunk.
+        Defaults to `None`, in which case we use 16 MiB.
+    :returns: A generator which yields, for each chunk, the nodes found in
+        the chunk (as an array of `bytes`) and the edges of the chunk, as an
+        array of shape `(k,2)` of indexes of the first array.
+    """
+
+    if chunk_bytes is None:
+        chunk_bytes = _CHUNK_BYTES
+    separator = delimiter.encode() if delimiter is not None else None
+
+    with open_graph_file(path) as file:
+        for lines in _read_lines(file, comments, chunk_bytes):
+            if separator is None:
+                data = b"\n".join(lines)
+                nodes = data.split()
+                if len(nodes) == 2 * len(lines) and (
+                    _max_tokens_per_line(data) <= 2
+                ):
+                    # each line has two items, the nodes are split at once
+                    nodes = np.array(nodes, dtype=bytes)
+                    yield (nodes, np.arange(len(nodes)).reshape(-1, 2))
+                    continue
+
+            items = [line.split(separator, 2) for line in lines]
+            for line, line_items in zip(lines, items):
+                if len(line_items) < 2 or not line_items[1].strip():
+                    raise ValueError(
+                        "Failed to read the edge: {}".format(
+                            line.strip().decode(errors="replace")
+                        )
+                    )
+
+            nodes = [line_items[0] for line_items in items]
+            nodes.extend(line_items[1] for line_items in items)
+            if separator is not None:
+                nodes = [node.strip() for node in nodes]
+            nodes = np.array(nodes, dtype=bytes)
+            yield (nodes, np.arange(len(nodes)).reshape(2, -1).T)
+
+
+def iter_adjlist_chunks(
+    path: str,
+    delimiter: str = None,
+    comments: str = "#",
+    chunk_bytes: int = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Read the adjacency list in the given file in chunks, in the format of
+    :func:`networkx.read_adjlist`: a line for each node, made of the node
+    and of its successors separated by `delimiter`. Nodes without
+    successors are read as well.
+
+    :param path: The path of the file (optionally compressed with *gzip*).
+    :param delimiter: See :func:`iter_edge_list_chunks`.
+    :param comments: See :func:`iter_edge_list_chunks`.
+    :param chunk_bytes: See :func:`iter_edge_list_chunks`.
+    :returns: A generator which yields, for each chunk, the nodes found in
+        the chunk (as an array of `bytes`) and the edges of the chunk, as an
+        array of shape `(k,2)` of indexes of the first array.
+    """
+
+    if chunk_bytes is None:
+        chunk_bytes = _CHUNK_BYTES
+    separator = delimiter.encode() if delimiter is not None else None
+
+    with open_graph_file(path) as file:
+        for lines in _read_lines(file, comments, chunk_bytes):
+            tokens = []
+            line_size = []
+            for line in lines:
+                items = line.split(separator)
+                if separator is not None:
+                    items = [item.strip() for item in items if item.strip()]
+                tokens.extend(items)
+                line_size.append(len(items))
+
+            line_size = np.array(line_size, dtype=np.int64)
+            line_start = np.cumsum(line_size) - line_size
+            is_source = np.zeros(len(tokens), dtype=bool)
+            is_source[line_start] = True
+            edges = np.empty((len(tokens) - len(lines), 2), dtype=np.int64)
+            edges[:, 0] = np.repeat(line_start, line_size - 1)
+            edges[:, 1] = np.flatnonzero(~is_source)
+
+            yield (np.array(tokens, dtype=bytes), edges)
+
+
+def relabel_chunks(
+    chunks: Iterator[Tuple[np.ndarray, np.ndarray]],
+    node_to_idx: Dict[Any, int],
+    nodetype: Callable[[str], Any] = None,
+) -> Iterator[np.ndarray]:
+    """Map the nodes of the given chunks (see :func:`iter_edge_list_chunks`)
+    to dense integers, on the fly: a node which was not found in the
+    previous chunks is mapped to the first free integer. Each chunk is
+    reduced to its distinct nodes by sorting, therefore we query the hash
+    map `node_to_idx` once for each distinct node of the chunk.
+
+    :param chunks: The chunks.
+    :param node_to_idx: The hash map from the nodes to the integers, which is
+        updated in-place (usually empty at the beginning).
+    :param nodetype: A function which converts a node from `str` to the
+        type of the nodes (for instance `int`). Defaults to `None`, in which
+        case nodes are strings.
+    :returns: A generator which yields, for each chunk, its edges as an
+        array of shape `(k,2)` of integers.
+    """
+
+    for nodes, edges in chunks:
+        if nodetype is int:
+            nodes = nodes.astype(np.int64)
+        unique_nodes, inverse = np.unique(nodes, return_inverse=True)
+
+        if nodetype is int:
+            keys = unique_nodes.tolist()
+        elif nodetype is None:
+            keys = [node.decode() for node in unique_nodes.tolist()]
+        else:
+            keys = [nodetype(node.decode()) for node in unique_nodes.tolist()]
+        idx = np.fromiter(
+            (node_to_idx.setdefault(key, len(node_to_idx)) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+
+        yield idx[inverse.reshape(-1)][edges]
+
+
+def _prefetch(iterator: Iterator, depth: int = 2) -> Iterator:
+    """Consume the given iterator in a separate thread, keeping at most
+    `depth` items ahead of the consumer. Exceptions raised by the iterator
+    are raised by the consumer.
+    """
+
+    items = queue.Queue(maxsize=depth)
+    done = object()
+
+    def produce():
+        try:
+            for item in iterator:
+                items.put((item, None))
+        except BaseException as exception:
+            items.put((None, exception))
+        items.put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    while True:
+        item, exception = items.get()
+        if exception is not None:
+            thread.join()
+            raise exception
+        if item is done:
+            thread.join()
+            return
+        yield item
+
+
+def _read_graph(
+    chunks: Iterator[Tuple[np.ndarray, np.ndarray]],
+    nodetype: Callable[[str], Any],
+    threaded: bool,
+) -> Tuple[np.ndarray, NodeIndex]:
+    if threaded:
+        chunks = _prefetch(chunks)
+
+    node_to_idx = {}
+    edges = list(relabel_chunks(chunks, node_to_idx, nodetype))
+    if edges:
+        edges = np.concatenate(edges)
+    else:
+        edges = np.zeros((0, 2), dtype=np.int64)
+
+    # dict preserves the insertion order, namely the order of the integers
+    node_index = NodeIndex(node_to_idx.keys())
+    return (edges.astype(index_dtype(len(node_index))), node_index)
+
+
+def read_edge_list(
+    path: str,
+    delimiter: str = None,
+    comments: str = "#",
+    nodetype: Callable[[str], Any] = None,
+    threaded: bool = False,
+    chunk_bytes: int = None,
+) -> Tuple[np.ndarray, NodeIndex]:
+    """Read the edge list in the given file (whitespace separated, CSV,
+    optionally compressed with *gzip*, see :func:`iter_edge_list_chunks`)
+    without building a *NetworkX* graph. The file is parsed in chunks and
+    its nodes are mapped to the integers in :math:`[0, n)` on the fly (see
+    :func:`relabel_chunks`).
+
+    The result can be given directly to all the algorithms which accept an
+    edge list, and to :func:`bispy.utilities.graph_decorator
+    .decorate_edge_list`:
+
+        >>> edges, node_index = read_edge_list("graph.csv.gz", delimiter=",")
+        >>> rscp = paige_tarjan(edges, nvertexes=len(node_index))
+        >>> node_index.to_original_partition(rscp)
+
+    :param path: The path of the file.
+    :param delimiter: See :func:`iter_edge_list_chunks`.
+    :param comments: See :func:`iter_edge_list_chunks`.
+    :param nodetype: See :func:`relabel_chunks`.
+    :param threaded: If `True` the file is read and split in chunks by a
+        separate thread, while the chunks already read are relabeled.
+        Reading and decompressing the file release the *GIL*, therefore
+        they overlap with the relabeling. Defaults to `False`.
+    :param chunk_bytes: See :func:`iter_edge_list_chunks`.
+    :returns: The edges of the graph as an array of shape `(m,2)` of
+        integers, and the
+        :class:`bispy.utilities.graph_normalization.NodeIndex` which maps
+        the nodes to the integers.
+    """
+
+    return _read_graph(
+        iter_edge_list_chunks(path, delimiter, comments, chunk_bytes),
+        nodetype,
+        threaded,
+    )
+
+
+def read_adjlist(
+    path: str,
+    delimiter: str = None,
+    comments: str = "#",
+    nodetype: Callable[[str], Any] = None,
+    threaded: bool = False,
+    chunk_bytes: int = None,
+) -> Tuple[np.ndarray, NodeIndex]:
+    """Read the adjacency list in the given file (see
+    :func:`iter_adjlist_chunks`) without building a *NetworkX* graph (see
+    :func:`read_edge_list`). Nodes without successors are mapped to an
+    integer as well.
+
+    :param path: The path of the file.
+    :param delimiter: See :func:`iter_adjlist_chunks`.
+    :param comments: See :func:`iter_adjlist_chunks`.
+    :param nodetype: See :func:`relabel_chunks`.
+    :param threaded: See :func:`read_edge_list`.
+    :param chunk_bytes: See :func:`iter_adjlist_chunks`.
+    :returns: The edges of the graph as an array of shape `(m,2)` of
+        integers, and the
+        :class:`bispy.utilities.graph_normalization.NodeIndex` which maps
+        the nodes to the integers.
+    """
+
+    return _read_graph(
+        iter_adjlist_chunks(path, delimiter, comments, chunk_bytes),
+        nodetype,
+        threaded,
+    )
@@ -0,0 +1,652 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+from bispy.utilities.array_graph import ArrayGraph, index_dtype, _ranges
+from bispy.utilities.stats import Stats
+
+# refinement steps whose splitters contain at most this number of vertexes
+# are performed without vectorization
+_SMALL_STEP = 32
+
+
+class _RefinablePartition:
+    """The state of the array-based *Paige-Tarjan* algorithm.
+
+    The partition :math:`Q` is a *refinable partition*: `elems` is a
+    permutation of the vertexes such that the vertexes of each block of
+    :math:`Q` are contiguous (the block `q` is
+    `elems[qfirst[q]:qend[q]]`), and `loc` is its inverse.
+
+    The partition :math:`X` is not stored explicitly: each refinement step
+    processes all the compound blocks of :math:`X`, after which every block
+    of :math:`X` contains exactly one block of :math:`Q`. Therefore the
+    compound blocks of :math:`X` at the beginning of a step are the blocks of
+    :math:`Q` split during the previous one, and we only need to keep the
+    list of the blocks of :math:`Q` they contain (`compound_qblocks`) and
+    which compound block each of them belongs to (`compound_xblock`).
+
+    Values of `count(x,S)` are stored in `counts`, and `count_slot[e]` is the
+    slot of `counts` which holds the value for the source of the edge `e` and
+    the block of :math:`X` its destination belongs to.
+
+    If the edges are labeled, each label :math:`a` is a relation
+    :math:`E_a` and the partition is refined with respect to
+    :math:`E_a^{-1}(B)` for each label. In this case `counts` holds
+    `count(x,a,S)` (the number of edges with label :math:`a` from
+    :math:`x` to :math:`S`), and the splitters are the couples (block of
+    :math:`Q`, label).
+
+    :param graph: The graph. `graph.block` is the initial partition.
+    :param stats: If not `None`, the instrumentation data of each refinement
+        step is added to this object. Defaults to `None`.
+    """
+
+    def __init__(self, graph: ArrayGraph, stats: Stats = None):
+        self.graph = graph
+        self.stats = stats
+        nvertexes = graph.nvertexes
+        vertex_dtype = index_dtype(nvertexes)
+
+        # we need a stable initial partition with respect to V, therefore we
+        # separate leafs and non-leafs
+        if graph.label is None:
+            key = graph.block.astype(np.int64) * 2 + (graph.out_degree() > 0)
+        else:
+            # for each label separately: vertexes remain together iff their
+            # edges have the same set of labels
+            key = graph.block.astype(np.int64)
+            pairs = np.unique(
+                graph.edge_sources().astype(np.int64) * graph.nlabels
+                + graph.label
+            )
+            if len(pairs) > 0:
+                touched, group = self.group_by_codes(
+                    pairs // graph.nlabels, pairs % graph.nlabels, key
+                )
+                key[touched] = (int(key.max()) + 1) + group
+        _, qblock = np.unique(key, return_inverse=True)
+        self.qblock = qblock.astype(vertex_dtype).ravel()
+        nqblocks = int(self.qblock.max()) + 1 if nvertexes > 0 else 0
+
+        self.elems = np.argsort(self.qblock, kind="stable").astype(
+            vertex_dtype
+        )
+        self.loc = np.empty(nvertexes, dtype=vertex_dtype)
+        self.loc[self.elems] = np.arange(nvertexes, dtype=vertex_dtype)
+
+        # each block of Q is identified by an integer, there are at most
+        # nvertexes blocks
+        self.qfirst = np.zeros(nvertexes, dtype=np.int64)
+        self.qend = np.zeros(nvertexes, dtype=np.int64)
+        self.qend[:nqblocks] = np.cumsum(
+            np.bincount(self.qblock, minlength=nqblocks)
+        )
+        self.qfirst[1:nqblocks] = self.qend[: nqblocks - 1]
+        self.nqblocks = nqblocks
+
+        # initially there's only one block in X, which contains all the
+        # blocks of Q
+        if nqblocks > 1:
+            self.compound_qblocks = np.arange(nqblocks)
+        else:
+            self.compound_qblocks = np.zeros(0, dtype=np.int64)
+        self.compound_xblock = np.zeros_like(self.compound_qblocks)
+
+        # scratch space used to mark vertexes
+        self.marked = np.zeros(nvertexes, dtype=bool)
+
+        # a slot of counts whose value drops to zero is recycled, therefore
+        # we never need more than nvertexes + nedges slots
+        self.counts = np.zeros(nvertexes + graph.nedges, dtype=np.int32)
+        self.counts[: len(graph.counts)] = graph.counts
+        self.next_slot = len(graph.counts)
+        self.free_slots = np.zeros(16, dtype=graph.count_slot.dtype)
+        self.nfree_slots = 0
+
+    def allocate_slots(self, n: int) -> np.ndarray:
+        """Allocate `n` slots in `counts`, reusing the free slots first.
+
+        :param n: The number of slots needed.
+        """
+
+        from_free = min(n, self.nfree_slots)
+        self.nfree_slots -= from_free
+        slots = self.free_slots[self.nfree_slots:self.nfree_slots + from_free]
+
+        if from_free < n:
+            fresh = np.arange(
+                self.next_slot,
+                self.next_slot + n - from_free,
+                dtype=self.free_slots.dtype,
+            )
+            self.next_slot += n - from_free
+            slots = np.concatenate((slots, fresh))
+        else:
+            slots = slots.copy()
+        return slots
+
+    def release_slots(self, slots: np.ndarray):
+        """Put the given slots of `counts` in the list of free slots.
+
+        :param slots: The slots to be released.
+        """
+
+        needed = self.nfree_slots + len(slots)
+        if needed > len(self.free_slots):
+            grown = np.zeros(
+                max(needed, 2 * len(self.free_slots)),
+                dtype=self.free_slots.dtype,
+            )
+            grown[: self.nfree_slots] = self.free_slots[: self.nfree_slots]
+            self.free_slots = grown
+        self.free_slots[self.nfree_slots:needed] = slots
+        self.nfree_slots = needed
+
+    def extract_splitters(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Select as splitters all the blocks of :math:`Q` of each compound
+        block of :math:`X` but the largest one, which therefore contain at
+        most half of the vertexes of their block of :math:`X`.
+
+        :returns: A tuple whose items are:
+
+            0. The splitters;
+            1. For each of them, the index of the compound block of
+               :math:`X` which contained it.
+        """
+
+        qblocks = self.compound_qblocks
+        xblock = self.compound_xblock
+        sizes = self.qend[qblocks] - self.qfirst[qblocks]
+
+        # the largest block of Q of each block of X comes first
+        order = np.lexsort((-sizes, xblock))
+        largest = np.ones(len(order), dtype=bool)
+        largest[1:] = xblock[order[1:]] != xblock[order[:-1]]
+        removed = np.ones(len(qblocks), dtype=bool)
+        removed[order[largest]] = False
+
+        return qblocks[removed], xblock[removed]
+
+    @staticmethod
+    def group_by_codes(
+        vertexes: np.ndarray, codes: np.ndarray, qblock: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Given a list of couples `(vertexes[i], codes[i])`, group the
+        vertexes which belong to the same block of :math:`Q` and are paired
+        with exactly the same set of codes.
+
+        :param vertexes: An array of vertexes (may contain duplicates).
+        :param codes: An array of non-negative codes, such that each couple
+            is distinct.
+        :param qblock: The block of :math:`Q` of each vertex.
+        :returns: A tuple whose items are:
+
+            0. The distinct vertexes in `vertexes`;
+            1. The group of each of them (two vertexes belong to the same
+               group if and only if they are in the same block of :math:`Q`
+               and have the same set of codes).
+        """
+
+        order = np.lexsort((codes, vertexes))
+        vertexes = vertexes[order]
+        codes = codes[order].astype(np.int64) + 1
+
+        touched, start, length = np.unique(
+            vertexes, return_index=True, return_counts=True
+        )
+
+        # the sequences of codes are compared one position at a time. the
+        # longest sequences come first, therefore at the p-th step the
+        # vertexes still involved are a prefix
+        by_length = np.argsort(-length, kind="stable")
+        touched = touched[by_length]
+        start = start[by_length]
+        length = length[by_length]
+
+        group = qblock[touched].astype(np.int64)
+        codes_range = int(codes.max()) + 1
+        last_code = len(codes) - 1
+        next_group = 0
+
+        for p in range(int(length[0])):
+            # vertexes whose sequence is shorter than p+1 are paired with 0
+            nactive = np.searchsorted(-length, -p, side="right")
+            if nactive <= 1 and p > 0:
+                break
+
+            active_code = np.where(
+                length[:nactive] > p,
+                codes[np.minimum(start[:nactive] + p, last_code)],
+                0,
+            )
+            _, active_group = np.unique(
+                group[:nactive] * codes_range + active_code,
+                return_inverse=True,
+            )
+            group[:nactive] = active_group.ravel() + next_group
+            next_group += nactive
+
+        return touched, group
+
+    def split(self, vertexes: np.ndarray, codes: np.ndarray):
+        """Split the blocks of :math:`Q` using several *splitter* sets at
+        once: the couple `(vertexes[i], codes[i])` means that the vertex
+        belongs to the splitter set identified by the code. Vertexes of a
+        block which belong to exactly the same splitter sets remain together,
+        therefore the result is the same that we would get splitting the
+        partition with respect to each set, one at a time.
+
+        The vertexes of each new block are moved in bulk to the beginning of
+        the block of :math:`Q` which contained them. Each block of :math:`Q`
+        which was split becomes a compound block of :math:`X`.
+
+        :param vertexes: An array of vertexes.
+        :param codes: The splitter set each vertex in `vertexes` belongs to.
+        """
+
+        if len(vertexes) == 0:
+            return
+
+        touched, group = self.group_by_codes(vertexes, codes, self.qblock)
+
+        qblocks = self.qblock[touched]
+        order = np.lexsort((group, qblocks))
+        touched = touched[order]
+        group = group[order]
+        qblocks = qblocks[order]
+
+        split_qblocks, block_start, ntouched = np.unique(
+            qblocks, return_index=True, return_counts=True
+        )
+        is_group_start = np.ones(len(touched), dtype=bool)
+        is_group_start[1:] = (qblocks[1:] != qblocks[:-1]) | (
+            group[1:] != group[:-1]
+        )
+        ngroups = np.add.reduceat(is_group_start, block_start)
+        full = ntouched == (
+            self.qend[split_qblocks] - self.qfirst[split_qblocks]
+        )
+
+        # a block whose vertexes are all in the same group is not split
+        changed = ~(full & (ngroups == 1))
+        if not changed.any():
+            return
+        if not changed.all():
+            keep = np.repeat(changed, ntouched)
+            touched = touched[keep]
+            qblocks = qblocks[keep]
+            is_group_start = is_group_start[keep]
+            split_qblocks = split_qblocks[changed]
+            ntouched = ntouched[changed]
+            ngroups = ngroups[changed]
+            full = full[changed]
+            block_start = np.cumsum(ntouched) - ntouched
+
+        qblock_first = self.qfirst[split_qblocks]
+        # position of each touched vertex in the sequence of touched vertexes
+        # of its block
+        touched_rank = np.arange(len(touched)) - np.repeat(
+            block_start, ntouched
+        )
+        target = np.repeat(qblock_first, ntouched) + touched_rank
+
+        # move the touched vertexes to the beginning of their block: the
+        # untouched vertexes in the target area are swapped with the touched
+        # vertexes outside of it. blocks are disjoint intervals, therefore
+        # after sorting the two lists we can pair them
+        position = self.loc[touched]
+        self.marked[touched] = True
+        free_target = target[~self.marked[self.elems[target]]]
+        misplaced = position[
+            position >= np.repeat(qblock_first + ntouched, ntouched)
+        ]
+        self.marked[touched] = False
+
+        if len(free_target) > 0:
+            free_target.sort()
+            misplaced.sort()
+            untouched = self.elems[free_target]
+            self.elems[misplaced] = untouched
+            self.loc[untouched] = misplaced
+        self.elems[target] = touched
+        self.loc[touched] = target
+
+        # each group becomes a block of Q. if all the vertexes of a block were
+        # touched, the first group inherits the old block
+        group_start = np.flatnonzero(is_group_start)
+        group_size = np.diff(np.append(group_start, len(touched)))
+        group_block = np.repeat(np.arange(len(split_qblocks)), ngroups)
+        inherits = np.zeros(len(group_start), dtype=bool)
+        inherits[np.cumsum(ngroups) - ngroups] = full
+
+        nnew = len(group_start) - int(full.sum())
+        group_qblock = np.empty(len(group_start), dtype=np.int64)
+        group_qblock[inherits] = split_qblocks[full]
+        new_qblocks = np.arange(self.nqblocks, self.nqblocks + nnew)
+        group_qblock[~inherits] = new_qblocks
+        self.nqblocks += nnew
+
+        # untouched vertexes remain in the old block
+        self.qfirst[split_qblocks[~full]] = (qblock_first + ntouched)[~full]
+        self.qfirst[group_qblock] = qblock_first[group_block] + touched_rank[
+            group_start
+        ]
+        self.qend[group_qblock] = self.qfirst[group_qblock] + group_size
+        self.qblock[touched] = np.repeat(group_qblock, group_size)
+
+        # each block of Q which was split becomes a compound block of X
+        self.compound_qblocks = np.concatenate((split_qblocks, new_qblocks))
+        self.compound_xblock = np.concatenate(
+            (np.arange(len(split_qblocks)), group_block[~inherits])
+        )
+
+    def refine(self):
+        """Perform the refinement steps of the *Paige-Tarjan* algorithm (see
+        :func:`bispy.paige_tarjan.paige_tarjan.refine`) for each compound
+        block :math:`S` of :math:`X` at once, using as splitters all the
+        blocks of :math:`Q` in :math:`S` but the largest one. The partition
+        :math:`Q` is made stable with respect to each splitter :math:`B_i`
+        and to the remainder :math:`S' = S - \\bigcup_i B_i`: a vertex
+        :math:`x` is in :math:`E^{-1}(S')` if and only if
+        :math:`count(x,S) > \\sum_i count(x,B_i)`.
+
+        Splitters from different blocks of :math:`X` involve distinct values
+        `count(x,S)`, therefore all the splits can be performed in bulk.
+        When the splitters are small (for instance on long chains, where each
+        step refines only a few vertexes) the overhead of *NumPy* calls would
+        dominate, therefore the step is performed vertex by vertex.
+        """
+
+        stats = self.stats
+        if stats is not None:
+            start = stats.clock()
+            nqblocks = self.nqblocks
+
+        # step 1-2 (select the refining blocks and update X). after this step
+        # all the blocks of X are simple
+        B_qblocks, B_S = self.extract_splitters()
+        self.compound_qblocks = self.compound_qblocks[:0]
+        self.compound_xblock = self.compound_xblock[:0]
+
+        B_sizes = self.qend[B_qblocks] - self.qfirst[B_qblocks]
+        if stats is not None:
+            start = stats.record("extract_splitter", start)
+            B_vertexes = self.elems[
+                _ranges(self.qfirst[B_qblocks], self.qend[B_qblocks])
+            ]
+            stats.count(
+                "edges_scanned",
+                int(
+                    (
+                        self.graph.counterimage_offsets[B_vertexes + 1]
+                        - self.graph.counterimage_offsets[B_vertexes]
+                    ).sum()
+                ),
+            )
+            stats.splitter_sizes.extend(B_sizes.tolist())
+
+        if len(B_qblocks) <= _SMALL_STEP and B_sizes.sum() <= _SMALL_STEP:
+            self.refine_small(B_qblocks.tolist(), B_S.tolist())
+            if stats is not None:
+                stats.record("refine_small", start)
+        else:
+            self.refine_bulk(B_qblocks, B_S)
+            if stats is not None:
+                stats.record("refine_bulk", start)
+
+        if stats is not None:
+            stats.count("refine_iterations")
+            stats.count("blocks_created", self.nqblocks - nqblocks)
+
+    def refine_bulk(self, B_qblocks: np.ndarray, B_S: np.ndarray):
+        """Vectorized refinement step (see :meth:`refine`).
+
+        :param B_qblocks: The splitters.
+        :param B_S: The compound block of :math:`X` of each splitter.
+        """
+
+        graph = self.graph
+        nvertexes = graph.nvertexes
+
+        # step 3 (compute E^{-1}(B)). B may be split below, therefore we copy
+        # the vertexes
+        B_vertexes = self.elems[
+            _ranges(self.qfirst[B_qblocks], self.qend[B_qblocks])
+        ]
+        B_of_vertex = np.repeat(
+            np.arange(len(B_qblocks)),
+            self.qend[B_qblocks] - self.qfirst[B_qblocks],
+        )
+
+        positions = graph.counterimage_positions(B_vertexes)
+        if len(positions) == 0:
+            return
+        sources = graph.counterimage[positions]
+        edges = graph.counterimage_edge[positions]
+        B_of_edge = np.repeat(
+            B_of_vertex,
+            graph.counterimage_offsets[B_vertexes + 1]
+            - graph.counterimage_offsets[B_vertexes],
+        )
+        # with labeled edges the splitters are the couples (B, label), whose
+        # index is B * nlabels + label
+        nlabels = graph.nlabels
+        if graph.label is not None:
+            B_of_edge = B_of_edge * nlabels + graph.label[edges]
+
+        # count(x,B) for each x in E^{-1}(B)
+        couples, first_edge, inverse, count_B = np.unique(
+            B_of_edge * nvertexes + sources,
+            return_index=True,
+            return_inverse=True,
+            return_counts=True,
+        )
+        couple_B = couples // nvertexes
+        couple_vertex = couples % nvertexes
+
+        if graph.label is None:
+            couple_S = B_S[couple_B]
+        else:
+            couple_S = B_S[couple_B // nlabels] * nlabels + couple_B % nlabels
+
+        # the slot which holds count(x,S) is the same for each edge from x to
+        # S, and the sum of count(x,B) over the splitters in S
+        _, first_couple, couple_Sx = np.unique(
+            couple_S * nvertexes + couple_vertex,
+            return_index=True,
+            return_inverse=True,
+        )
+        couple_Sx = couple_Sx.ravel()
+        S_slots = graph.count_slot[edges[first_edge[first_couple]]]
+        removed_count = np.bincount(couple_Sx, weights=count_B).astype(
+            np.int32
+        )
+
+        # step 4-6 (refine Q with respect to each B and to S'). the code of
+        # E^{-1}(B_i) is i, the code of E^{-1}(B) - E^{-1}(S') (where B is
+        # the union of the splitters in S) is the number of splitters plus
+        # the index of S
+        exclusive = removed_count == self.counts[S_slots]
+        exclusive_vertex = couple_vertex[first_couple[exclusive]]
+        exclusive_S = couple_S[first_couple[exclusive]]
+        self.split(
+            np.concatenate((couple_vertex, exclusive_vertex)),
+            np.concatenate(
+                (couple_B, len(B_qblocks) * nlabels + exclusive_S)
+            ),
+        )
+
+        # step 7 (count(x,S) becomes count(x,S'), and the edges to each B use
+        # a new slot which holds count(x,B))
+        self.counts[S_slots] -= removed_count
+        self.release_slots(S_slots[exclusive])
+
+        B_slots = self.allocate_slots(len(couples))
+        self.counts[B_slots] = count_B
+        graph.count_slot[edges] = B_slots[inverse.ravel()]
+
+    def refine_small(self, B_qblocks: List[int], B_S: List[int]):
+        """Refinement step (see :meth:`refine`) performed one vertex at a
+        time, used when the splitters are small.
+
+        :param B_qblocks: The splitters.
+        :param B_S: The compound block of :math:`X` of each splitter.
+        """
+
+        graph = self.graph
+        nlabels = graph.nlabels
+
+        # step 3 (compute E^{-1}(B)). the edges from x to B_i are grouped by
+        # the couple (i,x), where i is B_i * nlabels + label if the edges are
+        # labeled
+        couple_edges = {}
+        for B_idx, B_qblock in enumerate(B_qblocks):
+            B_vertexes = self.elems[
+                self.qfirst[B_qblock]:self.qend[B_qblock]
+            ].tolist()
+            for vertex in B_vertexes:
+                start = graph.counterimage_offsets[vertex]
+                end = graph.counterimage_offsets[vertex + 1]
+                sources = graph.counterimage[start:end].tolist()
+                edges = graph.counterimage_edge[start:end]
+                if graph.label is None:
+                    for source, edge in zip(sources, edges.tolist()):
+                        couple_edges.setdefault((B_idx, source), []).append(
+                            edge
+                        )
+                else:
+                    splitters = B_idx * nlabels + graph.label[edges]
+                    for source, edge, splitter in zip(
+                        sources, edges.tolist(), splitters.tolist()
+                    ):
+                        couple_edges.setdefault(
+                            (splitter, source), []
+                        ).append(edge)
+
+        # the slot of count(x,S) and the sum of count(x,B_i) over the
+        # splitters in S
+        removed = {}
+        vertex_codes = {}
+        for (splitter, vertex), edges in couple_edges.items():
+            vertex_codes.setdefault(vertex, []).append(splitter)
+            if nlabels == 1:
+                key = (B_S[splitter], vertex)
+            else:
+                key = (
+                    B_S[splitter // nlabels] * nlabels + splitter % nlabels,
+                    vertex,
+                )
+            if key in removed:
+                removed[key][1] += len(edges)
+            else:
+                removed[key] = [int(graph.count_slot[edges[0]]), len(edges)]
+
+        # step 4-6 (see refine_bulk)
+        released = []
+        for (S_idx, vertex), (S_slot, count) in removed.items():
+            remaining = int(self.counts[S_slot]) - count
+            if remaining == 0:
+                vertex_codes[vertex].append(len(B_qblocks) * nlabels + S_idx)
+                released.append(S_slot)
+            self.counts[S_slot] = remaining
+        self.split_small(vertex_codes)
+
+        # step 7
+        self.release_slots(np.array(released, dtype=self.free_slots.dtype))
+        B_slots = self.allocate_slots(len(couple_edges)).tolist()
+        for B_slot, edges in zip(B_slots, couple_edges.values()):
+            self.counts[B_slot] = len(edges)
+            graph.count_slot[edges] = B_slot
+
+    def split_small(self, vertex_codes: Dict[int, List[int]]):
+        """Equivalent of :meth:`split` performed one vertex at a time.
+
+        :param vertex_codes: A dictionary which maps each vertex to the list
+            of splitter sets it belongs to.
+        """
+
+        groups = {}
+        for vertex, codes in vertex_codes.items():
+            codes.sort()
+            groups.setdefault(int(self.qblock[vertex]), {}).setdefault(
+                tuple(codes), []
+            ).append(vertex)
+
+        compound_qblocks = []
+        compound_xblock = []
+        nsplit = 0
+        for qblock, qblock_groups in groups.items():
+            first = int(self.qfirst[qblock])
+            ntouched = sum(map(len, qblock_groups.values()))
+            full = ntouched == int(self.qend[qblock]) - first
+            if full and len(qblock_groups) == 1:
+                continue
+
+            xblock = nsplit
+            nsplit += 1
+            position = first
+            for group_idx, group in enumerate(qblock_groups.values()):
+                group_first = position
+                # swap each vertex with the one in the target position
+                for vertex in group:
+                    vertex_position = int(self.loc[vertex])
+                    other = int(self.elems[position])
+                    self.elems[vertex_position] = other
+                    self.loc[other] = vertex_position
+                    self.elems[position] = vertex
+                    self.loc[vertex] = position
+                    position += 1
+
+                if full and group_idx == 0:
+                    self.qend[qblock] = position
+                    new_qblock = qblock
+                else:
+                    new_qblock = self.nqblocks
+                    self.nqblocks += 1
+                    self.qfirst[new_qblock] = group_first
+                    self.qend[new_qblock] = position
+                    self.qblock[group] = new_qblock
+                compound_qblocks.append(new_qblock)
+                compound_xblock.append(xblock)
+
+            if not full:
+                # untouched vertexes remain in the old block
+                self.qfirst[qblock] = position
+                compound_qblocks.append(qblock)
+                compound_xblock.append(xblock)
+
+        self.compound_qblocks = np.array(compound_qblocks, dtype=np.int64)
+        self.compound_xblock = np.array(compound_xblock, dtype=np.int64)
+
+
+def array_paige_tarjan(graph: ArrayGraph, stats: Stats = None) -> np.ndarray:
+    """Apply the *Paige-Tarjan* algorithm to the given
+    :class:`bispy.utilities.array_graph.ArrayGraph`, whose attribute `block`
+    is considered a labeling set (namely two vertexes in different blocks of
+    the initial partition cannot be bisimilar).
+
+    The partition is kept as a permutation of the vertexes with block
+    start/end offsets, therefore the counterimage of the splitters is marked
+    and moved in bulk using *NumPy*. Each refinement step processes every
+    compound block of :math:`X` at once. The arrays `block`, `count_slot` and
+    `counts` of `graph` are updated in-place.
+
+    :param graph: The graph.
+    :param stats: If not `None`, the time spent in each refinement step
+        (`"extract_splitter"`, then `"refine_small"` or `"refine_bulk"`) and
+        the counters of the algorithm are added to this object (see
+        :class:`bispy.utilities.stats.Stats`). A step of this implementation
+        processes all the compound blocks of :math:`X` at once. Defaults to
+        `None`.
+    :returns: The RSCP/maximum bisimulation as an array which maps each vertex
+        to the index of its block (blocks are numbered from 0 without holes).
+    """
+
+    state = _RefinablePartition(graph, stats)
+
+    while len(state.compound_qblocks) > 0:
+        state.refine()
+
+    graph.block = state.qblock
+    graph.counts = state.counts
+    return state.qblock
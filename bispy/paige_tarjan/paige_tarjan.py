@@ -1,6 +1,7 @@
-from llist import dllist, dllistnode
-from typing import List, Dict, Any, Tuple, Iterable
+from functools import partial
+from typing import List, Dict, Any, Tuple, Iterable, Union
 import networkx as nx
+import numpy as np
 
 from bispy.utilities.graph_entities import (
     _Vertex,
@@ -13,14 +14,41 @@ from bispy.paige_tarjan.compound_xblocks_container import (
 )
 from bispy.utilities.graph_decorator import (
     decorate_nx_graph,
+    decorate_edge_list,
     preprocess_initial_partition,
-    to_tuple_list
+    to_tuple_list,
+    to_block_array,
+    check_output,
 )
 from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
-    convert_to_integer_graph,
-    back_to_original,
+    NodeIndex,
 )
+from bispy.utilities.array_graph import (
+    as_array_graph,
+    array_graph_from_edges,
+    block_array_to_tuple_list,
+)
+from bispy.utilities.edge_list import (
+    is_edge_list,
+    edge_list_to_arrays,
+    graph_edge_labels,
+    labeled_edge_list_to_arrays,
+)
+from bispy.utilities.quotient import (
+    vertexes_to_edge_arrays,
+    quotient_edges,
+    quotient_to_nx_graph,
+)
+from bispy.utilities.stats import Stats
+from bispy.paige_tarjan.array_paige_tarjan import array_paige_tarjan
+from bispy.paige_tarjan.signature_refinement import signature_refinement
+
+# engines which work on an ArrayGraph
+_ARRAY_ENGINES = {
+    "array": array_paige_tarjan,
+    "signature": signature_refinement,
+}
 
 
 # choose the smallest qblock of the first two
@@ -33,14 +61,15 @@ def extract_splitter(compound_block: _XBlock) -> _QBlock:
     compound_block: A compound block in the partition `X`.
     """
 
-    first_qblock = compound_block.qblocks.first
-    if first_qblock.value.size <= first_qblock.next.value.size:
-        compound_block.remove_qblock(first_qblock.value)
-        return first_qblock.value
+    qblocks = iter(compound_block.qblocks)
+    first_qblock = next(qblocks)
+    second_qblock = next(qblocks)
+    if first_qblock.size <= second_qblock.size:
+        compound_block.remove_qblock(first_qblock)
+        return first_qblock
     else:
-        qblock = first_qblock.next.value
-        compound_block.remove_qblock(qblock)
-        return qblock
+        compound_block.remove_qblock(second_qblock)
+        return second_qblock
 
 
 # construct a list of the nodes in the counterimage of qblock to be used in the
@@ -219,7 +248,9 @@ def update_counts(B_block_vertexes: List[_Vertex]):
 
 
 def refine(
-    compound_xblocks: CompoundXBlocksContainer, xblocks: List[_XBlock]
+    compound_xblocks: CompoundXBlocksContainer,
+    xblocks: List[_XBlock],
+    stats: Stats = None,
 ) -> Tuple[List[_XBlock], List[_QBlock]]:
     """Perform a refinement step of the *Paige-Tarjan* algorithm.
 
@@ -232,6 +263,9 @@ def refine(
         .. seealso:: modules :py:mod:`bispy.saha.ranked_pta`
 
     :param xblocks: The partition :math:`X`.
+    :param stats: If not `None`, the time spent in each phase of the step
+        and the counters of the step are added to this object (see
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
     :returns: A tuple whose items are:
 
         0. The new partition :math:`X`;
@@ -241,14 +275,15 @@ def refine(
     # refinement step (following the steps at page 10 of "Three partition
     # refinement algorithms")
 
+    if stats is not None:
+        start = stats.clock()
+
     new_qblocks = []
 
     # step 1 (select a refining block B)
     # extract a random compound xblock
     S_compound_xblock = compound_xblocks.pop()
     # select the right qblock from this compound xblock
-    # note that the dllistonodes in this list will most likely be outdated
-    # after the first split
     B_qblock = extract_splitter(S_compound_xblock)
     B_qblock_vertexes = [vertex for vertex in B_qblock.vertexes]
 
@@ -263,14 +298,23 @@ def refine(
 
     xblocks.append(B_xblock)
 
+    if stats is not None:
+        start = stats.record("extract_splitter", start)
+
     # step 3 (compute E^{-1}(B))
     B_counterimage = build_block_counterimage(B_qblock)
 
+    if stats is not None:
+        start = stats.record("build_block_counterimage", start)
+
     # step 4 (refine Q with respect to B)
     new_qblocks_from_split1, new_compound_xblocks, _ = split(B_counterimage)
     new_qblocks.extend(new_qblocks_from_split1)
     compound_xblocks.extend(new_compound_xblocks)
 
+    if stats is not None:
+        start = stats.record("split", start)
+
     # step 5 (compute E^{-1}(B) - E^{-1}(S-B))
 
     # note that, since we are employing the strategy proposed in the paper,
@@ -279,6 +323,9 @@ def refine(
         B_qblock_vertexes
     )
 
+    if stats is not None:
+        start = stats.record("build_exclusive_B_counterimage", start)
+
     # step 6
     new_qblocks_from_split2, new_compound_xblocks, _ = split(
         second_splitter_counterimage
@@ -286,9 +333,22 @@ def refine(
     new_qblocks.extend(new_qblocks_from_split2)
     compound_xblocks.extend(new_compound_xblocks)
 
+    if stats is not None:
+        start = stats.record("split", start)
+
     # step 7
     update_counts(B_qblock_vertexes)
 
+    if stats is not None:
+        stats.record("update_counts", start)
+        stats.count("refine_iterations")
+        stats.count("blocks_created", len(new_qblocks))
+        stats.count(
+            "edges_scanned",
+            sum(len(vertex.counterimage) for vertex in B_qblock_vertexes),
+        )
+        stats.splitter_sizes.append(len(B_qblock_vertexes))
+
     # reset aux_count
     # we only care about the vertexes in B_counterimage since we only set
     # aux_count for those vertexes x such that |E({x}) \cap B_qblock| > 0
@@ -299,12 +359,17 @@ def refine(
 
 
 # returns a list of labels splitted in partitions
-def paige_tarjan_qblocks(q_partition: List[_QBlock]) -> List[_QBlock]:
+def paige_tarjan_qblocks(
+    q_partition: List[_QBlock], stats: Stats = None
+) -> List[_QBlock]:
     """Apply the *Paige-Tarjan* algorithm to the partition :math:`Q`, which
         is considered a labeling set (namely two vertexes in different
         blocks of the initial partition cannot be bisimilar).
 
     :param q_partition: The initial partition (labeling set).
+    :param stats: If not `None`, the instrumentation data of the algorithm
+        is added to this object (see :class:`bispy.utilities.stats.Stats`).
+        Defaults to `None`.
     :returns: The RSCP/maximum bisimulation of the given labeling set.
     """
     # initially, there's only one block in the partition X, the one which
@@ -319,7 +384,9 @@ def paige_tarjan_qblocks(q_partition: List[_QBlock]) -> List[_QBlock]:
 
     while len(compound_xblocks) > 0:
         x_partition, new_qblocks = refine(
-            compound_xblocks=compound_xblocks, xblocks=x_partition
+            compound_xblocks=compound_xblocks,
+            xblocks=x_partition,
+            stats=stats,
         )
         q_partition.extend(new_qblocks)
 
@@ -333,7 +400,14 @@ def paige_tarjan(
     graph: nx.Graph,
     initial_partition: Iterable[Iterable[int]] = None,
     is_integer_graph: bool = False,
-) -> List[Tuple]:
+    engine: str = "object",
+    nvertexes: int = None,
+    stats: Stats = None,
+    max_depth: int = None,
+    edge_labels: Union[str, Iterable[Any]] = None,
+    output: str = "tuples",
+    return_quotient: bool = False,
+) -> Union[List[Tuple], np.ndarray, Tuple]:
     """Compute the RSCP/maximum bisimulation of the given graph using
     *Paige-Tarjan*'s algorithm, with the given initial partition
     (or *labeling set*, two vertexes in different blocks of the initial
@@ -350,60 +424,204 @@ def paige_tarjan(
     after the end of the computation. For this reason nodes of `graph` **must**
     be hashable objects.
 
+    The graph may also be given as an edge list (see
+    :func:`bispy.utilities.edge_list.edge_list_to_arrays`) whose vertexes are
+    the integers in :math:`[0, \\textit{nvertexes})`, in which case no
+    *NetworkX* graph is created.
+
+        >>> paige_tarjan([(0, 1), (2, 3)], nvertexes=5)
+        [(0, 2), (1, 3, 4)]
+
     .. warning::
         Using a non integer graph and setting `is_integer_graph` to `True`
         will probably make the function fail with an exception, or, even worse,
         return a wrong output.
 
-    :param graph: The input graph.
+    :param graph: The input graph, as a *NetworkX* directed graph or as an edge
+        list (a *NumPy* array of shape `(m,2)`, a list of couples of integers,
+        or a *SciPy* sparse adjacency matrix).
     :param initial_partition: The initial partition (or labeling set). Defaults
         to `None`, in which case the trivial labeling set (one block which
         contains all the nodes) is used.
     :param is_integer_graph: If `True`, the function assumes that
         the graph is integer, and skips the integer check (may slightly
         improve performance). Defaults to `False`.
-    :returns: The RSCP/maximum bisimulation of the given labeling set as a
-        list of tuples, each of which contains bisimilar nodes.
+    :param engine: The implementation of the algorithm. `"object"` works on
+        the *BisPy* representation of the graph (see
+        :mod:`bispy.utilities.graph_decorator`), `"array"` works on a
+        :class:`bispy.utilities.array_graph.ArrayGraph` (see
+        :mod:`bispy.paige_tarjan.array_paige_tarjan`), which is much faster
+        and lighter on large graphs, `"signature"` computes the RSCP on the
+        same representation by signature refinement (see
+        :mod:`bispy.paige_tarjan.signature_refinement`), which is usually the
+        fastest on shallow graphs. The result is the same. Defaults to
+        `"object"`.
+    :param nvertexes: The number of vertexes, used only if `graph` is an edge
+        list. Defaults to `None`, in which case it's inferred from `graph`.
+    :param stats: If not `None`, the time spent in each phase (including the
+        construction of the internal representation of the graph, the phase
+        `"decorate"`) and the counters of the algorithm are added to this
+        object (see :class:`bispy.utilities.stats.Stats`). Defaults to
+        `None`.
+    :param max_depth: If not `None`, compute the *k-bisimulation* for
+        :math:`k = \\textit{max_depth}` (two nodes are *k*-bisimilar if they
+        cannot be told apart by paths of length at most *k*) instead of the
+        maximum bisimulation. The refinement proceeds by levels, therefore
+        this uses signature refinement whatever the `engine` (see
+        :func:`bispy.paige_tarjan.signature_refinement
+        .signature_refinement`). Defaults to `None`.
+    :param edge_labels: If not `None`, the edges are labeled (like the
+        transitions of a *labeled transition system*) and two nodes are
+        bisimilar only if they reach bisimilar nodes through edges with the
+        same labels. This is the name of the attribute of the edges of
+        `graph` which holds their labels, or the label of each edge (in the
+        order of `graph.edges`, or of the edge list). Labels may be any
+        hashable objects. Only the engines `"array"` and `"signature"` support
+        labeled edges. Defaults to `None`.
+    :param output: The format of the result. `"tuples"` gives a list of
+        tuples of nodes, `"labels"` gives an array which maps each node (as
+        an integer) to the index of its block (blocks are numbered from 0
+        without holes), which is much lighter for large graphs. If the graph
+        is not integer, the array is paired with the
+        :class:`bispy.utilities.graph_normalization.NodeIndex` which maps
+        nodes to integers. Defaults to `"tuples"`.
+    :param return_quotient: If `True`, we also return the quotient of the
+        graph with respect to the result (see
+        :func:`bispy.utilities.quotient.quotient`), whose nodes are the
+        indexes of the blocks. The quotient is built from the internal
+        representation of the graph, as a *NetworkX* directed graph (or as
+        the arrays of the sources and of the destinations of its edges if
+        `output` is `"labels"`). Not supported with labeled edges. Defaults
+        to `False`.
+    :returns: The RSCP/maximum bisimulation (or the *k-bisimulation*) of the
+        given labeling set as a list of tuples, each of which contains
+        bisimilar nodes (or in the format given by `output`), and the
+        quotient graph if `return_quotient` is `True`.
     """
 
-    if not isinstance(graph, nx.DiGraph):
-        raise Exception("graph should be a directed graph (nx.DiGraph)")
-
-    # if True, the input graph is already an integer graph
-    original_graph_is_integer = is_integer_graph or check_normal_integer_graph(
-        graph
-    )
-
-    # if initial_partition is None, then it's the trivial partition
-    if initial_partition is None:
-        # only list(graph.nodes) isn't OK
-        initial_partition = [list(graph.nodes)]
+    if engine != "object" and engine not in _ARRAY_ENGINES:
+        raise ValueError("Unknown engine: {}".format(engine))
+    check_output(output)
+    if edge_labels is not None and engine == "object" and max_depth is None:
+        raise ValueError(
+            "Labeled edges are supported by the engines 'array' and "
+            "'signature'"
+        )
+    if edge_labels is not None and return_quotient:
+        raise ValueError(
+            "The quotient of a graph with labeled edges is not supported"
+        )
 
-    if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
+    refine_array_graph = _ARRAY_ENGINES.get(engine)
+    if max_depth is not None:
+        refine_array_graph = partial(
+            signature_refinement, max_depth=max_depth
+        )
 
-        # convert the initial partition to a integer partition
-        integer_initial_partition = [
-            [node_to_idx[old_node] for old_node in block]
-            for block in initial_partition
-        ]
+    if stats is not None:
+        start = stats.clock()
+
+    # if None, the graph is an integer graph
+    node_index = None
+    if is_edge_list(graph):
+        if refine_array_graph is not None:
+            if edge_labels is None:
+                sources, destinations, nvertexes = edge_list_to_arrays(
+                    graph, nvertexes
+                )
+                labels = None
+            else:
+                (
+                    sources,
+                    destinations,
+                    labels,
+                    nvertexes,
+                ) = labeled_edge_list_to_arrays(graph, edge_labels, nvertexes)
+            array_graph = array_graph_from_edges(
+                sources, destinations, nvertexes, initial_partition, labels
+            )
+        else:
+            vertexes, q_partition = decorate_edge_list(
+                graph,
+                nvertexes,
+                initial_partition,
+                topological_sorted_images=False,
+                compute_rank=False,
+            )
     else:
-        integer_graph = graph
-        integer_initial_partition = initial_partition
-
-    vertexes, q_partition = decorate_nx_graph(
-        integer_graph,
-        integer_initial_partition,
-        topological_sorted_images=False,
-        compute_rank=False,
-    )
-    xblock = q_partition[0].xblock
-
-    rscp = paige_tarjan_qblocks(q_partition)
-    integer_rscp = to_tuple_list(rscp)
-
-    if original_graph_is_integer:
-        return integer_rscp
+        if not isinstance(graph, nx.DiGraph):
+            raise Exception("graph should be a directed graph (nx.DiGraph)")
+
+        # if initial_partition is None, then it's the trivial partition
+        if initial_partition is None:
+            # only list(graph.nodes) isn't OK
+            initial_partition = [list(graph.nodes)]
+
+        if not (is_integer_graph or check_normal_integer_graph(graph)):
+            # nodes are translated to integers on the fly
+            node_index = NodeIndex(graph.nodes)
+
+            # convert the initial partition to a integer partition
+            initial_partition = node_index.to_integer_partition(
+                initial_partition
+            )
+
+        if refine_array_graph is not None:
+            array_graph = as_array_graph(
+                graph,
+                initial_partition,
+                node_index,
+                None
+                if edge_labels is None
+                else graph_edge_labels(graph, edge_labels),
+            )
+        else:
+            vertexes, q_partition = decorate_nx_graph(
+                graph,
+                initial_partition,
+                topological_sorted_images=False,
+                compute_rank=False,
+                node_index=node_index,
+            )
+
+    if stats is not None:
+        stats.record("decorate", start)
+
+    if refine_array_graph is not None:
+        block = refine_array_graph(array_graph, stats)
+        if output == "tuples":
+            integer_rscp = block_array_to_tuple_list(block)
     else:
-        return back_to_original(integer_rscp, node_to_idx)
+        rscp = paige_tarjan_qblocks(q_partition, stats)
+        if output == "labels" or return_quotient:
+            block = to_block_array(rscp, len(vertexes))
+        if output == "tuples":
+            integer_rscp = to_tuple_list(rscp)
+
+    if output == "labels":
+        result = block if node_index is None else (block, node_index)
+    elif node_index is None:
+        result = integer_rscp
+    else:
+        result = node_index.to_original_partition(integer_rscp)
+
+    if return_quotient:
+        if refine_array_graph is not None:
+            sources = array_graph.edge_sources()
+            destinations = array_graph.image
+        else:
+            sources, destinations = vertexes_to_edge_arrays(vertexes)
+        quotient_sources, quotient_destinations = quotient_edges(
+            sources, destinations, block
+        )
+        if output == "labels":
+            return (result, (quotient_sources, quotient_destinations))
+        return (
+            result,
+            quotient_to_nx_graph(
+                quotient_sources,
+                quotient_destinations,
+                int(block.max()) + 1 if len(block) > 0 else 0,
+            ),
+        )
+    return result
@@ -0,0 +1,240 @@
+import numpy as np
+
+from bispy.utilities.array_graph import (
+    ArrayGraph,
+    sorted_unique,
+    well_founded_rank,
+)
+from bispy.utilities.stats import Stats
+
+
+def _mix(values: np.ndarray, salt: np.uint64) -> np.ndarray:
+    """Scramble the given integers (the finalizer of *SplitMix64*), such that
+    the sum of the scrambled values of a set is a good hash of the set.
+
+    :param values: Non-negative integers.
+    :param salt: A random 64-bit integer.
+    :returns: An array of 64-bit unsigned integers.
+    """
+
+    z = values.astype(np.uint64) ^ salt
+    z += np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _successor_blocks(
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    block: np.ndarray,
+    nblocks: int,
+    edge_label: np.ndarray = None,
+    nlabels: int = 1,
+):
+    """The set of blocks reached by each vertex in one step. If the edges
+    are labeled, the block reached through an edge with label :math:`a` is
+    represented by :math:`a \\cdot \\textit{nblocks} + \\textit{block}`.
+
+    :returns: The couples (vertex, block) without repetitions, as two arrays
+        sorted by vertex and then by block.
+    """
+
+    reached = block[destinations]
+    if edge_label is not None:
+        reached += edge_label * nblocks
+    nreached = nblocks * nlabels
+    pairs = sorted_unique(sources * nreached + reached)
+    return pairs // nreached, pairs % nreached
+
+
+def _is_stable(
+    pair_vertex: np.ndarray,
+    pair_block: np.ndarray,
+    nreached_blocks: int,
+    block: np.ndarray,
+    nblocks: int,
+    degree: np.ndarray,
+) -> bool:
+    """Check whether the vertexes of each block of `block` reach the same set
+    of blocks (among the blocks of the couples in `pair_block`). If
+    `pair_block` refers to `block` itself, this checks whether the partition
+    is stable. The set of blocks reached by a vertex of :math:`B` is a subset
+    of the set of blocks reached by the whole :math:`B`, therefore they are
+    the same iff they have the same size.
+
+    :param pair_vertex: The vertexes of the couples returned by
+        :func:`_successor_blocks`.
+    :param pair_block: The blocks of the couples returned by
+        :func:`_successor_blocks`.
+    :param nreached_blocks: The number of blocks which may appear in
+        `pair_block`.
+    :param block: The block of each vertex.
+    :param nblocks: The number of blocks in `block`.
+    :param degree: The number of blocks reached by each vertex.
+    """
+
+    block_pairs = sorted_unique(
+        block[pair_vertex] * nreached_blocks + pair_block
+    )
+    block_degree = np.bincount(
+        block_pairs // nreached_blocks, minlength=nblocks
+    )
+    return bool(np.all(degree == block_degree[block]))
+
+
+def signature_refinement(
+    graph: ArrayGraph,
+    stats: Stats = None,
+    seed: int = 0,
+    max_depth: int = None,
+) -> np.ndarray:
+    """Compute the RSCP/maximum bisimulation of the given
+    :class:`bispy.utilities.array_graph.ArrayGraph`, whose attribute `block`
+    is considered a labeling set, by signature refinement: at each round the
+    *signature* of a vertex is the couple made of its block and of the set of
+    blocks reached by its edges, and each block is split according to the
+    signatures of its vertexes. The partition is stable when a round does not
+    create new blocks. If the edges are labeled (see
+    :class:`bispy.utilities.array_graph.ArrayGraph`) the signature contains
+    the couples (label, block) instead of the blocks.
+
+    A round is a small number of vectorized *NumPy* operations (sorting the
+    edges and their blocks), therefore it takes :math:`O(m \\log m)`. The
+    number of rounds is bounded by the number of blocks of the RSCP, and by
+    the length of the longest path (plus one) if the graph is acyclic,
+    therefore this is convenient for shallow graphs.
+
+    The sets of blocks are compared through a randomized 64-bit hash.
+    Vertexes whose signatures are equal are never split, and a collision of
+    two different sets may only delay a split: the stability of the final
+    partition is checked exactly, and the refinement goes on with a new hash
+    if it is not stable. Therefore the result is always the same RSCP
+    computed by :func:`bispy.paige_tarjan.array_paige_tarjan
+    .array_paige_tarjan`.
+
+    If `max_depth` is not `None` we compute the *k-bisimulation* for
+    :math:`k = \\textit{max_depth}`: two vertexes are 0-bisimilar iff they
+    are in the same block of the labeling set, and :math:`(k+1)`-bisimilar
+    iff they are :math:`k`-bisimilar and reach the same blocks of the
+    :math:`k`-bisimulation. The partition after :math:`k` rounds is the
+    :math:`k`-bisimulation, provided that each round is checked for hash
+    collisions (and repeated with a new hash if there is one). A
+    well-founded vertex of rank :math:`r` (see
+    :func:`bispy.utilities.array_graph.well_founded_rank`) is
+    :math:`(r+1)`-bisimilar only to the vertexes which are bisimilar to it,
+    therefore its block does not change after the round :math:`r+1`, and
+    its edges are not sorted anymore.
+
+    :param graph: The graph. The array `block` is updated in-place.
+    :param stats: If not `None`, the time spent in each round (`"signature"`,
+        `"split"` and `"check_stability"`), the number of rounds
+        (`"refine_iterations"`) and the number of new blocks
+        (`"blocks_created"`) are added to this object (see
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
+    :param seed: The seed of the random salts of the hash. Defaults to 0.
+    :param max_depth: If not `None`, the number of rounds, namely the depth
+        :math:`k` of the *k-bisimulation*. Defaults to `None`, in which case
+        we compute the maximum bisimulation.
+    :returns: The RSCP/maximum bisimulation (or the *k-bisimulation*) as an
+        array which maps each vertex to the index of its block (blocks are
+        numbered from 0 without holes).
+    """
+
+    if max_depth is not None and max_depth < 0:
+        raise ValueError(
+            "max_depth should be non-negative, got {}".format(max_depth)
+        )
+
+    nvertexes = graph.nvertexes
+    sources = graph.edge_sources().astype(np.int64)
+    destinations = graph.image.astype(np.int64)
+
+    initial_blocks, block = np.unique(graph.block, return_inverse=True)
+    block = block.astype(np.int64).reshape(-1)
+    nblocks = len(initial_blocks)
+    edge_label = graph.label
+
+    if max_depth is not None:
+        # vertexes which are not well-founded (or whose rank is greater than
+        # max_depth) are never settled
+        source_rank = well_founded_rank(graph, max_depth)[sources]
+        source_rank[source_rank == -1] = max_depth
+
+    random = np.random.default_rng(seed)
+    depth = 0
+    while max_depth is None or depth < max_depth:
+        if stats is not None:
+            start = stats.clock()
+            stats.count("refine_iterations")
+
+        if max_depth is not None:
+            # after the round r+1 the blocks of the vertexes of rank r are
+            # settled
+            active_edges = source_rank >= depth
+            sources = sources[active_edges]
+            destinations = destinations[active_edges]
+            source_rank = source_rank[active_edges]
+            if edge_label is not None:
+                edge_label = edge_label[active_edges]
+
+        pair_vertex, pair_block = _successor_blocks(
+            sources, destinations, block, nblocks, edge_label, graph.nlabels
+        )
+        degree = np.bincount(pair_vertex, minlength=nvertexes)
+
+        # the hash of a set is the sum of the scrambled blocks (mod 2^64)
+        salt = random.integers(
+            np.iinfo(np.int64).max, dtype=np.int64
+        ).astype(np.uint64)
+        cumulative = np.zeros(len(pair_block) + 1, dtype=np.uint64)
+        np.cumsum(_mix(pair_block, salt), out=cumulative[1:])
+        end = np.cumsum(degree)
+        signature = cumulative[end] - cumulative[end - degree]
+
+        if stats is not None:
+            start = stats.record("signature", start)
+
+        # sets of different sizes are told apart without the hash
+        order = np.lexsort((signature, degree, block))
+        new_block_starts = np.empty(nvertexes, dtype=bool)
+        new_block_starts[:1] = True
+        new_block_starts[1:] = (
+            (np.diff(block[order]) != 0)
+            | (np.diff(degree[order]) != 0)
+            | (np.diff(signature[order]) != 0)
+        )
+        new_nblocks = int(np.count_nonzero(new_block_starts))
+
+        if stats is not None:
+            start = stats.record("split", start)
+
+        new_block = np.empty_like(block)
+        new_block[order] = np.cumsum(new_block_starts) - 1
+        if new_nblocks > nblocks and max_depth is None:
+            exact = True
+        else:
+            # in the k-bisimulation mode each round must be exact
+            exact = _is_stable(
+                pair_vertex,
+                pair_block,
+                nblocks * graph.nlabels,
+                new_block,
+                new_nblocks,
+                degree,
+            )
+            if stats is not None:
+                stats.record("check_stability", start)
+
+        if exact:
+            if stats is not None:
+                stats.count("blocks_created", new_nblocks - nblocks)
+            if new_nblocks == nblocks:
+                # stable, the following rounds would not change anything
+                break
+            block = new_block
+            nblocks = new_nblocks
+            depth += 1
+
+    graph.block = block
+    return block
@@ -0,0 +1,333 @@
+import heapq
+import os
+import numpy as np
+import networkx as nx
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, List, Tuple, Union
+
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.paige_tarjan.array_paige_tarjan import array_paige_tarjan
+from bispy.utilities.array_graph import (
+    array_graph_from_edges,
+    block_array_to_tuple_list,
+    partition_to_block_array,
+    weakly_connected_components,
+)
+from bispy.utilities.edge_list import is_edge_list, edge_list_to_arrays
+from bispy.utilities.graph_decorator import check_output
+from bispy.utilities.quotient import quotient_edges
+from bispy.utilities.graph_normalization import (
+    check_normal_integer_graph,
+    NodeIndex,
+)
+
+
+def assign_components(
+    component: np.ndarray, sources: np.ndarray, nshards: int
+) -> np.ndarray:
+    """Distribute the weakly connected components of a graph among `nshards`
+    shards of similar size (number of vertexes plus number of edges). The
+    components are assigned, largest first, to the smallest shard.
+
+    :param component: The component of each vertex (see
+        :func:`bispy.utilities.array_graph.weakly_connected_components`).
+    :param sources: Sources of the edges of the graph.
+    :param nshards: The number of shards.
+    :returns: An array which maps each vertex to the index of its shard.
+    """
+
+    ncomponents = int(component.max()) + 1 if len(component) > 0 else 0
+    size = np.bincount(component, minlength=ncomponents)
+    size += np.bincount(component[sources], minlength=ncomponents)
+
+    shard_of_component = np.empty(ncomponents, dtype=np.int64)
+    shards = [(0, shard) for shard in range(nshards)]
+    for component_idx in np.argsort(-size, kind="stable").tolist():
+        shard_size, shard = heapq.heappop(shards)
+        shard_of_component[component_idx] = shard
+        heapq.heappush(shards, (shard_size + int(size[component_idx]), shard))
+    return shard_of_component[component]
+
+
+def coarsen_union(
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    block: np.ndarray,
+    union_block: np.ndarray,
+) -> np.ndarray:
+    """Compute the RSCP of a graph given a bisimulation which is finer than
+    the labeling set, for instance the union of the RSCPs of some disjoint
+    subgraphs which are not connected to each other. Bisimilar vertexes may
+    be in different blocks of the bisimulation, therefore we compute the
+    RSCP of the quotient graph (which is usually much smaller than the
+    graph) with the array implementation of *Paige-Tarjan*'s algorithm.
+
+    :param sources: Sources of the edges of the graph.
+    :param destinations: Destinations of the edges of the graph.
+    :param block: The block of the labeling set each vertex belongs to.
+    :param union_block: The block of the bisimulation each vertex belongs to
+        (blocks are numbered from 0 without holes).
+    :returns: An array which maps each vertex to the index of its block in
+        the RSCP.
+    """
+
+    nblocks = int(union_block.max()) + 1 if len(union_block) > 0 else 0
+
+    quotient = array_graph_from_edges(
+        *quotient_edges(sources, destinations, union_block), nblocks
+    )
+    quotient.block = np.empty(nblocks, dtype=np.int64)
+    quotient.block[union_block] = block
+    return array_paige_tarjan(quotient)[union_block]
+
+
+def _bisimulation_of_shard(
+    algorithm: Callable,
+    shared_memory_name: str,
+    nedges: int,
+    nvertexes: int,
+    vertex_range: Tuple[int, int],
+    edge_range: Tuple[int, int],
+) -> np.ndarray:
+    """Compute the RSCP of a shard. This is executed by the worker processes.
+
+    The shared memory contains the sources of the edges, the destinations of
+    the edges and the block of the labeling set of each vertex (in this
+    order), relabeled such that the vertexes and the edges of each shard are
+    contiguous.
+
+    :param algorithm: The algorithm.
+    :param shared_memory_name: The name of the shared memory block.
+    :param nedges: The number of edges of the graph.
+    :param nvertexes: The number of vertexes of the graph.
+    :param vertex_range: The first and one past the last vertex of the shard.
+    :param edge_range: The first and one past the last edge of the shard.
+    :returns: An array which maps each vertex of the shard to the index of
+        its block.
+    """
+
+    first_vertex, end_vertex = vertex_range
+    first_edge, end_edge = edge_range
+
+    shared_memory = SharedMemory(name=shared_memory_name)
+    try:
+        data = np.ndarray(
+            (2 * nedges + nvertexes,), dtype=np.int64, buffer=shared_memory.buf
+        )
+        edges = np.stack(
+            (
+                data[first_edge:end_edge],
+                data[nedges + first_edge:nedges + end_edge],
+            ),
+            axis=1,
+        )
+        edges -= first_vertex
+        initial_partition = block_array_to_tuple_list(
+            data[2 * nedges + first_vertex:2 * nedges + end_vertex]
+        )
+        # views on the buffer must be released before closing it
+        del data
+    finally:
+        shared_memory.close()
+
+    rscp = algorithm(
+        edges, initial_partition, nvertexes=end_vertex - first_vertex
+    )
+
+    block = np.empty(end_vertex - first_vertex, dtype=np.int64)
+    for block_idx, rscp_block in enumerate(rscp):
+        block[list(rscp_block)] = block_idx
+    return block
+
+
+def bisimulation_by_components(
+    graph: nx.Graph,
+    initial_partition: Iterable[Iterable[int]] = None,
+    algorithm: Callable = paige_tarjan,
+    workers: int = None,
+    nvertexes: int = None,
+    is_integer_graph: bool = False,
+    output: str = "tuples",
+) -> Union[List[Tuple], np.ndarray, Tuple[np.ndarray, NodeIndex]]:
+    """Compute the RSCP/maximum bisimulation of the given graph splitting it
+    into its weakly connected components, which are distributed among
+    `workers` shards of similar size. Each shard (a disjoint union of
+    components) is processed by `algorithm` in a pool of worker processes,
+    which read the edges from a shared memory block. Vertexes in different
+    shards may be bisimilar, therefore the blocks of the shards are finally
+    merged computing the RSCP of the quotient graph (see
+    :func:`coarsen_union`).
+
+    This is convenient for graphs made of many components (like forests):
+
+        >>> graph = networkx.disjoint_union_all([tree1, tree2, tree3])
+        >>> bisimulation_by_components(graph, workers=4)
+
+    :param graph: The input graph, as a *NetworkX* directed graph or as an edge
+        list (a *NumPy* array of shape `(m,2)`, a list of couples of integers,
+        or a *SciPy* sparse adjacency matrix).
+    :param initial_partition: The initial partition (or labeling set). Defaults
+        to `None`, in which case the trivial labeling set (one block which
+        contains all the nodes) is used.
+    :param algorithm: The function used to compute the RSCP of a shard. It is
+        called with an edge list, the initial partition and the argument
+        `nvertexes` (like :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`
+        and :func:`bispy.dovier_piazza_policriti.dovier_piazza_policriti
+        .dovier_piazza_policriti`), and must be picklable (a module-level
+        function or a :func:`functools.partial` of it). Defaults to
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`.
+    :param workers: The number of worker processes. Defaults to `None`, in
+        which case we use the number of processors. If `workers` is 1, or the
+        graph is connected, `algorithm` is applied to the whole graph in the
+        current process.
+    :param nvertexes: The number of vertexes, used only if `graph` is an edge
+        list. Defaults to `None`, in which case it's inferred from `graph`.
+    :param is_integer_graph: If `True`, we do not check if the given graph is
+        integer (saves time). Defaults to `False`.
+    :param output: The format of the result, `"tuples"` or `"labels"` (see
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Defaults to
+        `"tuples"`.
+    :returns: The RSCP/maximum bisimulation of the given labeling set as a
+        list of tuples, each of which contains bisimilar nodes (or in the
+        format given by `output`).
+    """
+
+    check_output(output)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    node_index = None
+    if is_edge_list(graph):
+        sources, destinations, nvertexes = edge_list_to_arrays(
+            graph, nvertexes
+        )
+    else:
+        if not isinstance(graph, nx.DiGraph):
+            raise Exception("graph should be a directed graph (nx.DiGraph)")
+
+        nvertexes = len(graph.nodes)
+        if is_integer_graph or check_normal_integer_graph(graph):
+            graph_edges = graph.edges
+        else:
+            node_index = NodeIndex(graph.nodes)
+            graph_edges = node_index.integer_edges(graph.edges)
+            if initial_partition is not None:
+                initial_partition = node_index.to_integer_partition(
+                    initial_partition
+                )
+        edges = np.fromiter(
+            (node for edge in graph_edges for node in edge),
+            dtype=np.int64,
+            count=2 * graph.number_of_edges(),
+        ).reshape(-1, 2)
+        sources = edges[:, 0]
+        destinations = edges[:, 1]
+
+    sources = np.asarray(sources, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    block = partition_to_block_array(initial_partition, nvertexes).astype(
+        np.int64
+    )
+
+    component = weakly_connected_components(sources, destinations, nvertexes)
+    if workers <= 1 or nvertexes == 0 or component.max() == 0:
+        rscp = algorithm(
+            np.stack((sources, destinations), axis=1),
+            block_array_to_tuple_list(block),
+            nvertexes=nvertexes,
+        )
+        if output == "labels":
+            rscp_block = partition_to_block_array(rscp, nvertexes).astype(
+                np.int64
+            )
+    else:
+        shard = assign_components(component, sources, workers)
+        union_block = _bisimulation_of_shards(
+            algorithm, sources, destinations, block, shard, workers
+        )
+        rscp_block = coarsen_union(sources, destinations, block, union_block)
+        if output == "tuples":
+            rscp = block_array_to_tuple_list(rscp_block)
+
+    if output == "labels":
+        return rscp_block if node_index is None else (rscp_block, node_index)
+    if node_index is None:
+        return rscp
+    else:
+        return node_index.to_original_partition(rscp)
+
+
+def _bisimulation_of_shards(
+    algorithm: Callable,
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    block: np.ndarray,
+    shard: np.ndarray,
+    nshards: int,
+) -> np.ndarray:
+    """Compute the RSCP of each shard in a pool of `nshards` processes.
+
+    :returns: The union of the RSCPs of the shards, as an array which maps
+        each vertex to the index of its block (blocks are numbered from 0
+        without holes).
+    """
+
+    nvertexes = len(block)
+    nedges = len(sources)
+
+    # relabel the vertexes and the edges such that each shard is contiguous
+    vertex_order = np.argsort(shard, kind="stable")
+    new_label = np.empty(nvertexes, dtype=np.int64)
+    new_label[vertex_order] = np.arange(nvertexes)
+    edge_order = np.argsort(shard[sources], kind="stable")
+
+    vertex_offsets = np.zeros(nshards + 1, dtype=np.int64)
+    np.cumsum(np.bincount(shard, minlength=nshards), out=vertex_offsets[1:])
+    edge_offsets = np.zeros(nshards + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(shard[sources], minlength=nshards), out=edge_offsets[1:]
+    )
+
+    shared_memory = SharedMemory(
+        create=True, size=max(8 * (2 * nedges + nvertexes), 1)
+    )
+    try:
+        data = np.ndarray(
+            (2 * nedges + nvertexes,), dtype=np.int64, buffer=shared_memory.buf
+        )
+        data[:nedges] = new_label[sources[edge_order]]
+        data[nedges:2 * nedges] = new_label[destinations[edge_order]]
+        data[2 * nedges:] = block[vertex_order]
+        del data
+
+        with ProcessPoolExecutor(max_workers=nshards) as executor:
+            futures = [
+                executor.submit(
+                    _bisimulation_of_shard,
+                    algorithm,
+                    shared_memory.name,
+                    nedges,
+                    nvertexes,
+                    (int(vertex_offsets[idx]), int(vertex_offsets[idx + 1])),
+                    (int(edge_offsets[idx]), int(edge_offsets[idx + 1])),
+                )
+                for idx in range(nshards)
+                if vertex_offsets[idx + 1] > vertex_offsets[idx]
+            ]
+            shard_blocks = [future.result() for future in futures]
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    union_block = np.empty(nvertexes, dtype=np.int64)
+    nblocks = 0
+    first_vertex = 0
+    for shard_block in shard_blocks:
+        end_vertex = first_vertex + len(shard_block)
+        union_block[vertex_order[first_vertex:end_vertex]] = (
+            shard_block + nblocks
+        )
+        nblocks += int(shard_block.max()) + 1
+        first_vertex = end_vertex
+    return union_block
@@ -0,0 +1,597 @@
+import bisect
+import heapq
+from typing import List, Dict, Union
+from bispy.utilities.graph_entities import _Vertex, _SCC
+from bispy.utilities.rank_computation import (
+    compute_rank,
+    scc_finishing_time_list,
+)
+
+# distance between the positions of consecutive SCCs in a new order, the
+# gaps leave room for the SCCs created by a split
+_POSITION_GAP = 1 << 16
+
+
+class Condensation:
+    """The graph of the *strongly connected components* of a graph, kept up
+    to date while new edges are added to the graph. This is used by
+    *Saha*'s algorithm, which needs SCCs, *rank* and *well-foundedness* of
+    each vertex after each update.
+
+    The image and counterimage of each
+    :class:`bispy.utilities.graph_entities._SCC` are stored persistently,
+    and the SCCs are kept in a *topological order* of :math:`G^{-1}`
+    (namely for each edge :math:`\\langle A,B \\rangle` of the condensation
+    the position of :math:`A` is greater than the position of :math:`B`).
+    The order is updated using the dynamic topological sort algorithm of
+    *Pearce* and *Kelly*, which only visits the SCCs whose position is
+    between the positions of the endpoints of the new edge. *Rank* and
+    *well-foundedness* are then propagated to the SCCs which reach the
+    source of the new edge, in increasing order of position.
+
+    When an edge is removed only the SCC which contained both its endpoints
+    (if any) is recomputed, and the changes of *rank* are propagated in the
+    same way. Positions are spaced out, therefore the SCCs created by a
+    split are placed in the gaps around the position of the old SCC,
+    without moving the other SCCs.
+
+    The *BisPy* representation of the graph must be updated by the caller
+    (see :func:`bispy.saha.saha.add_edge`).
+
+    :param vertexes: The vertexes of the graph. If their SCCs have not been
+        computed yet, they are computed together with the *rank*.
+    :param position: The position of each SCC (indexed by label) in a
+        topological order of :math:`G^{-1}`, for instance restored from a
+        snapshot (see :mod:`bispy.utilities.snapshot`). In this case *rank*
+        and *well-foundedness* of the SCCs must be up to date, and are not
+        computed again. Defaults to `None`.
+    """
+
+    def __init__(
+        self, vertexes: List[_Vertex], position: Dict[int, int] = None
+    ):
+        if any(vertex.scc is None for vertex in vertexes):
+            compute_rank(vertexes)
+
+        sccs = {}
+        for vertex in vertexes:
+            sccs[vertex.scc.label] = vertex.scc
+        sccs = list(sccs.values())
+
+        # SCCs made of a single vertex with an edge towards itself
+        self._self_loops = set()
+        for scc in sccs:
+            scc.compute_image()
+            scc.compute_counterimage()
+            if len(scc._vertexes) == 1:
+                vertex = next(iter(scc._vertexes))
+                if any(edge.destination is vertex for edge in vertex.image):
+                    self._self_loops.add(scc.label)
+
+        # labels assigned to the SCCs created by a split
+        self._next_label = max((scc.label for scc in sccs), default=-1) + 1
+
+        # position of each SCC in the topological order of G^{-1}
+        self._position = {}
+        # positions assigned to an SCC
+        self._used_positions = set()
+        # a lower bound for the positions, new SCCs are placed below it
+        self._lowest_position = 0
+        # number of SCCs with a given rank
+        self._rank_count = {}
+
+        if position is None:
+            for idx, scc in enumerate(scc_finishing_time_list(sccs)):
+                self._position[scc.label] = idx * _POSITION_GAP
+                self._update_scc(scc)
+        else:
+            self._position = dict(position)
+            self._lowest_position = min(
+                0, min(self._position.values(), default=0)
+            )
+        self._used_positions.update(self._position.values())
+
+        for scc in sccs:
+            self._rank_count[scc.rank] = self._rank_count.get(scc.rank, 0) + 1
+
+    @property
+    def max_rank(self) -> Union[int, float]:
+        """The maximum *rank* of a vertex in the graph."""
+
+        if len(self._rank_count) == 0:
+            return float("-inf")
+        return max(self._rank_count)
+
+    def position(self, scc: _SCC) -> int:
+        """The position of the given SCC in the topological order of
+        :math:`G^{-1}`.
+
+        :param scc: An SCC of the graph.
+        """
+
+        return self._position[scc.label]
+
+    def _discard_rank(self, rank: Union[int, float]):
+        self._rank_count[rank] -= 1
+        if self._rank_count[rank] == 0:
+            del self._rank_count[rank]
+
+    def _cyclic(self, scc: _SCC) -> bool:
+        return len(scc._vertexes) > 1 or scc.label in self._self_loops
+
+    def _update_scc(self, scc: _SCC) -> bool:
+        """Recompute *rank* and *well-foundedness* of the given SCC from its
+        image, whose *rank* must be already up to date.
+
+        :param scc: The SCC to be updated.
+        :returns: `True` if *rank* or *well-foundedness* changed.
+        """
+
+        wf = not self._cyclic(scc)
+        if len(scc._image) == 0:
+            rank = 0 if wf else float("-inf")
+        else:
+            rank = float("-inf")
+            for image_scc in scc._image.values():
+                if image_scc._wf:
+                    rank = max(rank, image_scc._rank + 1)
+                else:
+                    wf = False
+                    rank = max(rank, image_scc._rank)
+
+        changed = (
+            scc._wf is None or scc._wf != wf or scc._rank != rank
+        )
+        scc._wf = wf
+        scc._rank = rank
+        return changed
+
+    def _propagate(self, sccs: List[_SCC], force: bool = False):
+        """Recompute *rank* and *well-foundedness* of the given SCCs, and
+        propagate the changes to their counterimage in increasing order of
+        position (therefore the image of an SCC is always updated before the
+        SCC itself).
+
+        :param sccs: The first SCCs to be updated.
+        :param force: If `True`, the counterimage of `sccs` is updated even if
+            their *rank* did not change (this is needed after a merge or a
+            split).
+        """
+
+        heap = [(self._position[scc.label], scc.label, scc) for scc in sccs]
+        heapq.heapify(heap)
+        queued = set(scc.label for scc in sccs)
+        forced = set(queued) if force else ()
+        while heap:
+            _, label, current = heapq.heappop(heap)
+            queued.discard(label)
+
+            old_rank = current._rank
+            changed = self._update_scc(current)
+            if changed:
+                self._discard_rank(old_rank)
+                self._rank_count[current._rank] = (
+                    self._rank_count.get(current._rank, 0) + 1
+                )
+
+            if changed or label in forced:
+                for counterimage_scc in current._counterimage.values():
+                    if counterimage_scc.label not in queued:
+                        queued.add(counterimage_scc.label)
+                        heapq.heappush(
+                            heap,
+                            (
+                                self._position[counterimage_scc.label],
+                                counterimage_scc.label,
+                                counterimage_scc,
+                            ),
+                        )
+
+    def _visit(
+        self, start: _SCC, forward: bool, bound: int, target: _SCC
+    ) -> Dict[int, _SCC]:
+        """Visit the condensation starting from `start`, moving only to SCCs
+        whose position is between the position of `start` and `bound`. The
+        SCC `target` is recorded but not expanded.
+
+        :param start: The first SCC to be visited.
+        :param forward: If `True` the visit follows the image of each SCC,
+            otherwise it follows the counterimage.
+        :param bound: The position where the visit stops.
+        :param target: The other endpoint of the new edge.
+        :returns: The visited SCCs (a `dict` indexed by label).
+        """
+
+        visited = {start.label: start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            if current is target:
+                continue
+
+            if forward:
+                adjacent = current._image.values()
+            else:
+                adjacent = current._counterimage.values()
+
+            for scc in adjacent:
+                if scc.label in visited:
+                    continue
+                if forward:
+                    in_bounds = self._position[scc.label] > bound
+                else:
+                    in_bounds = self._position[scc.label] < bound
+                if in_bounds or scc is target:
+                    visited[scc.label] = scc
+                    stack.append(scc)
+        return visited
+
+    def _merge(self, sccs: List[_SCC]) -> _SCC:
+        """Merge the given SCCs (which are a cycle of the condensation) into
+        the biggest one, and update image and counterimage of the adjacent
+        SCCs.
+
+        :param sccs: The SCCs to be merged.
+        :returns: The SCC which contains all the vertexes of `sccs`.
+        """
+
+        merged = max(sccs, key=lambda scc: len(scc._vertexes))
+        labels = set(scc.label for scc in sccs)
+
+        image = {}
+        counterimage = {}
+        for scc in sccs:
+            image.update(scc._image)
+            counterimage.update(scc._counterimage)
+        for label in labels:
+            image.pop(label, None)
+            counterimage.pop(label, None)
+
+        for scc in sccs:
+            # image and counterimage are destroyed by join
+            for adjacent in scc._image.values():
+                adjacent._counterimage.pop(scc.label, None)
+            for adjacent in scc._counterimage.values():
+                adjacent._image.pop(scc.label, None)
+
+            self._discard_rank(scc._rank)
+            self._self_loops.discard(scc.label)
+
+        for scc in sccs:
+            if scc is not merged:
+                del self._position[scc.label]
+                merged.join(scc)
+
+        merged._image = image
+        merged._counterimage = counterimage
+        for adjacent in image.values():
+            adjacent._counterimage[merged.label] = merged
+        for adjacent in counterimage.values():
+            adjacent._image[merged.label] = merged
+
+        self._update_scc(merged)
+        self._rank_count[merged._rank] = (
+            self._rank_count.get(merged._rank, 0) + 1
+        )
+        return merged
+
+    def add_edge(self, source: _Vertex, destination: _Vertex) -> bool:
+        """Update the condensation after the addition of the edge
+        :math:`\\langle` `source, destination` :math:`\\rangle`. SCCs which
+        become part of a cycle are merged, and the *rank* of the vertexes
+        which reach `source` is updated.
+
+        :param source: The source of the new edge.
+        :param destination: The destination of the new edge.
+        :returns: `True` if the new edge closes a cycle (namely `source` and
+            `destination` are now in the same SCC).
+        """
+
+        source_scc = source.scc
+        destination_scc = destination.scc
+
+        if source_scc is destination_scc:
+            if len(source_scc._vertexes) == 1:
+                self._self_loops.add(source_scc.label)
+            self._propagate([source_scc])
+            return True
+
+        # the condensation does not change
+        if destination_scc.label in source_scc._image:
+            return False
+
+        source_scc._image[destination_scc.label] = destination_scc
+        destination_scc._counterimage[source_scc.label] = source_scc
+
+        source_position = self._position[source_scc.label]
+        destination_position = self._position[destination_scc.label]
+
+        cycle = False
+        if source_position < destination_position:
+            # SCCs reachable from the destination which may need to be moved
+            # below the source
+            forward = self._visit(
+                destination_scc,
+                forward=True,
+                bound=source_position,
+                target=source_scc,
+            )
+            # SCCs which reach the source and may need to be moved above the
+            # destination
+            backward = self._visit(
+                source_scc,
+                forward=False,
+                bound=destination_position,
+                target=destination_scc,
+            )
+
+            positions = sorted(
+                self._position[label]
+                for label in set(forward.keys()) | set(backward.keys())
+            )
+
+            # the SCCs which reach the source and are reachable from the
+            # destination are a cycle
+            cycle = source_scc.label in forward
+            if cycle:
+                cycle_sccs = [
+                    scc for label, scc in forward.items() if label in backward
+                ]
+            else:
+                cycle_sccs = []
+
+            def by_position(scc):
+                return self._position[scc.label]
+
+            # the SCCs reachable from the destination go below the source,
+            # the SCCs which reach the source go above the destination
+            lower = sorted(
+                (scc for scc in forward.values() if scc.label not in backward),
+                key=by_position,
+            )
+            upper = sorted(
+                (scc for scc in backward.values() if scc.label not in forward),
+                key=by_position,
+            )
+
+            for position, scc in zip(positions, lower):
+                self._position[scc.label] = position
+            for position, scc in zip(
+                positions[len(positions) - len(upper):], upper
+            ):
+                self._position[scc.label] = position
+            if cycle:
+                source_scc = self._merge(cycle_sccs)
+                self._position[source_scc.label] = positions[len(lower)]
+                # the positions of the other SCCs of the cycle are free
+                self._used_positions.difference_update(
+                    positions[len(lower) + 1: len(positions) - len(upper)]
+                )
+
+        self._propagate([source_scc], force=cycle)
+        return cycle
+
+    def _split(self, scc: _SCC) -> List[_SCC]:
+        """Recompute the SCCs of the subgraph induced by the vertexes of the
+        given SCC (using an iterative version of *Tarjan*'s algorithm). If
+        there is more than one component, `scc` is replaced by the new SCCs
+        in the condensation.
+
+        :param scc: The SCC to be split.
+        :returns: The new SCCs, in topological order of :math:`G^{-1}`.
+        """
+
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        tarjan_stack = []
+        components = []
+
+        for root in scc._vertexes:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            tarjan_stack.append(root)
+            on_stack.add(root)
+            stack = [(root, iter(root.image))]
+            while stack:
+                vertex, image = stack[-1]
+                for edge in image:
+                    destination = edge.destination
+                    if destination.scc is not scc:
+                        continue
+                    if destination not in index:
+                        index[destination] = lowlink[destination] = len(index)
+                        tarjan_stack.append(destination)
+                        on_stack.add(destination)
+                        stack.append((destination, iter(destination.image)))
+                        break
+                    elif destination in on_stack:
+                        lowlink[vertex] = min(
+                            lowlink[vertex], index[destination]
+                        )
+                else:
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[vertex])
+                    if lowlink[vertex] == index[vertex]:
+                        # components are found sinks first
+                        component = []
+                        while True:
+                            member = tarjan_stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member is vertex:
+                                break
+                        components.append(component)
+
+        if len(components) == 1:
+            return [scc]
+
+        # the new SCCs go between the image and the counterimage of the old
+        # SCC, which are not changed by the split
+        split_position = self._position.pop(scc.label)
+        self._used_positions.discard(split_position)
+        if scc._image:
+            lower = max(
+                self._position[label] for label in scc._image.keys()
+            )
+        else:
+            lower = split_position - (len(components) + 1) * _POSITION_GAP
+        if scc._counterimage:
+            upper = min(
+                self._position[label] for label in scc._counterimage.keys()
+            )
+        else:
+            upper = split_position + (len(components) + 1) * _POSITION_GAP
+        positions = self._free_positions(lower, upper, len(components))
+
+        # detach the old SCC
+        for adjacent in scc._image.values():
+            del adjacent._counterimage[scc.label]
+        for adjacent in scc._counterimage.values():
+            del adjacent._image[scc.label]
+        self._discard_rank(scc._rank)
+        self._self_loops.discard(scc.label)
+
+        new_sccs = []
+        for component in components:
+            new_scc = _SCC(label=self._next_label)
+            self._next_label += 1
+            for vertex in component:
+                new_scc.add_vertex(vertex)
+            new_sccs.append(new_scc)
+        scc.destroy()
+
+        for new_scc in new_sccs:
+            new_scc.compute_image()
+            new_scc.compute_counterimage()
+        for new_scc in new_sccs:
+            for adjacent in new_scc._image.values():
+                adjacent._counterimage[new_scc.label] = new_scc
+            for adjacent in new_scc._counterimage.values():
+                adjacent._image[new_scc.label] = new_scc
+
+            if len(new_scc._vertexes) == 1:
+                vertex = next(iter(new_scc._vertexes))
+                if any(edge.destination is vertex for edge in vertex.image):
+                    self._self_loops.add(new_scc.label)
+
+        if positions is not None:
+            for position, new_scc in zip(positions, new_sccs):
+                self._position[new_scc.label] = position
+            self._used_positions.update(positions)
+            self._lowest_position = min(self._lowest_position, positions[0])
+        else:
+            # there's no room between the image and the counterimage, the
+            # positions are recomputed from scratch
+            order = sorted(self._position, key=self._position.get)
+            lower = bisect.bisect_left(
+                [self._position[label] for label in order], split_position
+            )
+            order[lower:lower] = [new_scc.label for new_scc in new_sccs]
+            self._position = {
+                label: idx * _POSITION_GAP for idx, label in enumerate(order)
+            }
+            self._used_positions = set(self._position.values())
+            self._lowest_position = 0
+
+        for new_scc in new_sccs:
+            self._update_scc(new_scc)
+            self._rank_count[new_scc._rank] = (
+                self._rank_count.get(new_scc._rank, 0) + 1
+            )
+        return new_sccs
+
+    def _free_positions(
+        self, lower: int, upper: int, count: int
+    ) -> List[int]:
+        """Find `count` positions strictly between `lower` and `upper` which
+        are not assigned to any SCC, spread as evenly as possible.
+
+        :param lower: The lower bound.
+        :param upper: The upper bound.
+        :param count: The number of positions.
+        :returns: The positions in increasing order, or `None` if there's
+            not enough room between `lower` and `upper`.
+        """
+
+        step = (upper - lower) // (count + 1)
+        if step == 0:
+            return None
+
+        positions = []
+        for idx in range(1, count + 1):
+            position = lower + idx * step
+            while position in self._used_positions:
+                position += 1
+                if position == lower + (idx + 1) * step:
+                    return None
+            positions.append(position)
+        return positions
+
+    def remove_edge(self, source: _Vertex, destination: _Vertex):
+        """Update the condensation after the removal of the edge
+        :math:`\\langle` `source, destination` :math:`\\rangle` (which must
+        be already removed from the image of `source`). If the edge was
+        inside an SCC the SCC may be split, and the *rank* of the vertexes
+        which reach `source` is updated.
+
+        :param source: The source of the removed edge.
+        :param destination: The destination of the removed edge.
+        """
+
+        source_scc = source.scc
+        destination_scc = destination.scc
+
+        if source_scc is destination_scc:
+            if len(source_scc._vertexes) == 1:
+                self._self_loops.discard(source_scc.label)
+                self._propagate([source_scc])
+            else:
+                self._propagate(self._split(source_scc), force=True)
+        elif not any(
+            edge.destination.scc is destination_scc
+            for vertex in source_scc._vertexes
+            for edge in vertex.image
+        ):
+            # there's no other edge between the two SCCs
+            del source_scc._image[destination_scc.label]
+            del destination_scc._counterimage[source_scc.label]
+            self._propagate([source_scc])
+
+    def add_vertex(self, vertex: _Vertex):
+        """Add a new isolated vertex (a new SCC with *rank* 0) to the
+        condensation.
+
+        :param vertex: The new vertex, which must not have any edge.
+        """
+
+        scc = _SCC(label=self._next_label)
+        self._next_label += 1
+        scc.add_vertex(vertex)
+        scc.compute_image()
+        scc.compute_counterimage()
+
+        # an isolated SCC can go anywhere in the order
+        self._lowest_position -= _POSITION_GAP
+        self._position[scc.label] = self._lowest_position
+        self._used_positions.add(self._lowest_position)
+
+        self._update_scc(scc)
+        self._rank_count[scc._rank] = self._rank_count.get(scc._rank, 0) + 1
+
+    def remove_vertex(self, vertex: _Vertex):
+        """Remove an isolated vertex from the condensation.
+
+        :param vertex: The vertex to be removed, which must not have any edge.
+        """
+
+        scc = vertex.scc
+        self._discard_rank(scc._rank)
+        self._self_loops.discard(scc.label)
+        self._used_positions.discard(self._position.pop(scc.label))
+        scc.destroy()
+        vertex.scc = None
@@ -12,9 +12,7 @@ class RankedCompoundXBlocksContainer(CompoundXBlocksContainer):
             first_nonempty_index = -1
 
         for compound_xblock in compound_xblocks:
-            rank = (
-                compound_xblock.qblocks.first.value.vertexes.first.value.rank
-            )
+            rank = compound_xblock.qblocks.first.vertexes.first.rank
             if rank == float("-inf"):
                 self._xblocks[0].append(compound_xblock)
                 first_nonempty_index = 0
@@ -46,11 +44,11 @@ class RankedCompoundXBlocksContainer(CompoundXBlocksContainer):
         )
 
     def append(self, xblock):
-        self.append_at_rank(xblock, xblock.qblocks.first.value.rank)
+        self.append_at_rank(xblock, xblock.qblocks.first.rank)
 
     def extend(self, new_compound_xblocks):
         for xblock in new_compound_xblocks:
-            first_qblock_rank = xblock.qblocks.first.value.rank
+            first_qblock_rank = xblock.qblocks.first.rank
             self.append_at_rank(xblock, first_qblock_rank)
 
     def pop(self):
@@ -1,4 +1,3 @@
-from llist import dllist, dllistnode
 from typing import List, Dict, Any, Tuple, Iterable
 import networkx as nx
 from bispy.utilities.graph_entities import (
@@ -26,6 +25,7 @@ from bispy.utilities.graph_normalization import (
     convert_to_integer_graph,
     back_to_original,
 )
+from bispy.utilities.stats import Stats
 
 
 # returns a list of labels splitted in partitions
@@ -33,6 +33,7 @@ def pta(
     x_partition: List[_XBlock],
     q_partition: List[_QBlock],
     compound_xblocks: RankedCompoundXBlocksContainer,
+    stats: Stats = None,
 ) -> List[Tuple[_Vertex]]:
     """Apply the Ranked *Paige-Tarjan*'s algorithm to obtain the RSCP/maximum
     bisimulation of the given `q_partition`.
@@ -41,17 +42,25 @@ def pta(
     :param q_partition: The partition :math:`Q`.
     :param compound_xblocks: List of compound blocks of :math:`X` (namely
         blocks that contain more than one block of the partition  :math:`Q`).
+    :param stats: If not `None`, the instrumentation data of each refinement
+        step is added to this object (see
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
     """
 
     while compound_xblocks._first_nonempty_index > 0:
-        x_partition, new_qblocks = refine(compound_xblocks, x_partition)
+        x_partition, new_qblocks = refine(
+            compound_xblocks, x_partition, stats
+        )
         q_partition.extend(new_qblocks)
 
     return list(filter(lambda qblock: qblock.size > 0, q_partition))
 
 
 def ranked_split(
-    current_partition: List[_QBlock], B_qblock: _QBlock, max_rank: int
+    current_partition: List[_QBlock],
+    B_qblock: _QBlock,
+    max_rank: int,
+    stats: Stats = None,
 ) -> List[Tuple[_Vertex]]:
     """Split the given partition using the block `B_qblock` as *splitter*, then
     use Ranked *Paige-Tarjan*'s algorithm on the resulting partition.
@@ -60,15 +69,20 @@ def ranked_split(
         :class:`bispy.utilities.graph_entities._QBlock`.
     :param B_qblock: The block to be used as *splitter*.
     :param max_rank: The maximum rank which may be found in the graph.
+    :param stats: If not `None`, the instrumentation data of Ranked
+        *Paige-Tarjan*'s algorithm is added to this object (see
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
     :returns: The output of Ranked *Paige-Tarjan*'s algorithm as a list of
         tuples of vertexes.
     """
 
-    # initialize x_partition and q_partition
+    # initialize x_partition and q_partition. a qblock belongs to one xblock
+    # at a time, therefore we remove it from its previous xblock
+    for qblock in current_partition:
+        if qblock.xblock is not None:
+            qblock.xblock.remove_qblock(qblock)
     x_partition = [
-        # this also overwrites any information about parent xblocks for qblock
-        _XBlock().append_qblock(qblock)
-        for qblock in current_partition
+        _XBlock().append_qblock(qblock) for qblock in current_partition
     ]
     q_partition = current_partition
 
@@ -90,4 +104,4 @@ def ranked_split(
         new_compound_xblocks, max_rank
     )
 
-    return pta(x_partition, q_partition, compound_xblocks)
+    return pta(x_partition, q_partition, compound_xblocks, stats)
@@ -5,7 +5,6 @@ from bispy.utilities.graph_entities import (
     _Edge,
     _Count,
     _XBlock,
-    _SCC,
 )
 from typing import List, Tuple, Set, Dict, Union
 from .ranked_pta import ranked_split
@@ -14,11 +13,9 @@ from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
     build_block_counterimage,
 )
 from itertools import product, chain, combinations
-from bispy.utilities.kosaraju import kosaraju
-from bispy.utilities.rank_computation import (
-    scc_finishing_time_list,
-)
 from operator import attrgetter
+from bispy.saha.condensation import Condensation
+from bispy.utilities.stats import Stats
 
 
 def add_edge(source: _Vertex, destination: _Vertex) -> _Edge:
@@ -70,7 +67,7 @@ def is_in_image(ublock: _Block, vblock: _Block) -> bool:
 
     # since we assume that the given blocks are members of an RSCP, we only
     # need to verify if a single vertex of ublock has an edge towards vblock
-    vertex = ublock.vertexes.first.value
+    vertex = ublock.vertexes.first
     return any(
         map(
             lambda block: block == vblock,
@@ -89,25 +86,23 @@ def check_new_scc(
     root_call=True,
 ) -> bool:
     """Check if a new *strongly connected component* has been created after
-    the addition of a new edge. This is meant to be a *recursive* method,
-    therefore the new edge is not always :math:`\\langle`
-    `current_source, destination` :math:`\\rangle`.
+    the addition of a new edge :math:`\\langle` `current_source, destination`
+    :math:`\\rangle`.
 
-    This method visits :math:`G^{-1}` recursively (with a DFS strategy)
-    starting from `current_source` until it finds the `destination` vertex, in
-    which case a new SCC is recognized.
+    This method visits :math:`G^{-1}` (with a DFS strategy, using an explicit
+    stack instead of recursion) starting from `current_source` until it finds
+    the `destination` vertex, in which case a new SCC is recognized.
 
     Meanwhile it also sets the flag `visited` for each visited vertex to
     prevent visiting the same node twice. At the end of the execution the
     root call **cleans** the flag `visited` for each vertex by exploring each
-    vertex in the list `visited_vertexes`, which is passed automatically from
-    the root call to all its children.
+    vertex in the list `visited_vertexes`.
 
     It also sets the flag `visited` for each visited
     :class:`bispy.utilities.graph_entities._QBlock`. This information is used
     in other parts of the algorithm.
 
-    :param current_source: The current starting point for the DFS of
+    :param current_source: The starting point for the DFS of
         :math:`G^{-1}`.
     :param destination: The destination vertex of the new edge.
     :param finishing_time_list: An empty list which will be filled with
@@ -118,9 +113,9 @@ def check_new_scc(
         the vertexes visited during the execution. You do not need to pass a
         non-`None` value since the root call takes care of the necessary
         cleanup which occurs after the execution of the function.
-    :param root_call: `True` if this instance of the function is the root call.
-        Passing any value other than `True` (from a user perspective) is going
-        to end with an exception.
+    :param root_call: If `False`, `current_source` is assumed to be already
+        marked as visited, and the flag `visited` is not cleaned at the end
+        (the caller is responsible for the vertexes in `visited_vertexes`).
 
     :return: `True` if a new *strongly connected component* has been created,
         `False` otherwise.
@@ -142,39 +137,31 @@ def check_new_scc(
 
     flag_scc_found = False
 
-    for edge in current_source.counterimage:
-        # we reached the block [v], therefore this is a new SCC
-        if edge.source == destination:
-            flag_scc_found = True
-
-        if (
-            not edge.source.visited
-            # and min_rank <= edge.source.rank
-            # and edge.source.rank <= max_rank
-        ):
-            # we don't want to visit a vertex more than one time
-            edge.source.visited = True
-            visited_vertexes.append(edge.source)
-
-            edge.source.qblock.visited = True
-
-            # if at least one of the possible ramifications is True,
-            # return True
-            flag_scc_found = (
-                check_new_scc(
-                    edge.source,
-                    destination,
-                    finishing_time_list,
-                    # min_rank,
-                    # max_rank,
-                    visited_vertexes,
-                    root_call=False,
-                )
-                or flag_scc_found
-            )
+    # each item is a vertex and an iterator over its counterimage
+    stack = [(current_source, iter(current_source.counterimage))]
+    while stack:
+        for edge in stack[-1][1]:
+            # we reached the block [v], therefore this is a new SCC
+            if edge.source == destination:
+                flag_scc_found = True
 
-    if finishing_time_list is not None:
-        finishing_time_list.append(current_source)
+            if (
+                not edge.source.visited
+                # and min_rank <= edge.source.rank
+                # and edge.source.rank <= max_rank
+            ):
+                # we don't want to visit a vertex more than one time
+                edge.source.visited = True
+                visited_vertexes.append(edge.source)
+
+                edge.source.qblock.visited = True
+
+                stack.append((edge.source, iter(edge.source.counterimage)))
+                break
+        else:
+            vertex = stack.pop()[0]
+            if finishing_time_list is not None:
+                finishing_time_list.append(vertex)
 
     # we have to clean the flag "visited" for each visited vertex
     if root_call:
@@ -310,21 +297,11 @@ def merge_condition(
         return True
 
 
-def recursive_merge(block1: _Block, block2: _Block):
-    """Merge `block1`, `block2` (put the vertexes of `block2` into
-    `block1`), deteach `block2` from the partition, and check recursively if
-    we can also merge some couples of predecessors of `block1` and `block2`
-    (namely couple of blocks :math:`C,D` such that
-
-    .. math::
-
-        C \\implies \\textit{block1} \\land D \\implies \\textit{block2}
-
-    where the relation ":math:`\\implies`" means that there is at least one
-    vertex of the rightmost block which is a child of the leftmost block).
-
-    If such at couple exists, the method recursively merges those two blocks,
-    for each couple for which :func:`merge_condition` is `True`.
+def _merge_and_list_predecessors(block1: _Block, block2: _Block):
+    """Merge `block2` into `block1`, and then yield the couples of
+    predecessors of the two blocks which need to be verified (see
+    :func:`recursive_merge`). The merge occurs when the first couple is
+    requested.
 
     :param block1: A block.
     :param block2: A block.
@@ -348,8 +325,39 @@ def recursive_merge(block1: _Block, block2: _Block):
                 or (id(b2), id(b1)) in verified_couples
             ):
                 verified_couples[id(b1), id(b2)] = True
-                if merge_condition(b1, b2):
-                    recursive_merge(b1, b2)
+                yield (b1, b2)
+
+
+def recursive_merge(block1: _Block, block2: _Block):
+    """Merge `block1`, `block2` (put the vertexes of `block2` into
+    `block1`), deteach `block2` from the partition, and check recursively if
+    we can also merge some couples of predecessors of `block1` and `block2`
+    (namely couple of blocks :math:`C,D` such that
+
+    .. math::
+
+        C \\implies \\textit{block1} \\land D \\implies \\textit{block2}
+
+    where the relation ":math:`\\implies`" means that there is at least one
+    vertex of the rightmost block which is a child of the leftmost block).
+
+    If such at couple exists, the method recursively merges those two blocks,
+    for each couple for which :func:`merge_condition` is `True`. The
+    recursion is simulated using an explicit stack of generators (one for
+    each pending merge).
+
+    :param block1: A block.
+    :param block2: A block.
+    """
+
+    stack = [_merge_and_list_predecessors(block1, block2)]
+    while stack:
+        for b1, b2 in stack[-1]:
+            if merge_condition(b1, b2):
+                stack.append(_merge_and_list_predecessors(b1, b2))
+                break
+        else:
+            stack.pop()
 
 
 def merge_phase(
@@ -375,7 +383,7 @@ def merge_phase(
                 recursive_merge(ublock, u1block)
 
 
-def merge_step(vertex, X, visited_vertexes, cant_merge_dict):
+def _try_merge(vertex, X, visited_vertexes, cant_merge_dict):
     vertex.visited = True
     visited_vertexes.append(vertex)
 
@@ -411,9 +419,23 @@ def merge_step(vertex, X, visited_vertexes, cant_merge_dict):
 
         vertex.qblock.tried_merge = True
 
-    for edge in vertex.image:
-        if not edge.destination.visited:
-            merge_step(edge.destination, X, visited_vertexes, cant_merge_dict)
+
+def merge_step(vertex, X, visited_vertexes, cant_merge_dict):
+    # DFS of G using an explicit stack of image iterators. we try to merge
+    # the block of each vertex when it's visited for the first time
+    _try_merge(vertex, X, visited_vertexes, cant_merge_dict)
+    stack = [iter(vertex.image)]
+
+    while stack:
+        for edge in stack[-1]:
+            if not edge.destination.visited:
+                _try_merge(
+                    edge.destination, X, visited_vertexes, cant_merge_dict
+                )
+                stack.append(iter(edge.destination.image))
+                break
+        else:
+            stack.pop()
 
 
 def preprocess_initial_partition(qblocks: List[_Block]):
@@ -439,7 +461,9 @@ def preprocess_initial_partition(qblocks: List[_Block]):
 
 
 def merge_split_phase(
-    qpartition: List[_Block], finishing_time_list: List[_Vertex]
+    qpartition: List[_Block],
+    finishing_time_list: List[_Vertex],
+    stats: Stats = None,
 ) -> List[_Block]:
     """
     The function `MergeAndSplitPhase` from the paper.
@@ -447,6 +471,9 @@ def merge_split_phase(
     :param qpartition: The current partition.
     :param finishing_time_list: List of vertexes in the graph ordered by
         finishing time.
+    :param stats: If not `None`, the instrumentation data of the nested
+        *Paige-Tarjan* is added to this object (see
+        :class:`bispy.utilities.stats.Stats`). Defaults to `None`.
     :returns: The updated partition.
     """
 
@@ -490,7 +517,9 @@ def merge_split_phase(
 
     xblock = _XBlock()
     for block in X:
-        # this is needed for PTA
+        # this is needed for PTA (a block belongs to one xblock at a time)
+        if block.xblock is not None:
+            block.xblock.remove_qblock(block)
         xblock.append_qblock(block)
         # set visited flag in order to compute the set (qpartition - X) easily
         block.visited = True
@@ -519,7 +548,7 @@ def merge_split_phase(
 
     # apply PTA and append the blocks to the new partition
     preprocess_initial_partition(X)
-    X2 = paige_tarjan_qblocks(X)
+    X2 = paige_tarjan_qblocks(X, stats)
     new_qpartition.extend(X2)
 
     for block in X2:
@@ -535,151 +564,15 @@ def merge_split_phase(
     # split, and clean block.visited
     for block in filter(attrgetter("is_new_qblock"), X2):
         # split
-        new_qpartition = ranked_split(new_qpartition, block, max_rank)
+        new_qpartition = ranked_split(
+            new_qpartition, block, max_rank, stats
+        )
         # clean
         block.is_new_qblock = False
 
     return new_qpartition
 
 
-def propagate_nwf(scc: _SCC, scc_finishing_time: List[_SCC]):
-    """Compute the updated *rank* of the given SCC, and propagate the change to
-    its counterimage in the order given by the finishing time of a visit
-    on the graph of strongly connected components of :math:`G`.
-
-    :param scc: The SCC for which we want to update the rank.
-    :param scc_finishing_time: A list of SCCs ordered by finishing time
-        of a DFS on the graph of strongly connected components of :math:`G`.
-    """
-    # TODO: è una DFS sul grafico delle SCC, o sul suo inverso?
-
-    if not scc.visited:
-        scc.visited = True
-
-        scc.compute_image()
-        scc.compute_counterimage()
-
-        if len(scc._image) == 0:
-            if len(scc._vertexes) == 0:
-                scc.mark_leaf()
-            else:
-                scc.mark_scc_leaf()
-        else:
-            mx = float("-inf")
-            # at this point we can rely on the flag wf since the visit
-            # occurs in the right order
-            for image_scc in scc.image:
-                if image_scc.wf is False:
-                    scc._wf = False
-
-                r = image_scc.rank
-                mx = max(mx, r + 1 if image_scc.wf else r)
-            scc._rank = mx
-
-        # since we store rank and wf into SCCs, there's no need to propagate
-        # the new rank to members of the SCC
-
-        for sf in scc_finishing_time:
-            if sf.label in scc._counterimage:
-                propagate_nwf(sf, scc_finishing_time)
-
-
-def propagate_wf(
-    vertex: _Vertex,
-    well_founded_topological: List[_Vertex],
-    scc_finishing_time: List[_SCC],
-):
-    """Recursively visit the well-founded counterimage of the given vertex and
-    update the *rank*. The visit is in increasing order of rank (this is needed
-    in order to obtain the correct result).
-
-    :param vertex: The vertex to whose counterimage we intend to propagate the
-        change of the *rank*. The *rank* of this argument must already be
-        updated, since it is left untouched after the execution.
-    :param well_founded_topological: List of well founded vertexes of the
-        **whole** graph in topological order.
-    """
-
-    for vx in well_founded_topological:
-        mx = vx.rank
-        for edge in vx.image:
-            if edge.destination.wf:
-                mx = max(mx, edge.destination.rank + 1)
-        vx.rank = mx
-
-    # propagate the changes also to nwf nodes
-    for vx in well_founded_topological:
-        for edge in vx.counterimage:
-            if not edge.source.wf:
-                propagate_nwf(edge.source.scc, scc_finishing_time)
-
-
-def build_well_founded_topological_list(
-    partition: List[_Block], source: _Vertex, max_rank: int
-) -> List[_Vertex]:
-    """
-    Build a list of all the vertexes in the graph sorted in increasing order
-    of *rank*.
-
-    We ignore all the nodes which do not have *rank* = :math:`-\\infty` and
-    have rank lower that the rank of the source vertex of the new edge.
-
-    :param partition: A partition of the graph from which we obtain the
-        instances of :class:`bispy.utilities.graph_entities._Vertex`. All the
-        nodes in the same block **must** have the same *rank*.
-    :param source: The source vertex of the new edge.
-    :param max_rank: The maximum rank of a vertex in this graph, used to create
-        a list of the appropriate size.
-    """
-
-    if source.rank == float("-inf"):
-        source_position = 0
-    else:
-        source_position = source.rank + 1
-
-    if max_rank == float("-inf"):
-        buckets = [None]
-    else:
-        buckets = [None for _ in range(max_rank + 2 - source_position)]
-
-    for block in partition:
-        if block.rank == float("-inf"):
-            idx = 0
-        elif block.rank >= source.rank:
-            idx = block.rank + 1 - source_position
-        else:
-            # we ignore blocks of rank lower than the rank of the source
-            continue
-
-        if buckets[idx] is None:
-            buckets[idx] = []
-
-        for vx in block.vertexes:
-            if vx.wf:
-                buckets[idx].append(vx)
-
-    wft = []
-    for rank_list in buckets:
-        if rank_list is not None:
-            wft.extend(rank_list)
-    return wft
-
-    """ dict_by_rank = {}
-    well_founded_topological = []
-    for block in old_rscp:
-        if block.rank in dict_by_rank:
-            ls = dict_by_rank[block.rank]
-        else:
-            ls = []
-            dict_by_rank[block.rank] = ls
-        for vertex in block.vertexes:
-            if vertex.wf:
-                ls.append(vertex)
-    for _, ls in dict_by_rank.items():
-        well_founded_topological.extend(ls)
-    return well_founded_topological """
-
-
 def filter_deteached(blocks: List[_Block]) -> List[_Block]:
     """
     Remove deteached blocks (blocks such that the attribute
@@ -694,6 +587,8 @@ def saha(
     old_rscp: List[_Block],
     vertexes: List[_Vertex],
     new_edge: Union[Tuple[_Vertex, _Vertex], Tuple[int, int]],
+    condensation: Condensation = None,
+    stats: Stats = None,
 ) -> List[_Block]:
     """
     Update the given RSCP/maximum bisimulation after the addition of the given
@@ -711,6 +606,16 @@ def saha(
         ints which represent the indexes of the nodes which characterize the
         edge). The first item represents the **source** of the edge, the second
         represents the **destination**.
+    :param condensation: The graph of *strongly connected components* of the
+        graph, which is updated in place. Defaults to `None`, in which case it
+        is built from `vertexes` (this costs :math:`O(|V| + |E|)`, pass an
+        instance of :class:`bispy.saha.condensation.Condensation` to update
+        the maximum bisimulation after each new edge).
+    :param stats: If not `None`, the time spent in each phase
+        (`"ranked_split"`, `"condensation"`, `"merge_phase"` or
+        `"merge_split_phase"`) and the counters of the algorithm are added to
+        this object (see :class:`bispy.utilities.stats.Stats`). Defaults to
+        `None`.
     :returns: The updated RSCP/maximum bisimulation. Also *rank* is updated for
         each vertex.
     """
@@ -723,100 +628,59 @@ def saha(
     else:
         raise ValueError("You must pass integers or Vertex instances!")
 
+    if condensation is None:
+        condensation = Condensation(vertexes)
+
+    if stats is not None:
+        stats.count("added_edges")
+        start = stats.clock()
+
     # if the new edge connects two blocks A,B such that A => B before the edge
     # is added we don't need to do anything
     if is_in_image(source_vertex.qblock, destination_vertex.qblock):
         add_edge(source_vertex, destination_vertex)
+        condensation.add_edge(source_vertex, destination_vertex)
+        if stats is not None:
+            stats.record("condensation", start)
+            stats.count("unchanged_partition")
         return old_rscp
 
-    max_rank = max(map(lambda block: block.rank, old_rscp))
-
-    well_founded_topological = build_well_founded_topological_list(
-        old_rscp, vertexes[new_edge[0]], max_rank
-    )
-
-    sccs_dict = {}
-    for vx in vertexes:
-        sccs_dict[vx.scc.label] = vx.scc
-    sccs = list(sccs_dict.values())
-
-    for scc in sccs:
-        scc.compute_image()
-
-    scc_finishing_time = scc_finishing_time_list(sccs)
-
-    # update immediately the wf flag
-    if not destination_vertex.wf:
-        source_vertex.wf = False
+    max_rank = condensation.max_rank
 
     # update the graph representation
     add_edge(source_vertex, destination_vertex)
 
-    qpartition = ranked_split(old_rscp, destination_vertex.qblock, max_rank)
-
-    # u isn't well founded, v is well founded
-    if not source_vertex.wf and destination_vertex.wf:
-        # if necessary, update the rank of u and propagate the changes
-        if destination_vertex.rank + 1 > source_vertex.rank:
-            source_vertex.rank = destination_vertex.rank + 1
+    # the split uses the old rank, which is the same for all the vertexes of
+    # a block of old_rscp
+    qpartition = ranked_split(
+        old_rscp, destination_vertex.qblock, max_rank, stats
+    )
 
-            # source_vertex doesn't become nwf
-            propagate_nwf(source_vertex.scc, scc_finishing_time)
+    if stats is not None:
+        start = stats.record("ranked_split", start)
 
-        merge_phase(source_vertex.qblock, destination_vertex.qblock)
-        return filter_deteached(qpartition)
-    else:
-        # in this case we don't need to update the rank
-        if source_vertex.rank > destination_vertex.rank:
-            merge_phase(source_vertex.qblock, destination_vertex.qblock)
-            return filter_deteached(qpartition)
-        else:
-            # we want to save the finishing time list
-            finishing_time_list = []
-
-            # in this case u is part of the new SCC (which contains also
-            # v), therefore it isn't well founded
-            if check_new_scc(
-                source_vertex,
-                destination_vertex,
-                finishing_time_list,
-            ):
-                sccs = kosaraju(source_vertex, return_sccs=True)
-                for scc in sccs:
-                    scc.compute_image()
-                    scc.compute_counterimage()
+    # update SCCs, rank and well-foundedness. if the new edge closes a cycle,
+    # u is part of the new SCC (which contains also v)
+    new_scc = condensation.add_edge(source_vertex, destination_vertex)
 
-                scc_finishing_time = scc_finishing_time_list(sccs)
+    if stats is not None:
+        start = stats.record("condensation", start)
 
-                propagate_nwf(source_vertex.scc, scc_finishing_time)
-                return merge_split_phase(qpartition, finishing_time_list)
-            else:
-                if source_vertex.wf:
-                    if destination_vertex.wf:
-                        # we already know that u.rank <= v.rank
-                        source_vertex.rank = destination_vertex.rank + 1
-                        topological_sorted_wf = None
-                        propagate_wf(
-                            source_vertex,
-                            well_founded_topological,
-                            scc_finishing_time,
-                        )
-                    # u becomes non-well-founded
-                    else:
-                        if source_vertex.rank < destination_vertex.rank:
-                            source_vertex.rank = destination_vertex.rank
-
-                            propagate_nwf(
-                                source_vertex.scc, scc_finishing_time
-                            )
-                else:
-                    if source_vertex.rank < destination_vertex.rank:
-                        source_vertex.rank = destination_vertex.rank
-
-                        # we don't need to update the nwf list since
-                        # source_vertex was already nwf
-
-                        propagate_nwf(source_vertex.scc, scc_finishing_time)
-
-                merge_phase(source_vertex.qblock, destination_vertex.qblock)
-                return filter_deteached(qpartition)
+    if new_scc:
+        # we want to save the finishing time list
+        finishing_time_list = []
+        check_new_scc(
+            source_vertex,
+            destination_vertex,
+            finishing_time_list,
+        )
+        qpartition = merge_split_phase(qpartition, finishing_time_list, stats)
+        if stats is not None:
+            stats.record("merge_split_phase", start)
+        return qpartition
+    else:
+        merge_phase(source_vertex.qblock, destination_vertex.qblock)
+        qpartition = filter_deteached(qpartition)
+        if stats is not None:
+            stats.record("merge_phase", start)
+        return qpartition
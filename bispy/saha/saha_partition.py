@@ -1,14 +1,43 @@
-from bispy.saha.saha import saha as saha_algorithm
+from bispy.saha.saha import (
+    saha as saha_algorithm,
+    add_edge as add_edge_to_graph,
+    is_in_image,
+)
+from bispy.saha.condensation import Condensation
 from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
-    convert_to_integer_graph,
-    back_to_original,
+    NodeIndex,
+)
+from bispy.utilities.graph_decorator import (
+    decorate_nx_graph,
+    decorate_edge_list,
+    to_tuple_list,
+    to_block_array,
+    check_output,
+)
+from bispy.utilities.edge_list import is_edge_list
+from bispy.utilities.snapshot import (
+    vertexes_to_arrays,
+    arrays_to_vertexes,
+    qblocks_to_arrays,
+    arrays_to_qblocks,
+    nodes_to_array,
+    array_to_nodes,
 )
-from bispy.utilities.graph_decorator import decorate_nx_graph, to_tuple_list
-from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks
+from bispy.utilities.stats import Stats
+from bispy.paige_tarjan.paige_tarjan import (
+    paige_tarjan,
+    paige_tarjan_qblocks,
+)
+import numpy as np
 import networkx as nx
-from typing import Union, List, Dict, Any, Tuple
-from bispy.utilities.graph_entities import _QBlock, _Vertex
+from itertools import chain
+from typing import Union, List, Dict, Any, Tuple, Iterable
+from bispy.utilities.graph_entities import _QBlock, _Vertex, _Count
+
+# add_edges recomputes the maximum bisimulation from scratch if the number of
+# edges which need an incremental update exceeds this threshold
+_BATCH_RERUN_THRESHOLD = 2
 
 
 class SahaPartition:
@@ -18,20 +47,65 @@ class SahaPartition:
 
     :param qblocks: The current partition of the nodes of the graph.
     :param qblocks: Nodes in the graph.
-    :param node_to_idx: A `dict` which maps nodes from the original graph
-        to nodes of the isomorphic integer graph (see
-        :mod:`bispy.utilities.graph_normalization`).
+    :param node_to_idx: A
+        :class:`bispy.utilities.graph_normalization.NodeIndex` (or a `dict`)
+        which maps nodes from the original graph to nodes of the isomorphic
+        integer graph (see :mod:`bispy.utilities.graph_normalization`), or
+        `None` if the graph is integer.
+    :param stats: If not `None`, the instrumentation data of each update is
+        added to this object (see :class:`bispy.utilities.stats.Stats`).
+        Defaults to `None`.
+    :param output: The format of the maximum bisimulation returned by the
+        updates, `"tuples"` or `"labels"` (see
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Removed nodes
+        are mapped to the block -1 in the second case. Defaults to
+        `"tuples"`.
+    :param condensation: The graph of the *strongly connected components* of
+        the graph. Defaults to `None`, in which case it is built from
+        `vertexes`.
     """
 
     def __init__(
         self,
         qblocks: List[_QBlock],
         vertexes: List[_QBlock],
-        node_to_idx: Dict[Any, int],
+        node_to_idx: Union[NodeIndex, Dict[Any, int]],
+        stats: Stats = None,
+        output: str = "tuples",
+        condensation: Condensation = None,
     ):
+        check_output(output)
         self.qblocks = qblocks
         self.vertexes = vertexes
-        self.node_to_idx = node_to_idx
+        self.stats = stats
+        self.output = output
+        # SCCs are updated incrementally after each new edge
+        if condensation is None:
+            condensation = Condensation(vertexes)
+        self.condensation = condensation
+
+        # labels of removed vertexes (holes in `vertexes`), reused by new
+        # vertexes
+        self._free_labels = []
+        # the block which contains the sinks of each block of the labeling set
+        self._sink_blocks = {}
+
+        if node_to_idx is None or isinstance(node_to_idx, NodeIndex):
+            self.node_index = node_to_idx
+        else:
+            idx_to_node = [None] * len(node_to_idx)
+            for node, idx in node_to_idx.items():
+                idx_to_node[idx] = node
+            self.node_index = NodeIndex(idx_to_node)
+
+    @property
+    def node_to_idx(self) -> Dict[Any, int]:
+        """The `dict` which maps nodes from the original graph to nodes of the
+        isomorphic integer graph (`None` if the graph is integer)."""
+
+        if self.node_index is None:
+            return None
+        return self.node_index.node_to_idx
 
     def add_edge(
         self, edge: Tuple[Any, Any], verbose=True
@@ -51,26 +125,620 @@ class SahaPartition:
 
         # if the original graph was not integer the user is going to expect
         # to be able to insert a new edge mentioning the original nodes
-        if self.node_to_idx is not None:
-            edge = (self.node_to_idx[edge[0]], self.node_to_idx[edge[1]])
+        if self.node_index is not None:
+            edge = (
+                self.node_index.index(edge[0]),
+                self.node_index.index(edge[1]),
+            )
+
+        self.qblocks = saha_algorithm(
+            self.qblocks, self.vertexes, edge, self.condensation, self.stats
+        )
+        if verbose:
+            return self._maximum_bisimulation()
+
+    def add_edges(
+        self,
+        edges: Iterable[Tuple[Any, Any]],
+        verbose=True,
+        rerun_threshold: int = None,
+    ) -> Union[None, List[Tuple[Any]]]:
+        """Add a batch of new edges to the graph, and recompute its maximum
+        bisimulation.
+
+        Edges whose source block already reaches the block of the destination
+        do not change the maximum bisimulation, therefore they are added
+        first without any further work. The remaining edges are added one at
+        a time using *Saha*'s algorithm, unless they are more than
+        `rerun_threshold`: in that case each incremental update would pay
+        the :math:`O(|V| + |E|)` setup of :func:`bispy.saha.saha.saha`, and
+        the maximum bisimulation of the whole new graph is recomputed once
+        using *Paige-Tarjan*'s algorithm.
+
+        :param edges: The new edges (the first item of each edge is the
+            source, the second item is the destination). Repeated edges are
+            added only once, edges which are already in the graph are
+            ignored.
+        :param verbose: If `True`, this methods returns the new maximum
+            bisimulation after the addition of the new edges. Defaults to
+            True.
+        :param rerun_threshold: The maximum number of edges processed
+            incrementally. Defaults to `None`, in which case we use a
+            module-level default.
+        :return: The maximim bisimulation after the addition of the new edges
+            if `verbose` is `True`.
+        """
+
+        if rerun_threshold is None:
+            rerun_threshold = _BATCH_RERUN_THRESHOLD
+
+        if self.node_index is not None:
+            edges = self.node_index.integer_edges(edges)
+        # remove duplicates, preserving the order
+        edges = list(dict.fromkeys(map(tuple, edges)))
+
+        # remove the edges which are already in the graph (the image of each
+        # source is visited once)
+        image_labels = {}
+        for source, _ in edges:
+            if source not in image_labels:
+                image_labels[source] = set(
+                    edge.destination.label
+                    for edge in self.vertexes[source].image
+                )
+        edges = [
+            edge for edge in edges if edge[1] not in image_labels[edge[0]]
+        ]
+
+        # edges between blocks which are already in the image of each other
+        # do not change the maximum bisimulation
+        slow_edges = []
+        for edge in edges:
+            source = self.vertexes[edge[0]]
+            destination = self.vertexes[edge[1]]
+            if is_in_image(source.qblock, destination.qblock):
+                add_edge_to_graph(source, destination)
+                self.condensation.add_edge(source, destination)
+            else:
+                slow_edges.append(edge)
+
+        if len(slow_edges) > rerun_threshold:
+            self._recompute(slow_edges)
+        else:
+            for edge in slow_edges:
+                self.qblocks = saha_algorithm(
+                    self.qblocks,
+                    self.vertexes,
+                    edge,
+                    self.condensation,
+                    self.stats,
+                )
+
+        if verbose:
+            return self._maximum_bisimulation()
+
+    def remove_edge(
+        self, edge: Tuple[Any, Any], verbose=True
+    ) -> Union[None, List[Tuple[Any]]]:
+        """Remove an edge from the graph, and recompute its maximum
+        bisimulation incrementally (see :meth:`remove_edges`).
+
+        :param edge: The edge to be removed (the first item is the source, the
+            second item is the destination).
+        :param verbose: If `True`, this methods returns the new maximum
+            bisimulation after the removal of the edge. Defaults to True.
+        :return: The maximim bisimulation after the removal of the edge if
+            `verbose` is `True`.
+        """
+
+        return self.remove_edges([edge], verbose)
+
+    def remove_edges(
+        self, edges: Iterable[Tuple[Any, Any]], verbose=True
+    ) -> Union[None, List[Tuple[Any]]]:
+        """Remove a batch of edges from the graph, and recompute its maximum
+        bisimulation incrementally.
+
+        Only the vertexes which reach the source of a removed edge may change
+        their behaviour. The other vertexes are successor-closed, therefore
+        their blocks do not change: each of these blocks is collapsed into a
+        single node, and *Paige-Tarjan*'s algorithm is applied to the graph
+        made of the affected vertexes and the blocks which may be reached
+        from them, or may contain vertexes bisimilar to them (same label and
+        *rank*). Finally the affected vertexes are moved to their new blocks,
+        and the `count` of the edges towards them is updated.
+
+        :param edges: The edges to be removed (the first item of each edge is
+            the source, the second item is the destination).
+        :param verbose: If `True`, this methods returns the new maximum
+            bisimulation after the removal of the edges. Defaults to True.
+        :return: The maximim bisimulation after the removal of the edges if
+            `verbose` is `True`.
+        """
+
+        if self.stats is not None:
+            start = self.stats.clock()
+
+        if self.node_index is not None:
+            edges = self.node_index.integer_edges(edges)
+        edges = list(dict.fromkeys(map(tuple, edges)))
+
+        # find all the edges before modifying the graph
+        removed_edges = []
+        for source, destination in edges:
+            source = self.vertexes[source]
+            destination = self.vertexes[destination]
+            for edge in source.image:
+                if edge.destination is destination:
+                    removed_edges.append(edge)
+                    break
+            else:
+                raise ValueError(
+                    "The edge ({},{}) is not in the graph".format(
+                        source.label, destination.label
+                    )
+                )
+
+        for edge in removed_edges:
+            edge.source.image.remove(edge)
+            edge.destination.counterimage.remove(edge)
+            edge.count.value -= 1
+            self.condensation.remove_edge(edge.source, edge.destination)
+
+        self._refine_counterimage([edge.source for edge in removed_edges])
+
+        if self.stats is not None:
+            self.stats.record("remove_edges", start)
+            self.stats.count("removed_edges", len(removed_edges))
+
+        if verbose:
+            return self._maximum_bisimulation()
+
+    def add_node(self, node: Any, label_block: int = 0, verbose=True):
+        """Add a new isolated node to the graph. The node is placed in the
+        block which contains the sinks of its block of the labeling set (a new
+        block is created if there's no such block).
+
+        The integer which represents the node is taken from the labels of the
+        removed nodes, if any, in order to keep the integer graph dense. If
+        the graph is integer and `node` is not the label chosen in this way,
+        a :class:`bispy.utilities.graph_normalization.NodeIndex` is created
+        to map the nodes of the graph to the labels.
+
+        :param node: The new node.
+        :param label_block: The index of the block of the labeling set (the
+            initial partition) which contains the new node. A new index
+            represents a new block of the labeling set. Defaults to 0 (which
+            is the only block of the trivial labeling set).
+        :param verbose: If `True`, this methods returns the new maximum
+            bisimulation after the addition of the node. Defaults to True.
+        :return: The maximim bisimulation after the addition of the node if
+            `verbose` is `True`.
+        """
+
+        if self._contains(node):
+            raise ValueError(
+                "The node {} is already in the graph".format(node)
+            )
+
+        if len(self._free_labels) > 0:
+            label = self._free_labels.pop()
+        else:
+            label = len(self.vertexes)
+            self.vertexes.append(None)
+
+        if self.node_index is None and node != label:
+            self.node_index = NodeIndex(
+                idx if vertex is not None else None
+                for idx, vertex in enumerate(self.vertexes)
+            )
+        if self.node_index is not None:
+            self.node_index.add(node, label)
+
+        vertex = _Vertex(label)
+        vertex.initial_partition_block_id = label_block
+        self.vertexes[label] = vertex
+        self.condensation.add_vertex(vertex)
+
+        block = self._sink_block(label_block)
+        if block is None:
+            block = _QBlock([], None)
+            self.qblocks.append(block)
+            self._sink_blocks[label_block] = block
+        block.append_vertex(vertex)
+
+        if verbose:
+            return self._maximum_bisimulation()
+
+    def remove_node(self, node: Any, verbose=True):
+        """Remove a node (and all the edges which enter or leave it) from the
+        graph, and recompute its maximum bisimulation incrementally (see
+        :meth:`remove_edges`). The label of the *BisPy* vertex which
+        represented the node is reused by the next new node.
+
+        :param node: The node to be removed.
+        :param verbose: If `True`, this methods returns the new maximum
+            bisimulation after the removal of the node. Defaults to True.
+        :return: The maximim bisimulation after the removal of the node if
+            `verbose` is `True`.
+        """
+
+        if not self._contains(node):
+            raise ValueError("The node {} is not in the graph".format(node))
+
+        if self.node_index is None:
+            label = node
+        else:
+            label = self.node_index.index(node)
+        vertex = self.vertexes[label]
+
+        edges = [
+            (edge.source.label, edge.destination.label)
+            for edge in chain(vertex.image, vertex.counterimage)
+        ]
+        if self.node_index is not None:
+            edges = [
+                (self.node_index.node(source), self.node_index.node(dest))
+                for source, dest in edges
+            ]
+        self.remove_edges(edges, verbose=False)
+
+        self._discard_vertex(vertex)
+        if self.node_index is not None:
+            self.node_index.remove(node)
 
-        self.qblocks = saha_algorithm(self.qblocks, self.vertexes, edge)
         if verbose:
-            max_bisi = to_tuple_list(self.qblocks)
-            if self.node_to_idx is None:
-                return max_bisi
+            return self._maximum_bisimulation()
+
+    def save(self, path: str):
+        """Save the state of this object (the *BisPy* representation of the
+        graph, including *rank*, *well-foundedness*, SCCs and the values of
+        :class:`bispy.utilities.graph_entities._Count`, and the current
+        maximum bisimulation) to a `.npz` file, such that the incremental
+        updates can be resumed with :meth:`load` without computing anything
+        from scratch (see :mod:`bispy.utilities.snapshot`).
+
+        :param path: The path of the file.
+        """
+
+        arrays = vertexes_to_arrays(
+            self.vertexes, self.condensation._position
+        )
+        arrays.update(qblocks_to_arrays(self.qblocks))
+        arrays["free_labels"] = np.array(self._free_labels, dtype=np.int64)
+        arrays["output"] = np.array(self.output)
+        if self.node_index is not None:
+            arrays["nodes"] = nodes_to_array(self.node_index.idx_to_node)
+        np.savez(path, **arrays)
+
+    @staticmethod
+    def load(path: str, stats: Stats = None) -> "SahaPartition":
+        """Load an instance of :class:`SahaPartition` saved by :meth:`save`.
+
+        .. warning::
+            If the nodes are not integers they are unpickled, load only
+            trusted files.
+
+        :param path: The path of the file.
+        :param stats: If not `None`, the instrumentation data of each update
+            is added to this object. Defaults to `None`.
+        """
+
+        with np.load(path) as arrays:
+            vertexes, position = arrays_to_vertexes(arrays)
+            qblocks = arrays_to_qblocks(arrays, vertexes)
+            free_labels = arrays["free_labels"].tolist()
+            output = str(arrays["output"])
+            node_index = None
+            if "nodes" in arrays:
+                node_index = NodeIndex(array_to_nodes(arrays["nodes"]))
+
+        partition = SahaPartition(
+            qblocks,
+            vertexes,
+            node_index,
+            stats,
+            output,
+            Condensation(
+                [vertex for vertex in vertexes if vertex is not None],
+                position,
+            ),
+        )
+        partition._free_labels = free_labels
+        return partition
+
+    def _contains(self, node: Any) -> bool:
+        if self.node_index is not None:
+            return node in self.node_index
+        return (
+            isinstance(node, int)
+            and 0 <= node < len(self.vertexes)
+            and self.vertexes[node] is not None
+        )
+
+    def _sink_block(self, label_block: int) -> _QBlock:
+        """The block which contains the sinks of the given block of the
+        labeling set, or `None` if there's no such block.
+
+        :param label_block: The index of a block of the labeling set.
+        """
+
+        # the blocks of the partition change, therefore the last known block
+        # must be checked
+        block = self._sink_blocks.get(label_block)
+        if block is not None and not block.deteached and block.size > 0:
+            vertex = block.vertexes.first
+            if (
+                vertex.qblock is block
+                and len(vertex.image) == 0
+                and vertex.initial_partition_block_id == label_block
+            ):
+                return block
+
+        for block in self.qblocks:
+            if block.size > 0:
+                vertex = block.vertexes.first
+                if (
+                    len(vertex.image) == 0
+                    and vertex.initial_partition_block_id == label_block
+                ):
+                    self._sink_blocks[label_block] = block
+                    return block
+        return None
+
+    def _discard_vertex(self, vertex: _Vertex):
+        """Remove an isolated vertex from the partition and from the graph,
+        and release its label.
+
+        :param vertex: The vertex to be removed.
+        """
+
+        block = vertex.qblock
+        block.remove_vertex(vertex)
+        if block.size == 0:
+            self.qblocks.remove(block)
+
+        self.condensation.remove_vertex(vertex)
+        self.vertexes[vertex.label] = None
+        self._free_labels.append(vertex.label)
+
+    def _refine_counterimage(self, sources: List[_Vertex]):
+        """Recompute the block of the vertexes which reach one of the given
+        vertexes (see :meth:`remove_edges`).
+
+        :param sources: The vertexes whose image changed.
+        """
+
+        # vertexes which reach one of the sources (and their index in the
+        # reduced graph)
+        affected = {}
+        stack = []
+        for vertex in sources:
+            if vertex not in affected:
+                affected[vertex] = len(affected)
+                stack.append(vertex)
+        while stack:
+            for edge in stack.pop().counterimage:
+                if edge.source not in affected:
+                    affected[edge.source] = len(affected)
+                    stack.append(edge.source)
+        affected_vertexes = list(affected)
+
+        # the other vertexes of a block are bisimilar, we represent the block
+        # with the first one
+        def representative(block):
+            for vertex in block.vertexes:
+                if vertex not in affected:
+                    return vertex
+            return None
+
+        # nodes of the reduced graph: first the affected vertexes, then the
+        # blocks of unaffected vertexes
+        blocks = []
+        block_node = {}
+        representatives = []
+
+        def add_block(block, vertex):
+            if id(block) not in block_node:
+                block_node[id(block)] = len(affected_vertexes) + len(blocks)
+                blocks.append(block)
+                representatives.append(vertex)
+
+        for vertex in affected_vertexes:
+            for edge in vertex.image:
+                if edge.destination not in affected:
+                    add_block(edge.destination.qblock, edge.destination)
+
+        labels_ranks = set(
+            (vertex.initial_partition_block_id, vertex.rank)
+            for vertex in affected_vertexes
+        )
+        for block in self.qblocks:
+            vertex = representative(block)
+            if (
+                vertex is not None
+                and (vertex.initial_partition_block_id, vertex.rank)
+                in labels_ranks
+            ):
+                add_block(block, vertex)
+
+        # the image of unaffected vertexes is unaffected
+        idx = 0
+        while idx < len(representatives):
+            for edge in representatives[idx].image:
+                add_block(edge.destination.qblock, edge.destination)
+            idx += 1
+
+        def node(vertex):
+            if vertex in affected:
+                return affected[vertex]
+            return block_node[id(vertex.qblock)]
+
+        reduced_edges = [
+            (node(edge.source), node(edge.destination))
+            for vertex in chain(affected_vertexes, representatives)
+            for edge in vertex.image
+        ]
+        reduced_labels = {}
+        for idx, vertex in enumerate(
+            chain(affected_vertexes, representatives)
+        ):
+            reduced_labels.setdefault(
+                vertex.initial_partition_block_id, []
+            ).append(idx)
+
+        reduced_rscp = paige_tarjan(
+            np.array(reduced_edges, dtype=np.int64).reshape(-1, 2),
+            list(reduced_labels.values()),
+            nvertexes=len(affected_vertexes) + len(blocks),
+            engine="array",
+            stats=self.stats,
+        )
+
+        # the new block of each affected vertex
+        moves = []
+        for reduced_block in reduced_rscp:
+            members = [
+                affected_vertexes[idx]
+                for idx in reduced_block
+                if idx < len(affected_vertexes)
+            ]
+            unaffected = [
+                blocks[idx - len(affected_vertexes)]
+                for idx in reduced_block
+                if idx >= len(affected_vertexes)
+            ]
+            if len(members) == 0:
+                continue
+
+            # two blocks of unaffected vertexes can't be bisimilar
+            if len(unaffected) > 0:
+                target = unaffected[0]
+            elif all(
+                vertex.qblock is members[0].qblock for vertex in members
+            ) and members[0].qblock.size == len(members):
+                # the block did not change
+                continue
             else:
-                return back_to_original(max_bisi, self.node_to_idx)
+                target = _QBlock([], None)
+                self.qblocks.append(target)
+            moves.extend(
+                (vertex, target)
+                for vertex in members
+                if vertex.qblock is not target
+            )
+
+        for vertex, target in moves:
+            vertex.qblock.remove_vertex(vertex)
+            target.append_vertex(vertex)
+        self.qblocks = [block for block in self.qblocks if block.size > 0]
+
+        # count(x, block) for the vertexes which reach a moved vertex
+        changed_counts = set()
+        for vertex, _ in moves:
+            for edge in vertex.counterimage:
+                if edge.source.label not in changed_counts:
+                    changed_counts.add(edge.source.label)
+                    _reset_counts(edge.source)
+
+    def _maximum_bisimulation(
+        self,
+    ) -> Union[List[Tuple[Any]], np.ndarray, Tuple[np.ndarray, NodeIndex]]:
+        if self.output == "labels":
+            block = to_block_array(self.qblocks, len(self.vertexes))
+            if self.node_index is None:
+                return block
+            return (block, self.node_index)
+
+        max_bisi = to_tuple_list(self.qblocks)
+        if self.node_index is None:
+            return max_bisi
+        else:
+            return self.node_index.to_original_partition(max_bisi)
+
+    def _recompute(self, new_edges: List[Tuple[int, int]]):
+        """Rebuild the *BisPy* representation of the graph with the given new
+        edges, and compute its maximum bisimulation from scratch. The labeling
+        set is recovered from the vertexes.
+
+        :param new_edges: The new edges (pairs of integers).
+        """
+
+        edges = [
+            (edge.source.label, edge.destination.label)
+            for vertex in self.vertexes
+            if vertex is not None
+            for edge in vertex.image
+        ]
+        edges.extend(new_edges)
+
+        labels = {}
+        for vertex in self.vertexes:
+            if vertex is not None:
+                labels.setdefault(
+                    vertex.initial_partition_block_id, []
+                ).append(vertex.label)
+        label_blocks = list(labels.keys())
+        # removed vertexes are isolated, they are discarded at the end
+        labels = list(labels.values())
+        if len(self._free_labels) > 0:
+            labels.append(self._free_labels)
+
+        self.vertexes, q_partition = decorate_edge_list(
+            edges, len(self.vertexes), labels
+        )
+        # keep the indexes of the blocks of the labeling set used by add_node
+        for block_id, block in zip(label_blocks, labels):
+            for label in block:
+                self.vertexes[label].initial_partition_block_id = block_id
+        self.qblocks = paige_tarjan_qblocks(q_partition, self.stats)
+
+        for label in self._free_labels:
+            vertex = self.vertexes[label]
+            vertex.qblock.remove_vertex(vertex)
+            self.vertexes[label] = None
+        self.qblocks = [block for block in self.qblocks if block.size > 0]
+
+        self.condensation = Condensation(
+            [vertex for vertex in self.vertexes if vertex is not None]
+        )
+        self._sink_blocks = {}
+
+
+def _reset_counts(vertex: _Vertex):
+    """Set the `count` of each edge leaving the given vertex to
+    :math:`|E(\\textit{vertex}) \\cap B|`, where :math:`B` is the block
+    of the destination.
+
+    :param vertex: The source of the edges.
+    """
+
+    counts = {}
+    for edge in vertex.image:
+        block = edge.destination.qblock
+        if id(block) not in counts:
+            counts[id(block)] = _Count(vertex)
+        edge.count = counts[id(block)]
+        edge.count.value += 1
 
 
 def saha(
-    graph, initial_partition=None, is_integer_graph=False
+    graph,
+    initial_partition=None,
+    is_integer_graph=False,
+    nvertexes=None,
+    stats: Stats = None,
+    output: str = "tuples",
 ) -> SahaPartition:
     """
     Returns an instance of the class :class:`SahaPartition` which can be used
     to recompute the maximum bisimulation incrementally.
 
-    :param graph: The initial graph.
+    :param graph: The initial graph, as a *NetworkX* directed graph or as an
+        edge list (a *NumPy* array of shape `(m,2)`, a list of couples of
+        integers, or a *SciPy* sparse adjacency matrix) whose vertexes are the
+        integers in :math:`[0, \\textit{nvertexes})`. No *NetworkX* graph is
+        created in the second case.
     :initial_partition: The initial partition, or labeling set. This is
         **not** the partition from which we start, but an indication of which
         nodes cannot be bisimilar. Defaultsto `None`, in which case the trivial
@@ -78,8 +746,31 @@ def saha(
     :param is_integer_graph: If `True`, the function assumes that
         the graph is integer, and skips the integer check (may slightly
         improve performance). Defaults to `False`.
+    :param nvertexes: The number of vertexes, used only if `graph` is an edge
+        list. Defaults to `None`, in which case it's inferred from `graph`.
+    :param stats: If not `None`, the instrumentation data of the computation
+        of the initial maximum bisimulation and of each update is added to
+        this object (see :class:`bispy.utilities.stats.Stats` and
+        :func:`bispy.saha.saha.saha`). Defaults to `None`.
+    :param output: The format of the maximum bisimulation returned by the
+        methods of :class:`SahaPartition`, `"tuples"` or `"labels"` (see
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Defaults to
+        `"tuples"`.
     """
 
+    check_output(output)
+    if stats is not None:
+        start = stats.clock()
+
+    if is_edge_list(graph):
+        vertexes, q_partition = decorate_edge_list(
+            graph, nvertexes, initial_partition
+        )
+        if stats is not None:
+            stats.record("decorate", start)
+        q_partition = paige_tarjan_qblocks(q_partition, stats)
+        return SahaPartition(q_partition, vertexes, None, stats, output)
+
     if not isinstance(graph, nx.DiGraph):
         raise Exception("graph should be a directed graph (nx.DiGraph)")
 
@@ -88,27 +779,25 @@ def saha(
         graph
     )
     if not original_graph_is_integer:
-        # convert the graph to an "integer" graph
-        integer_graph, node_to_idx = convert_to_integer_graph(graph)
-
-        if initial_partition is not None:
-            # convert the initial partition to a integer partition
-            integer_initial_partition = [
-                [node_to_idx[old_node] for old_node in block]
-                for block in initial_partition
-            ]
-        else:
-            integer_initial_partition = None
+        # nodes are translated to integers on the fly
+        node_index = NodeIndex(graph.nodes)
+
+        # convert the initial partition to a integer partition
+        integer_initial_partition = node_index.to_integer_partition(
+            initial_partition
+        )
     else:
-        integer_graph = graph
         integer_initial_partition = initial_partition
-        node_to_idx = None
+        node_index = None
 
     vertexes, q_partition = decorate_nx_graph(
-        integer_graph,
+        graph,
         integer_initial_partition,
+        node_index=node_index,
     )
+    if stats is not None:
+        stats.record("decorate", start)
 
     # compute the current maximum bisimulation
-    q_partition = paige_tarjan_qblocks(q_partition)
-    return SahaPartition(q_partition, vertexes, node_to_idx)
+    q_partition = paige_tarjan_qblocks(q_partition, stats)
+    return SahaPartition(q_partition, vertexes, node_index, stats, output)
@@ -0,0 +1,464 @@
+import numpy as np
+import networkx as nx
+from typing import Iterable, List, Tuple, Union
+
+from bispy.utilities.graph_normalization import NodeIndex
+
+
+def index_dtype(size: int):
+    """Return the smallest NumPy integer type (among `int32` and `int64`)
+    which can be used to index a collection of `size` items.
+
+    :param size: The size of the collection.
+    """
+
+    if size < np.iinfo(np.int32).max:
+        return np.int32
+    else:
+        return np.int64
+
+
+def sorted_unique(keys: np.ndarray) -> np.ndarray:
+    """Sort the given array in-place and remove the duplicates (faster than
+    :func:`numpy.unique`, which may use a hash table).
+
+    :param keys: An array of integers.
+    :returns: The sorted values of `keys`, without repetitions.
+    """
+
+    keys.sort()
+    if len(keys) == 0:
+        return keys
+    distinct = np.empty(len(keys), dtype=bool)
+    distinct[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=distinct[1:])
+    return keys[distinct]
+
+
+def _ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the integer ranges `[starts[i], ends[i])` without a Python
+    loop.
+
+    :param starts: The first item of each range.
+    :param ends: The (excluded) last item of each range.
+    """
+
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # the offset which, added to the position in the concatenated array,
+    # gives the item in the corresponding range
+    shifts = starts - np.cumsum(lengths) + lengths
+    return np.repeat(shifts, lengths) + np.arange(total)
+
+
+class ArrayGraph:
+    """Compact, array-backed representation of a graph. Adjacency is stored in
+    *CSR* form (image of each vertex) and *CSC* form (counterimage of each
+    vertex), and the state needed by partition refinement algorithms
+    (block of each vertex, `count` slot of each edge, rank) is kept in flat
+    *NumPy* arrays. Vertexes are the integers in
+    :math:`[0, \\textit{nvertexes})`.
+
+    The image of the vertex `v` is `image[image_offsets[v]:image_offsets[v+1]]`
+    and the index of an edge is its position in `image`. The counterimage of
+    `v` is `counterimage[counterimage_offsets[v]:counterimage_offsets[v+1]]`,
+    and `counterimage_edge` maps each position of `counterimage` to the index
+    of the corresponding edge.
+
+    Instances should be created using :func:`as_array_graph` or
+    :func:`array_graph_from_edges`.
+
+    :param nvertexes: The number of vertexes.
+    :param image_offsets: Offsets of the image of each vertex in `image`.
+    :param image: Destinations of the edges, grouped by source.
+    :param counterimage_offsets: Offsets of the counterimage of each vertex in
+        `counterimage`.
+    :param counterimage: Sources of the edges, grouped by destination.
+    :param counterimage_edge: Index of the edge corresponding to each item of
+        `counterimage`.
+    :param block: Block of the initial partition each vertex belongs to.
+    :param label: If not `None`, the label of each edge (in the order of
+        `image`), an integer in :math:`[0, \\textit{nlabels})`. Two vertexes
+        are bisimilar only if they reach bisimilar vertexes through edges
+        with the same labels. Defaults to `None` (unlabeled edges).
+    """
+
+    def __init__(
+        self,
+        nvertexes: int,
+        image_offsets: np.ndarray,
+        image: np.ndarray,
+        counterimage_offsets: np.ndarray,
+        counterimage: np.ndarray,
+        counterimage_edge: np.ndarray,
+        block: np.ndarray,
+        label: np.ndarray = None,
+    ):
+        self.nvertexes = nvertexes
+        self.image_offsets = image_offsets
+        self.image = image
+        self.counterimage_offsets = counterimage_offsets
+        self.counterimage = counterimage
+        self.counterimage_edge = counterimage_edge
+        self.block = block
+        self.label = label
+        self.nlabels = (
+            int(label.max()) + 1 if label is not None and len(label) > 0 else 1
+        )
+
+        slot_dtype = index_dtype(nvertexes + len(image))
+        if label is None:
+            # count(x,V) = |E({x})|, therefore initially each edge refers to
+            # the slot of its source
+            self.count_slot = self.edge_sources().astype(slot_dtype)
+            self.counts = np.diff(image_offsets).astype(np.int32)
+        else:
+            # one slot for each couple (source, label), which holds the
+            # number of edges with that label leaving the source
+            _, count_slot, counts = np.unique(
+                self.edge_sources().astype(np.int64) * self.nlabels + label,
+                return_inverse=True,
+                return_counts=True,
+            )
+            self.count_slot = count_slot.astype(slot_dtype).ravel()
+            self.counts = counts.astype(np.int32)
+
+        # set by rank computation, -1 represents the rank -inf
+        self.rank = None
+
+    @property
+    def nedges(self) -> int:
+        """The number of edges in the graph."""
+        return len(self.image)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes occupied by the arrays of this graph."""
+
+        arrays = (
+            self.image_offsets,
+            self.image,
+            self.counterimage_offsets,
+            self.counterimage,
+            self.counterimage_edge,
+            self.block,
+            self.label,
+            self.count_slot,
+            self.counts,
+            self.rank,
+        )
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def out_degree(self) -> np.ndarray:
+        """The number of edges leaving each vertex."""
+        return np.diff(self.image_offsets)
+
+    def in_degree(self) -> np.ndarray:
+        """The number of edges entering each vertex."""
+        return np.diff(self.counterimage_offsets)
+
+    def edge_sources(self) -> np.ndarray:
+        """The source of each edge (in the order of `image`)."""
+
+        return np.repeat(
+            np.arange(self.nvertexes, dtype=self.image.dtype),
+            self.out_degree(),
+        )
+
+    def vertex_image(self, vertex: int) -> np.ndarray:
+        """The image :math:`E(\\textit{vertex})` of the given vertex.
+
+        :param vertex: The vertex.
+        """
+
+        return self.image[
+            self.image_offsets[vertex]:self.image_offsets[vertex + 1]
+        ]
+
+    def vertex_counterimage(self, vertex: int) -> np.ndarray:
+        """The counterimage :math:`E^{-1}(\\textit{vertex})` of the given
+        vertex.
+
+        :param vertex: The vertex.
+        """
+
+        return self.counterimage[
+            self.counterimage_offsets[vertex]:self.counterimage_offsets[
+                vertex + 1
+            ]
+        ]
+
+    def image_edges(self, vertexes: np.ndarray) -> np.ndarray:
+        """The indexes of the edges leaving the given vertexes.
+
+        :param vertexes: An array of vertexes.
+        """
+
+        return _ranges(
+            self.image_offsets[vertexes], self.image_offsets[vertexes + 1]
+        )
+
+    def counterimage_positions(self, vertexes: np.ndarray) -> np.ndarray:
+        """The positions in `counterimage` of the edges entering the given
+        vertexes.
+
+        :param vertexes: An array of vertexes.
+        """
+
+        return _ranges(
+            self.counterimage_offsets[vertexes],
+            self.counterimage_offsets[vertexes + 1],
+        )
+
+    def __repr__(self):
+        return "ArrayGraph(nvertexes={}, nedges={})".format(
+            self.nvertexes, self.nedges
+        )
+
+
+def partition_to_block_array(
+    initial_partition: Iterable[Iterable[int]], nvertexes: int
+) -> np.ndarray:
+    """Convert the given partition of the integers in
+    :math:`[0, \\textit{nvertexes})` to an array which maps each integer to
+    the index of its block.
+
+    :param initial_partition: The partition (`None` for the trivial
+        partition).
+    :param nvertexes: The number of vertexes.
+    """
+
+    if initial_partition is None:
+        return np.zeros(nvertexes, dtype=np.int32)
+
+    blocks = [
+        np.asarray(list(block), dtype=np.int64) for block in initial_partition
+    ]
+    block = np.zeros(nvertexes, dtype=np.int32)
+    if len(blocks) > 0:
+        block[np.concatenate(blocks)] = np.repeat(
+            np.arange(len(blocks), dtype=np.int32),
+            [len(b) for b in blocks],
+        )
+    return block
+
+
+def array_graph_from_edges(
+    sources: Union[np.ndarray, Iterable[int]],
+    destinations: Union[np.ndarray, Iterable[int]],
+    nvertexes: int,
+    initial_partition: Iterable[Iterable[int]] = None,
+    labels: np.ndarray = None,
+) -> ArrayGraph:
+    """Build the :class:`ArrayGraph` representation of the integer graph whose
+    edges are `(sources[i], destinations[i])`. The construction is vectorized
+    (no Python loop over the edges).
+
+    :param sources: Sources of the edges.
+    :param destinations: Destinations of the edges.
+    :param nvertexes: The number of vertexes of the graph.
+    :param initial_partition: The initial partition (or labeling set). Defaults
+        to `None`, in which case the trivial labeling set (one block which
+        contains all the nodes) is used.
+    :param labels: If not `None`, the label of each edge, as an integer in
+        :math:`[0, \\textit{nlabels})` (see
+        :func:`bispy.utilities.edge_list.edge_labels_to_array`). Defaults to
+        `None` (unlabeled edges).
+    """
+
+    vertex_dtype = index_dtype(nvertexes)
+
+    sources = np.asarray(sources, dtype=vertex_dtype).ravel()
+    destinations = np.asarray(destinations, dtype=vertex_dtype).ravel()
+    if len(sources) != len(destinations):
+        raise ValueError("sources and destinations must have the same length")
+
+    nedges = len(sources)
+    edge_dtype = index_dtype(nedges)
+
+    # CSR
+    image_order = np.argsort(sources, kind="stable")
+    image = destinations[image_order]
+    image_offsets = np.zeros(nvertexes + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(sources, minlength=nvertexes), out=image_offsets[1:]
+    )
+    if labels is not None:
+        labels = np.asarray(labels, dtype=np.int64).ravel()
+        if len(labels) != nedges:
+            raise ValueError("labels and sources must have the same length")
+        labels = labels[image_order]
+    del image_order
+
+    # CSC. the positions of the edges in the image are sorted by destination
+    counterimage_edge = np.argsort(image, kind="stable").astype(edge_dtype)
+    counterimage = np.repeat(
+        np.arange(nvertexes, dtype=vertex_dtype), np.diff(image_offsets)
+    )[counterimage_edge]
+    counterimage_offsets = np.zeros(nvertexes + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(destinations, minlength=nvertexes),
+        out=counterimage_offsets[1:],
+    )
+
+    return ArrayGraph(
+        nvertexes=nvertexes,
+        image_offsets=image_offsets,
+        image=image,
+        counterimage_offsets=counterimage_offsets,
+        counterimage=counterimage,
+        counterimage_edge=counterimage_edge,
+        block=partition_to_block_array(initial_partition, nvertexes),
+        label=labels,
+    )
+
+
+def as_array_graph(
+    graph: nx.Graph,
+    initial_partition: Iterable[Iterable[int]] = None,
+    node_index: NodeIndex = None,
+    labels: np.ndarray = None,
+) -> ArrayGraph:
+    """Create the :class:`ArrayGraph` representation of the given integer
+    graph (see :mod:`bispy.utilities.graph_normalization`).
+
+    :param graph: The graph, in *NetworkX* representation.
+    :param initial_partition: The initial partition (or labeling set). Defaults
+        to `None`, in which case the trivial labeling set (one block which
+        contains all the nodes) is used.
+    :param node_index: If the graph is not integer, the
+        :class:`bispy.utilities.graph_normalization.NodeIndex` used to
+        translate its nodes to integers on the fly (`initial_partition` must
+        already be translated). Defaults to `None`, in which case the graph
+        must be integer.
+    :param labels: If not `None`, the label of each edge (in the order of
+        `graph.edges`), as an integer in :math:`[0, \\textit{nlabels})` (see
+        :func:`bispy.utilities.edge_list.graph_edge_labels`). Defaults to
+        `None` (unlabeled edges).
+    """
+
+    nvertexes = len(graph.nodes)
+    if node_index is None:
+        graph_edges = graph.edges
+    else:
+        graph_edges = node_index.integer_edges(graph.edges)
+    edges = np.fromiter(
+        (node for edge in graph_edges for node in edge),
+        dtype=index_dtype(nvertexes),
+        count=2 * graph.number_of_edges(),
+    ).reshape(-1, 2)
+
+    return array_graph_from_edges(
+        edges[:, 0], edges[:, 1], nvertexes, initial_partition, labels
+    )
+
+
+def block_array_to_tuple_list(block: np.ndarray) -> List[Tuple[int]]:
+    """Convert a partition represented by an array which maps each vertex to
+    the index of its block to a list of tuples (one tuple of vertexes for
+    each block).
+
+    :param block: The block of each vertex.
+    """
+
+    if len(block) == 0:
+        return []
+
+    order = np.argsort(block, kind="stable")
+    boundaries = [0]
+    boundaries.extend((np.flatnonzero(np.diff(block[order])) + 1).tolist())
+    boundaries.append(len(block))
+
+    vertexes = order.tolist()
+    return [
+        tuple(vertexes[start:end])
+        for start, end in zip(boundaries, boundaries[1:])
+    ]
+
+
+def weakly_connected_components(
+    sources: np.ndarray, destinations: np.ndarray, nvertexes: int
+) -> np.ndarray:
+    """Compute the weakly connected components of the integer graph whose
+    edges are `(sources[i], destinations[i])`. Each step hooks the
+    representative of the endpoints of every edge to the smallest of the two,
+    and then compresses the chains of representatives by pointer jumping,
+    therefore there is no Python loop over the edges.
+
+    :param sources: Sources of the edges.
+    :param destinations: Destinations of the edges.
+    :param nvertexes: The number of vertexes of the graph.
+    :returns: An array which maps each vertex to the index of its component
+        (components are numbered from 0 without holes, in order of smallest
+        vertex).
+    """
+
+    sources = np.asarray(sources, dtype=np.int64).ravel()
+    destinations = np.asarray(destinations, dtype=np.int64).ravel()
+
+    representative = np.arange(nvertexes, dtype=np.int64)
+    while True:
+        # representative is a fixed point of itself here (fully compressed)
+        source_representative = representative[sources]
+        destination_representative = representative[destinations]
+        smallest = np.minimum(
+            source_representative, destination_representative
+        )
+
+        hooked = representative.copy()
+        np.minimum.at(hooked, source_representative, smallest)
+        np.minimum.at(hooked, destination_representative, smallest)
+
+        # pointer jumping
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+
+        if np.array_equal(hooked, representative):
+            break
+        representative = hooked
+
+    _, component = np.unique(representative, return_inverse=True)
+    return component.astype(index_dtype(nvertexes)).ravel()
+
+
+def well_founded_rank(graph: ArrayGraph, max_rank: int = None) -> np.ndarray:
+    """Compute the rank of the well-founded vertexes of the given graph (the
+    vertexes which do not reach a cycle), namely the length of the longest
+    path which starts from the vertex. This is the rank computed by
+    :func:`bispy.utilities.rank_computation.compute_rank` for well-founded
+    vertexes. Sinks are removed from the graph layer by layer, and each layer
+    is processed by a few vectorized *NumPy* operations.
+
+    :param graph: The graph.
+    :param max_rank: If not `None`, we stop after the layer of rank
+        `max_rank`. Defaults to `None`.
+    :returns: An array which maps each vertex to its rank, or to -1 if the
+        vertex is not well-founded (or its rank is greater than `max_rank`).
+    """
+
+    rank = np.full(graph.nvertexes, -1, dtype=np.int64)
+    # the number of edges towards vertexes which were not removed yet
+    remaining = graph.out_degree()
+
+    layer = np.flatnonzero(remaining == 0)
+    current_rank = 0
+    while len(layer) > 0 and (max_rank is None or current_rank <= max_rank):
+        rank[layer] = current_rank
+
+        predecessors = graph.counterimage[
+            _ranges(
+                graph.counterimage_offsets[layer],
+                graph.counterimage_offsets[layer + 1],
+            )
+        ]
+        np.subtract.at(remaining, predecessors, 1)
+        layer = np.unique(predecessors[remaining[predecessors] == 0])
+        current_rank += 1
+
+    return rank
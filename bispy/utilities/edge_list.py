@@ -0,0 +1,212 @@
+import numpy as np
+import networkx as nx
+from typing import Any, Iterable, Tuple, Union
+
+from bispy.utilities.array_graph import index_dtype
+
+
+def is_edge_list(graph) -> bool:
+    """Check if the given object is a graph given as an edge list, namely a
+    *NumPy* array, a list/tuple of couples of integers, or a *SciPy* sparse
+    adjacency matrix (anything which provides a method `tocoo`).
+
+    :param graph: The object to be checked.
+    """
+
+    if isinstance(graph, nx.Graph):
+        return False
+    return isinstance(graph, (np.ndarray, list, tuple)) or hasattr(
+        graph, "tocoo"
+    )
+
+
+def _validated_edge_list(
+    edges: Union[np.ndarray, Iterable[Tuple[int, int]]],
+    nvertexes: int = None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Check the given edge list and extract the sources and the
+    destinations of its edges, in order (see :func:`edge_list_to_arrays`).
+    """
+
+    if hasattr(edges, "tocoo"):
+        adjacency = edges.tocoo()
+        if adjacency.shape[0] != adjacency.shape[1]:
+            raise ValueError("The adjacency matrix should be square")
+        if nvertexes is None:
+            nvertexes = adjacency.shape[0]
+        elif nvertexes != adjacency.shape[0]:
+            raise ValueError(
+                "nvertexes ({}) doesn't match the shape of the adjacency "
+                "matrix ({})".format(nvertexes, adjacency.shape[0])
+            )
+
+        # explicit zeros are not edges
+        nonzero = adjacency.data != 0
+        sources = adjacency.row[nonzero]
+        destinations = adjacency.col[nonzero]
+    else:
+        edges = np.asarray(edges)
+        if edges.size == 0:
+            edges = edges.reshape(0, 2).astype(np.int64)
+        if edges.ndim != 2 or edges.shape[1] != 2:
+            raise ValueError("edges should have shape (m,2)")
+        if not np.issubdtype(edges.dtype, np.integer):
+            raise ValueError("Vertexes should be integers")
+
+        if nvertexes is None:
+            nvertexes = int(edges.max()) + 1 if len(edges) > 0 else 0
+        sources = edges[:, 0]
+        destinations = edges[:, 1]
+
+    if len(sources) > 0 and (
+        min(sources.min(), destinations.min()) < 0
+        or max(sources.max(), destinations.max()) >= nvertexes
+    ):
+        raise ValueError(
+            "Vertexes should be integers in [0, {})".format(nvertexes)
+        )
+
+    return (sources, destinations, nvertexes)
+
+
+def edge_list_to_arrays(
+    edges: Union[np.ndarray, Iterable[Tuple[int, int]]],
+    nvertexes: int = None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Convert the given edge list to a couple of arrays of sources and
+    destinations. Vertexes are the integers in
+    :math:`[0, \\textit{nvertexes})`. Duplicate edges are removed.
+
+    :param edges: The edges, as a *NumPy* array of shape `(m,2)`, a list of
+        couples of integers, or a *SciPy* sparse adjacency matrix (the
+        nonzero item `(i,j)` is the edge from `i` to `j`).
+    :param nvertexes: The number of vertexes. Defaults to `None`, in which
+        case we use the shape of the adjacency matrix, or the maximum vertex
+        in `edges` plus one (isolated vertexes with the highest indexes are
+        lost in this case).
+    :returns: A tuple whose items are:
+
+        0. The sources of the edges;
+        1. The destinations of the edges;
+        2. The number of vertexes.
+    """
+
+    sources, destinations, nvertexes = _validated_edge_list(edges, nvertexes)
+
+    vertex_dtype = index_dtype(nvertexes)
+    keys = np.unique(
+        sources.astype(np.int64) * nvertexes + destinations.astype(np.int64)
+    )
+    return (
+        (keys // max(nvertexes, 1)).astype(vertex_dtype),
+        (keys % max(nvertexes, 1)).astype(vertex_dtype),
+        nvertexes,
+    )
+
+
+def edge_labels_to_array(edge_labels: Iterable[Any]) -> np.ndarray:
+    """Convert the given labels of the edges of a graph (any hashable
+    objects, for instance the actions of a labeled transition system) to the
+    integers in :math:`[0, \\textit{nlabels})`, such that two edges have
+    the same integer iff they have the same label.
+
+    :param edge_labels: The label of each edge.
+    :returns: An array which maps each edge to the integer of its label.
+    """
+
+    if isinstance(edge_labels, np.ndarray) and edge_labels.dtype.kind in (
+        "biuUS"
+    ):
+        _, integer_labels = np.unique(edge_labels, return_inverse=True)
+        return integer_labels.astype(np.int64).ravel()
+
+    # labels which may not be comparable (for instance None and strings)
+    index = {}
+    return np.fromiter(
+        (index.setdefault(label, len(index)) for label in edge_labels),
+        dtype=np.int64,
+    )
+
+
+def graph_edge_labels(
+    graph: nx.DiGraph, edge_labels: Union[str, Iterable[Any]]
+) -> np.ndarray:
+    """Read the labels of the edges of the given *NetworkX* graph, and
+    convert them to integers (see :func:`edge_labels_to_array`).
+
+    :param graph: The graph.
+    :param edge_labels: The name of the attribute of the edges which holds
+        their label (edges without the attribute have the label `None`), or
+        the label of each edge in the order of `graph.edges`.
+    :returns: An array which maps each edge (in the order of `graph.edges`)
+        to the integer of its label.
+    """
+
+    if isinstance(edge_labels, str):
+        edge_labels = [
+            label for _, _, label in graph.edges(data=edge_labels)
+        ]
+    labels = edge_labels_to_array(edge_labels)
+    if len(labels) != graph.number_of_edges():
+        raise ValueError(
+            "Got {} labels for {} edges".format(
+                len(labels), graph.number_of_edges()
+            )
+        )
+    return labels
+
+
+def labeled_edge_list_to_arrays(
+    edges: Union[np.ndarray, Iterable[Tuple[int, int]]],
+    edge_labels: Iterable[Any],
+    nvertexes: int = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Convert the given edge list and the label of each edge to arrays (see
+    :func:`edge_list_to_arrays`). Two edges between the same vertexes are
+    different if their labels are different, duplicate edges with the same
+    label are removed.
+
+    :param edges: The edges (see :func:`edge_list_to_arrays`).
+    :param edge_labels: The label of each edge (the edges of a *SciPy*
+        sparse adjacency matrix are its nonzero items, in *COO* order). A
+        `str` raises a `TypeError`, since edge lists have no attributes.
+    :param nvertexes: The number of vertexes (see
+        :func:`edge_list_to_arrays`).
+    :returns: A tuple whose items are:
+
+        0. The sources of the edges;
+        1. The destinations of the edges;
+        2. The label of each edge, as an integer in
+           :math:`[0, \\textit{nlabels})` (see
+           :func:`edge_labels_to_array`);
+        3. The number of vertexes.
+    """
+
+    if isinstance(edge_labels, str):
+        # an edge list has no attributes (see graph_edge_labels)
+        raise TypeError(
+            "edge_labels should be the label of each edge, got the string "
+            "'{}' (attribute names are supported only for NetworkX "
+            "graphs)".format(edge_labels)
+        )
+
+    sources, destinations, nvertexes = _validated_edge_list(edges, nvertexes)
+    labels = edge_labels_to_array(edge_labels)
+    if len(labels) != len(sources):
+        raise ValueError(
+            "Got {} labels for {} edges".format(len(labels), len(sources))
+        )
+    nlabels = int(labels.max()) + 1 if len(labels) > 0 else 1
+
+    vertex_dtype = index_dtype(nvertexes)
+    keys = np.unique(
+        (sources.astype(np.int64) * nlabels + labels) * nvertexes
+        + destinations.astype(np.int64)
+    )
+    vertex_label = keys // max(nvertexes, 1)
+    return (
+        (vertex_label // nlabels).astype(vertex_dtype),
+        (keys % max(nvertexes, 1)).astype(vertex_dtype),
+        vertex_label % nlabels,
+        nvertexes,
+    )
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 from bispy.utilities.graph_entities import (
     _Vertex,
     _Edge,
@@ -6,8 +7,14 @@ from bispy.utilities.graph_entities import (
     _QBlock,
     _XBlock,
 )
-from typing import List, Tuple, Union, Set
-from bispy.utilities.rank_computation import compute_rank as func_compute_rank
+from typing import Iterable, List, Tuple, Union, Set
+from itertools import chain
+from bispy.utilities.rank_computation import (
+    compute_rank as func_compute_rank,
+    compute_rank_from_edges,
+)
+from bispy.utilities.edge_list import edge_list_to_arrays
+from bispy.utilities.graph_normalization import NodeIndex
 
 _BLACK = 10
 _GRAY = 11
@@ -67,10 +74,11 @@ def counterimage_dfs(
     colors: List[int],
 ):
     """
-    Recursively visit :math:`G^{-1}` starting from the vertex in the position
+    Visit :math:`G^{-1}` starting from the vertex in the position
     `current_vertex_idx` of the list `vertexes`. Meanwhile fill
     `finishing_list` everytime time the counterimage of a vertex is completely
-    visited.
+    visited. The DFS uses an explicit stack instead of recursion, therefore
+    the depth of the graph is not limited by the recursion limit.
 
     :param current_vertex_idx: The current vertex to be visited.
     :param vertexes: List of vertexes in the graph.
@@ -85,24 +93,34 @@ def counterimage_dfs(
 
     # mark this vertex as "visiting"
     colors[current_vertex_idx] = _GRAY
-    # visit the counterimage of the current vertex
-    for edge in vertexes[current_vertex_idx].counterimage:
-        counterimage_vertex = edge.source
+    # each item is the index of a vertex and an iterator over its
+    # counterimage
+    stack = [
+        (current_vertex_idx, iter(vertexes[current_vertex_idx].counterimage))
+    ]
 
-        # if the vertex isn't white, a visit is occurring, or has already
-        # occurred.
-        if colors[counterimage_vertex.label] == _WHITE:
-            counterimage_dfs(
-                current_vertex_idx=counterimage_vertex.label,
-                vertexes=vertexes,
-                finishing_list=finishing_list,
-                colors=colors,
-            )
-    # this vertex visit is over: add the vertex to the ordered list of
-    # finished vertexes
-    finishing_list.append(vertexes[current_vertex_idx])
-    # mark this vertex as "visited"
-    colors[current_vertex_idx] = _BLACK
+    while stack:
+        # visit the counterimage of the vertex on top of the stack
+        for edge in stack[-1][1]:
+            counterimage_vertex = edge.source
+
+            # if the vertex isn't white, a visit is occurring, or has already
+            # occurred.
+            if colors[counterimage_vertex.label] == _WHITE:
+                colors[counterimage_vertex.label] = _GRAY
+                stack.append(
+                    (
+                        counterimage_vertex.label,
+                        iter(counterimage_vertex.counterimage),
+                    )
+                )
+                break
+        else:
+            # this vertex visit is over: add the vertex to the ordered list of
+            # finished vertexes
+            vertex_idx = stack.pop()[0]
+            finishing_list.append(vertexes[vertex_idx])
+            colors[vertex_idx] = _BLACK
 
 
 def compute_counterimage_finishing_time_list(
@@ -160,12 +178,30 @@ def as_bispy_graph(
         Both the items are in *BisPy* representation.
     """
 
+    return _as_bispy_graph(
+        len(graph.nodes),
+        graph.edges,
+        initial_partition,
+        build_image=build_image,
+        set_count=set_count,
+        set_xblock=set_xblock,
+    )
+
+
+def _as_bispy_graph(
+    nvertexes: int,
+    edges: Iterable[Tuple[int, int]],
+    initial_partition: List[Tuple[int]],
+    build_image,
+    set_count,
+    set_xblock,
+) -> Tuple[List[_Vertex], List[_QBlock]]:
     if initial_partition is None:
-        initial_partition = _trivial_initial_partition(len(graph.nodes))
+        initial_partition = _trivial_initial_partition(nvertexes)
 
     # instantiate QBlocks and Vertexes, put Vertexes into QBlocks and set their
     # initial block id
-    vertexes = [None for _ in graph.nodes]
+    vertexes = [None for _ in range(nvertexes)]
     qblocks = []
 
     initial_x_block = _XBlock() if set_xblock else None
@@ -182,13 +218,13 @@ def as_bispy_graph(
     if set_count:
         # holds the references to Count objects to assign to the edges.
         # count(x) = count(x,V) = |V \cap E({x})| = |E({x})|
-        vertex_count = [None for _ in graph.nodes]
+        vertex_count = [None for _ in range(nvertexes)]
     else:
         vertex_count = None
 
     # build the counterimage. the image will be constructed using the order
     # imposed by the rank algorithm
-    for edge in graph.edges:
+    for edge in edges:
         # create an instance of my class Edge
         my_edge = _Edge(vertexes[edge[0]], vertexes[edge[1]])
 
@@ -247,6 +283,26 @@ def build_vertexes_image(finishing_time_list: List[_Vertex]):
         visited_vx.release()
 
 
+def build_scc_sorted_images(vertexes: List[_Vertex], scc_label: np.ndarray):
+    """
+    Rebuild the image of each vertex such that the destinations are sorted
+    by the label of their SCC. SCCs must be labeled in a topological order
+    of :math:`G^{-1}` (like the labels assigned by
+    :func:`bispy.utilities.rank_computation.compute_rank_from_edges`), in
+    which case the result has the same property of
+    :func:`build_vertexes_image`.
+
+    :param vertexes: Vertexes of the graph.
+    :param scc_label: The label of the SCC of each vertex.
+    """
+
+    for vertex in vertexes:
+        vertex.image = []
+    for vertex_idx in np.argsort(scc_label, kind="stable").tolist():
+        for edge in vertexes[vertex_idx].counterimage:
+            edge.source.image.append(edge)
+
+
 def decorate_nx_graph(
     graph: nx.Graph,
     initial_partition: List[Tuple[int]] = None,
@@ -255,6 +311,7 @@ def decorate_nx_graph(
     compute_rank: bool = True,
     set_xblock: bool = True,
     preprocess: bool = True,
+    node_index: NodeIndex = None,
 ) -> Tuple[List[_Vertex], List[_QBlock]]:
     """
     Create the *BisPy* representation of the given graph.
@@ -268,13 +325,16 @@ def decorate_nx_graph(
         :class:`bispy.utilities.graph_entities._Count`. If `False`, the
         attribute is set to `None`. Defaults to `True`.
     :param topological_sorted_images: If `True`, the image of each vertex
-        is computed using the function :func:`build_vertexes_image`. If
+        is sorted using the function :func:`build_scc_sorted_images`. If
         `False`, the image is computed without any particular precautions.
         Defaults to `True`.
-    :param compute_rank: If `True`, the function computes the *rank* of each
-        vertex. May be useless for some algorithms, like *Paige-Tarjan*'s,
-        in which case performance can be slightly improved by setting this
-        parameter to `False`. Defaults to `True`.
+    :param compute_rank: If `True`, the function computes the SCC, the
+        *rank* and the *well-foundedness* of each vertex, using
+        :func:`bispy.utilities.rank_computation.compute_rank_from_edges`
+        (whose SCCs are used to sort the images as well). May be useless for
+        some algorithms, like *Paige-Tarjan*'s, in which case performance can
+        be slightly improved by setting this parameter to `False`. Defaults
+        to `True`.
     :param set_xblock: If `True` we set the attribute `xblock` of each block
         of the partition to an instance of
         :class:`bispy.utilities.graph_entities._XBlock` (the same for each
@@ -282,6 +342,11 @@ def decorate_nx_graph(
     :param preprocess: Preprocess the initial partition to split blocks which
         contain both leafs and non-leafs. Fundamental for *Paige-Tarjan*'s
         algorithm, may be disabled for other algorithms.
+    :param node_index: If the graph is not integer, the
+        :class:`bispy.utilities.graph_normalization.NodeIndex` used to
+        translate its nodes to integers on the fly (`initial_partition` must
+        already be translated). Defaults to `None`, in which case the graph
+        must be integer.
     :returns: A tuple whose items are:
 
         0. List of vertexes of the graph;
@@ -290,30 +355,106 @@ def decorate_nx_graph(
         Both items are in *BisPy* representation.
     """
 
-    if initial_partition is None:
-        initial_partition = _trivial_initial_partition(len(graph.nodes))
-
-    tp = as_bispy_graph(
-        graph,
+    if node_index is None:
+        edges = graph.edges
+    else:
+        edges = node_index.integer_edges(graph.edges)
+    edges = np.fromiter(
+        chain.from_iterable(edges),
+        dtype=np.int64,
+        count=2 * graph.number_of_edges(),
+    ).reshape(-1, 2)
+
+    return _decorate_graph(
+        len(graph.nodes),
+        edges[:, 0],
+        edges[:, 1],
         initial_partition,
         set_count=set_count,
-        build_image=(not topological_sorted_images),
+        topological_sorted_images=topological_sorted_images,
+        compute_rank=compute_rank,
         set_xblock=set_xblock,
+        preprocess=preprocess,
     )
 
-    qpartition = decorate_bispy_graph(
-        tp[0],
-        initial_partition=initial_partition,
-        set_count=False,
+
+def decorate_edge_list(
+    edges: Union[np.ndarray, Iterable[Tuple[int, int]]],
+    nvertexes: int = None,
+    initial_partition: List[Tuple[int]] = None,
+    set_count: bool = True,
+    topological_sorted_images: bool = True,
+    compute_rank: bool = True,
+    set_xblock: bool = True,
+    preprocess: bool = True,
+) -> Tuple[List[_Vertex], List[_QBlock]]:
+    """
+    Create the *BisPy* representation of the integer graph given as an edge
+    list, without building a *NetworkX* graph. The parameters and the output
+    are the same of :func:`decorate_nx_graph`.
+
+    :param edges: The edges of the graph, as a *NumPy* array of shape
+        `(m,2)`, a list of couples of integers, or a *SciPy* sparse adjacency
+        matrix (see :func:`bispy.utilities.edge_list.edge_list_to_arrays`).
+    :param nvertexes: The number of vertexes of the graph (vertexes are the
+        integers in :math:`[0, \\textit{nvertexes})`). Defaults to `None`, in
+        which case the number is inferred from `edges`.
+    """
+
+    sources, destinations, nvertexes = edge_list_to_arrays(edges, nvertexes)
+    return _decorate_graph(
+        nvertexes,
+        sources,
+        destinations,
+        initial_partition,
+        set_count=set_count,
         topological_sorted_images=topological_sorted_images,
         compute_rank=compute_rank,
+        set_xblock=set_xblock,
         preprocess=preprocess,
     )
 
-    if qpartition is not None:
-        return (tp[0], qpartition)
+
+def _decorate_graph(
+    nvertexes: int,
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    initial_partition: List[Tuple[int]],
+    set_count: bool,
+    topological_sorted_images: bool,
+    compute_rank: bool,
+    set_xblock: bool,
+    preprocess: bool,
+) -> Tuple[List[_Vertex], List[_QBlock]]:
+    if initial_partition is None:
+        initial_partition = _trivial_initial_partition(nvertexes)
+
+    vertexes, qblocks = _as_bispy_graph(
+        nvertexes,
+        zip(sources.tolist(), destinations.tolist()),
+        initial_partition,
+        set_count=set_count,
+        build_image=(not topological_sorted_images),
+        set_xblock=set_xblock,
+    )
+
+    # SCCs, rank and well-foundedness are computed on the arrays of the
+    # edges, and the labels of the SCCs are used to sort the images
+    if compute_rank or topological_sorted_images:
+        scc_label = compute_rank_from_edges(vertexes, sources, destinations)
+        if topological_sorted_images:
+            build_scc_sorted_images(vertexes, scc_label)
+        if not compute_rank:
+            for vertex in vertexes:
+                vertex.scc = None
+
+    if preprocess:
+        return (
+            vertexes,
+            preprocess_initial_partition(vertexes, initial_partition),
+        )
     else:
-        return tp
+        return (vertexes, qblocks)
 
 
 def decorate_bispy_graph(
@@ -400,5 +541,45 @@ def to_tuple_list(qblocks: List[_QBlock]) -> List[Tuple]:
     ]
 
 
+def to_block_array(qblocks: List[_QBlock], nvertexes: int) -> np.ndarray:
+    """Convert the given partition (represented by a list of
+    :class:`bispy.utilities.graph_entities._QBlock`) to an array which maps
+    the label of each vertex to the index of its block. Empty blocks are
+    skipped, therefore blocks are numbered from 0 without holes (in the
+    order of `qblocks`).
+
+    :param qblocks: A partition.
+    :param nvertexes: The size of the array. Items which do not correspond
+        to the label of a vertex in `qblocks` are -1.
+    """
+
+    qblocks = [qblock for qblock in qblocks if qblock.size > 0]
+    labels = np.fromiter(
+        (vertex.label for qblock in qblocks for vertex in qblock.vertexes),
+        dtype=np.int64,
+    )
+    sizes = np.fromiter(
+        (qblock.size for qblock in qblocks),
+        dtype=np.int64,
+        count=len(qblocks),
+    )
+
+    block = np.full(nvertexes, -1, dtype=np.int64)
+    block[labels] = np.repeat(np.arange(len(qblocks), dtype=np.int64), sizes)
+    return block
+
+
+def check_output(output: str):
+    """Check that the given format of the output of an algorithm is valid:
+    `"tuples"` (a list of tuples of nodes) or `"labels"` (an array which maps
+    each node to the index of its block).
+
+    :param output: The format of the output.
+    """
+
+    if output not in ("tuples", "labels"):
+        raise ValueError("Unknown output: {}".format(output))
+
+
 def to_set(qblocks: List[Tuple[int]]) -> Set:
     return set(frozenset(block) for block in qblocks)
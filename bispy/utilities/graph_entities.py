@@ -1,7 +1,75 @@
-from llist import dllist, dllistnode
 from typing import Iterable, Callable, Any, Union, List
 
 
+class _LinkedList:
+    """An *intrusive* Doubly-Linked-List: the pointers to the previous and to
+    the next item are stored in the attributes `_prev` and `_next` of the
+    items themselves, therefore inserting or removing an item takes
+    :math:`O(1)` and does not allocate anything. As a consequence an item
+    can belong to at most one list at a time (a vertex belongs to one
+    :class:`_QBlock`, and a :class:`_QBlock` belongs to one
+    :class:`_XBlock`).
+
+    It is safe to remove the current item (or to move it to another list)
+    while iterating over the list.
+    """
+
+    __slots__ = ("first", "last", "size")
+
+    def __init__(self):
+        self.first = None
+        self.last = None
+        self.size = 0
+
+    def append(self, item):
+        """Append an item (which must not belong to any list) at the end of
+        the list.
+
+        :param item: The new item.
+        """
+
+        last = self.last
+        item._prev = last
+        item._next = None
+        if last is None:
+            self.first = item
+        else:
+            last._next = item
+        self.last = item
+        self.size += 1
+
+    def remove(self, item):
+        """Remove an item from the list.
+
+        :param item: An item of this list.
+        """
+
+        previous_item = item._prev
+        next_item = item._next
+        if previous_item is None:
+            self.first = next_item
+        else:
+            previous_item._next = next_item
+        if next_item is None:
+            self.last = previous_item
+        else:
+            next_item._prev = previous_item
+        item._prev = None
+        item._next = None
+        self.size -= 1
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        item = self.first
+        while item is not None:
+            # read the pointer before yielding, the item may be moved
+            next_item = item._next
+            yield item
+            item = next_item
+
+
 class _Vertex:
     """BisPy representation of a vertex. Contains several data structures which
     provide :math:`O(1)` access to the :math:`E(\\textit{vertex})` and
@@ -9,17 +77,40 @@ class _Vertex:
     information used among different parts of the algorithm (make sure to reset
     them when they are not needed anymore).
 
+    Instances don't have a `__dict__` (the attributes are declared in
+    `__slots__`), which saves memory on large graphs and makes attribute
+    access faster.
+
     :param int label: A unique integer ID which identifies this vertex.
     """
 
+    __slots__ = (
+        "_label",
+        "_original_label",
+        "_qblock",
+        "_prev",
+        "_next",
+        "_scc",
+        "visited",
+        "image",
+        "counterimage",
+        "initial_partition_block_id",
+        "aux_count",
+        "in_second_splitter",
+        "allow_visit",
+        "_original_graph",
+        "reachable_from_base",
+    )
+
     def __init__(self, label):
         """Constructor method"""
         self._label = label
         self._qblock = None
 
-        # the dllistobject which refers to this vertex inside the dllist inside
-        # the QBlock which contains this vertex
-        self._dllistnode = None
+        # the previous and the next vertex in the list of vertexes of the
+        # QBlock which contains this vertex
+        self._prev = None
+        self._next = None
 
         # a property shared by many algorithms, reset it to False after usage
         self.visited = False
@@ -40,6 +131,9 @@ class _Vertex:
 
         self.allow_visit = False
 
+        # (image, counterimage, count) before a call to restrict_to_subgraph
+        self._original_graph = None
+
         self._scc = None
 
     @property
@@ -114,46 +208,56 @@ class _Vertex:
 
     # creates a subgraph which contains only vertexes of the
     # same rank of this vertex.
-    def restrict_to_subgraph(self, validation: Callable[[Any], bool]):
+    def restrict_to_subgraph(
+        self, validation: Callable[[Any], bool], keep_original: bool = True
+    ):
         """
         Restrict the image and counterimage only to vertexes that satisfy the
         given validation function, and resets the value of the associated
         :class:`_Count` instanced.
 
-        Also sets `_original_img`, `_original_counterimg`, `_original_count`,
-        which can then be recovered using :func:`back_to_original_graph`.
+        The original image, counterimage and :class:`_Count` can then be
+        recovered using :func:`back_to_original_graph`.
 
         :param validation: A function which returns `True` when the vertex
             given as argument is accepted in the subgraph.
         :type validation: Callable[[_Vertex], bool]
+        :param keep_original: If `False`, the original graph is not kept
+            (and cannot be recovered), which saves memory when the
+            restriction is permanent. Defaults to `True`.
         """
 
         # this will be called just before calling PTA, therefore set the _Count
         # instance for each _Edge
 
-        self._original_img = self.image
+        original_image = self.image
         self.image = []
 
-        self._original_count = None
+        original_count = None
         count = _Count(self)
 
-        for edge in self._original_img:
+        for edge in original_image:
             if validation(edge.destination):
-                self.add_to_image(edge)
+                self.image.append(edge)
 
-                if self._original_count is None:
-                    self._original_count = edge.count
+                if original_count is None:
+                    original_count = edge.count
 
                 # set the count for this _Edge, and increment the counter
                 edge.count = count
                 count.value += 1
 
-        self._original_counterimg = self.counterimage
-        self.counterimage = []
+        original_counterimage = self.counterimage
+        self.counterimage = [
+            edge for edge in original_counterimage if validation(edge.source)
+        ]
 
-        for edge in self._original_counterimg:
-            if validation(edge.source):
-                self.add_to_counterimage(edge)
+        if keep_original:
+            self._original_graph = (
+                original_image,
+                original_counterimage,
+                original_count,
+            )
 
     def back_to_original_graph(self):
         """
@@ -162,15 +266,15 @@ class _Vertex:
         :func:`restrict_to_subgraph`.
         """
 
-        self.image = self._original_img
-        self.counterimage = self._original_counterimg
+        (
+            self.image,
+            self.counterimage,
+            original_count,
+        ) = self._original_graph
+        self._original_graph = None
 
         for edge in self.image:
-            edge.count = self._original_count
-
-        self._original_count = None
-        self._original_counterimg = None
-        self._original_img = None
+            edge.count = original_count
 
     def add_to_counterimage(self, edge):
         self.counterimage.append(edge)
@@ -197,27 +301,20 @@ class _Vertex:
 class _Edge:
     """Represents an edge between two instances of :class:`_Vertex`.
 
+    The attribute `count` holds the value
+    :math:`|E({\\textit{source}}) \\cap S|`, where :math:`S` is the block of
+    the partition :math:`X` that `destination` belongs to.
+
     :param source: The source of the edge.
     :param destination: The destination of the edge.
     """
 
+    __slots__ = ("source", "destination", "count")
+
     def __init__(self, source: _Vertex, destination: _Vertex):
         self.source = source
         self.destination = destination
-        self._count = None
-
-    @property
-    def count(self):
-        """Holds the value :math:`|E({\\textit{source}}) \\cap S|`, where
-        :math:`S` is the block of the partition :math:`X` that `destination`
-        belongs to.
-        """
-
-        return self._count
-
-    @count.setter
-    def count(self, count):
-        self._count = count
+        self.count = None
 
     # this is only used for testing purposes
     def __hash__(self):
@@ -242,23 +339,39 @@ class _QBlock:
     general-purpose block by *Dovier-Piazza-Policriti*'s and *Saha*'s
     algorithms.
 
-    This class uses a *Doubly-Linked-List* to store the set vertexes inside
-    the block, therefore we are able to remove a node in :math:`O(1)`.
+    This class uses an intrusive *Doubly-Linked-List* (see
+    :class:`_LinkedList`) to store the set vertexes inside the block,
+    therefore we are able to remove a node in :math:`O(1)`.
 
     :param vertexes: Vertexes in the block.
     :param xblock: The block of :math:`X` that this block belongs to.
     :type xblock: _XBlock
     """
 
+    __slots__ = (
+        "vertexes",
+        "size",
+        "split_helper_block",
+        "_prev",
+        "_next",
+        "visited",
+        "_xblock",
+        "deteached",
+        "tried_merge",
+        "is_new_qblock",
+    )
+
     def __init__(self, vertexes: List[_Vertex], xblock):
-        self.vertexes = dllist([])
+        self._xblock = None
+        self._prev = None
+        self._next = None
+        self.vertexes = _LinkedList()
+        self.size = 0
 
         for vertex in vertexes:
             self.append_vertex(vertex)
 
-        self.size = self.vertexes.size
         self.split_helper_block = None
-        self.dllistnode = None
         self.visited = False
 
         if xblock is not None:
@@ -279,7 +392,7 @@ class _QBlock:
         """
 
         if self.vertexes.first is not None:
-            return self.vertexes.first.value.rank
+            return self.vertexes.first.rank
         else:
             return None
 
@@ -289,28 +402,24 @@ class _QBlock:
         The block of :math:`X` this block belongs to.
         """
 
-        if hasattr(self, "_xblock"):
-            return self._xblock
-        else:
-            return None
+        return self._xblock
 
     @xblock.setter
     def xblock(self, value):
         self._xblock = value
 
     # this doesn't check if the vertex is a duplicate.
-    # make sure that vertex is a proper _Vertex, not a dllistnode
+    # make sure that vertex does not belong to another block
     def append_vertex(self, vertex: _Vertex):
         """
-        Append a new vertex to this block. This also sets the attributes
-        `vertex._dllistnode` and `vertex._qblock`, and updates the attribute
-        `size`.
+        Append a new vertex to this block. This also sets the attribute
+        `vertex._qblock`, and updates the attribute `size`.
 
         :param vertex: The new vertex to be added.
         """
 
-        vertex._dllistnode = self.vertexes.append(vertex)
-        self.size = self.vertexes.size
+        self.vertexes.append(vertex)
+        self.size += 1
         vertex._qblock = self
 
     def remove_vertex(self, vertex: _Vertex):
@@ -318,15 +427,14 @@ class _QBlock:
         Remove a vertex to this block. This also resets the attribute
         `vertex._qblock`, and updates the attribute `size`.
 
-        This function uses the attribute `vertex._dllistnode` to
-        modify the Doubly-Linked-List in the attribute `vertexes` in
-        :math:`O(1)`.
+        The vertex is unlinked from the Doubly-Linked-List in the attribute
+        `vertexes` in :math:`O(1)`.
 
         :param vertex: The new vertex to be added.
         """
 
-        self.vertexes.remove(vertex._dllistnode)
-        self.size = self.vertexes.size
+        self.vertexes.remove(vertex)
+        self.size -= 1
         vertex._qblock = None
 
     def initialize_split_helper_block(self):
@@ -340,13 +448,13 @@ class _QBlock:
 
     def initial_partition_block_id(self):
         if self.vertexes.size > 0:
-            return self.vertexes.first.value.initial_partition_block_id
+            return self.vertexes.first.initial_partition_block_id
         else:
             return None
 
     def merge(self, block2):
         """
-        Add all the vertexes in `block2` to this block, and then set
+        Move all the vertexes in `block2` to this block, and then set
         the attribute `block2.deteached` to `True`.
 
         :param block2: The block to be merged into `self`.
@@ -354,6 +462,7 @@ class _QBlock:
         """
 
         for vertex in block2.vertexes:
+            block2.remove_vertex(vertex)
             self.append_vertex(vertex)
         block2.deteached = True
 
@@ -393,12 +502,15 @@ class _QBlock:
 class _XBlock:
     """A block of the partition :math:`X`.
 
-    This class uses a *Doubly-Linked-List* to store the set vertexes inside
-    the block, therefore we are able to remove a block in :math:`O(1)`.
+    This class uses an intrusive *Doubly-Linked-List* (see
+    :class:`_LinkedList`) to store the blocks of :math:`Q` inside the block,
+    therefore we are able to remove a block in :math:`O(1)`.
     """
 
+    __slots__ = ("qblocks",)
+
     def __init__(self):
-        self.qblocks = dllist([])
+        self.qblocks = _LinkedList()
 
     @property
     def size(self):
@@ -407,13 +519,13 @@ class _XBlock:
 
     def append_qblock(self, qblock: _QBlock):
         """Insert a new block of :math:`Q` in this block. This also sets the
-        attributes `qblock.dllistnode` and `qblock.xblock`.
+        attribute `qblock.xblock`.
 
         :param: The block of :math:`Q` to be inserted.
         :returns: `self`, to allow chain insertions.
         :rtype: _XBlock"""
 
-        qblock.dllistnode = self.qblocks.append(qblock)
+        self.qblocks.append(qblock)
         qblock.xblock = self
         return self
 
@@ -424,7 +536,7 @@ class _XBlock:
         :param: The block of :math:`Q` to be removed.
         """
 
-        self.qblocks.remove(qblock.dllistnode)
+        self.qblocks.remove(qblock)
         qblock.xblock = None
 
     def __repr__(self):
@@ -433,6 +545,8 @@ class _XBlock:
 
 # holds the value of count(vertex,_XBlock) = |_XBlock \cap E({vertex})|
 class _Count:
+    __slots__ = ("vertex", "value")
+
     def __init__(self, vertex: _Vertex):
         self.vertex = vertex
         self.value = 0
@@ -445,17 +559,35 @@ class _SCC:
     """Represents a *strongly connected component*. This is used to compute
     rank.
 
+    The image and the counterimage (`dict` which map the label of an SCC to
+    the SCC) are allocated by :func:`compute_image` and
+    :func:`compute_counterimage`, and can be released with
+    :func:`release_adjacency` when they are not needed anymore.
+
     :param label: A unique ID.
     """
 
+    __slots__ = (
+        "_label",
+        "_rank",
+        "_wf",
+        "_image",
+        "_counterimage",
+        "_vertexes",
+        "visited",
+    )
+
     def __init__(self, label: int):
         self._label = label
         self._rank = float("-inf")
+        # computed lazily, see wf
+        self._wf = None
 
-        self._image = {}
-        self._counterimage = {}
+        self._image = None
+        self._counterimage = None
 
-        self._vertexes = set()
+        # vertexes are never removed from an SCC (but when it's destroyed)
+        self._vertexes = []
 
         self.visited = False
 
@@ -469,6 +601,8 @@ class _SCC:
         """The overall image of the SCC. The function :func:`compute_image`
         must be called beforehand."""
 
+        if self._image is None:
+            return ()
         return self._image.values()
 
     @property
@@ -476,6 +610,8 @@ class _SCC:
         """The overall counterimage of the SCC. The function
         :func:`compute_counterimage` must be called beforehand."""
 
+        if self._counterimage is None:
+            return ()
         return self._counterimage.values()
 
     @property
@@ -484,7 +620,7 @@ class _SCC:
         there is only one vertex in the component, but this is not guaranteed).
         """
 
-        if not hasattr(self, "_wf"):
+        if self._wf is None:
             if len(self._vertexes) > 1:
                 self._wf = False
             else:
@@ -506,7 +642,7 @@ class _SCC:
 
         :param vertex: The vertex to be added."""
 
-        self._vertexes.add(vertex)
+        self._vertexes.append(vertex)
         vertex.scc = self
 
     def mark_leaf(self):
@@ -521,7 +657,7 @@ class _SCC:
     def compute_image(self):
         """Compute the image of this SCC."""
 
-        self._image.clear()
+        self._image = {}
         for vx in self._vertexes:
             for edge in vx.image:
                 # edge towards self
@@ -540,7 +676,7 @@ class _SCC:
     def compute_counterimage(self):
         """Compute the counterimage of this SCC."""
 
-        self._counterimage.clear()
+        self._counterimage = {}
         for vx in self._vertexes:
             for edge in vx.counterimage:
                 # edge towards self, don't include
@@ -549,12 +685,19 @@ class _SCC:
                 else:
                     self._counterimage[edge.source.scc.label] = edge.source.scc
 
+    def release_adjacency(self):
+        """Release the image and the counterimage of this SCC (they can be
+        computed again using :func:`compute_image` and
+        :func:`compute_counterimage`)."""
+
+        self._image = None
+        self._counterimage = None
+
     def destroy(self):
         """Destroy this SCC (image, counterimage and vertexes set)."""
 
-        self._vertexes.clear()
-        self._image.clear()
-        self._counterimage.clear()
+        self._vertexes = []
+        self.release_adjacency()
 
     def join(self, other):
         """Merge `other` into this SCC, and destroy `other`.
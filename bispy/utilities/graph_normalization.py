@@ -1,5 +1,122 @@
 import networkx as nx
-from typing import Dict, Tuple, Any, List
+from typing import Dict, Tuple, Any, List, Iterable, Iterator, Union
+
+
+class NodeIndex:
+    """A bijection between the nodes of a graph and the integers in
+    :math:`[0, n)`, used to work on the isomorphic integer graph without
+    building it. The mapping is built once in :math:`O(n)` (the index of a
+    node is its position in `nodes`), and translations in both directions do
+    not need any sorting.
+
+    The mapping may be updated using :meth:`add` and :meth:`remove`. A
+    removed node leaves a hole (`None`) in `idx_to_node`, which can be filled
+    by a new node.
+
+    :param nodes: The nodes of the graph (hashable objects, without
+        duplicates).
+    """
+
+    def __init__(self, nodes: Iterable[Any]):
+        # contiguous idx -> node mapping
+        self.idx_to_node = list(nodes)
+        self.node_to_idx = {
+            node: idx
+            for idx, node in enumerate(self.idx_to_node)
+            if node is not None
+        }
+
+    def __len__(self) -> int:
+        return len(self.idx_to_node)
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self.node_to_idx
+
+    def index(self, node: Any) -> int:
+        """The integer which represents the given node.
+
+        :param node: A node of the graph.
+        """
+        return self.node_to_idx[node]
+
+    def node(self, idx: int) -> Any:
+        """The node represented by the given integer.
+
+        :param idx: An integer in :math:`[0, n)`.
+        """
+        return self.idx_to_node[idx]
+
+    def add(self, node: Any, idx: int):
+        """Map a new node to the given integer, which must be free (a hole
+        left by :meth:`remove`, or the first integer after the last one).
+
+        :param node: The new node.
+        :param idx: The integer which represents `node`.
+        """
+
+        if node in self.node_to_idx:
+            raise ValueError("The node {} is already indexed".format(node))
+
+        if idx == len(self.idx_to_node):
+            self.idx_to_node.append(node)
+        elif self.idx_to_node[idx] is None:
+            self.idx_to_node[idx] = node
+        else:
+            raise ValueError("The index {} is not free".format(idx))
+        self.node_to_idx[node] = idx
+
+    def remove(self, node: Any) -> int:
+        """Remove the given node from the mapping.
+
+        :param node: A node of the graph.
+        :returns: The integer which represented `node`, which is now free.
+        """
+
+        idx = self.node_to_idx.pop(node)
+        self.idx_to_node[idx] = None
+        return idx
+
+    def integer_edges(
+        self, edges: Iterable[Tuple[Any, Any]]
+    ) -> Iterator[Tuple[int, int]]:
+        """Lazily translate the given edges to edges of the integer graph.
+
+        :param edges: Edges between nodes of the graph.
+        """
+
+        node_to_idx = self.node_to_idx
+        return (
+            (node_to_idx[edge[0]], node_to_idx[edge[1]]) for edge in edges
+        )
+
+    def to_integer_partition(
+        self, partition: Iterable[Iterable[Any]]
+    ) -> List[List[int]]:
+        """Translate the given partition of the nodes of the graph to a
+        partition of the integer graph.
+
+        :param partition: A partition of the nodes of the graph (may be
+            `None`, in which case `None` is returned).
+        """
+
+        if partition is None:
+            return None
+        node_to_idx = self.node_to_idx
+        return [[node_to_idx[node] for node in block] for block in partition]
+
+    def to_original_partition(
+        self, partition: Iterable[Iterable[int]]
+    ) -> List[Tuple[Any]]:
+        """Translate the given partition of the integer graph to a partition
+        of the nodes of the graph.
+
+        :param partition: A partition of the integer graph.
+        """
+
+        idx_to_node = self.idx_to_node
+        return [
+            tuple(idx_to_node[idx] for idx in block) for block in partition
+        ]
 
 
 def convert_to_integer_graph(
@@ -20,14 +137,12 @@ def convert_to_integer_graph(
     integer_graph.add_nodes_from(range(len(graph.nodes)))
 
     # map old nodes to integer nodes
-    node_to_idx = {old_node: idx for idx, old_node in enumerate(graph.nodes)}
+    node_index = NodeIndex(graph.nodes)
 
     # add integer edges
-    integer_graph.add_edges_from(
-        (node_to_idx[edge[0]], node_to_idx[edge[1]]) for edge in graph.edges
-    )
+    integer_graph.add_edges_from(node_index.integer_edges(graph.edges))
 
-    return integer_graph, node_to_idx
+    return integer_graph, node_index.node_to_idx
 
 
 def check_normal_integer_graph(graph: nx.Graph) -> bool:
@@ -43,19 +158,26 @@ def check_normal_integer_graph(graph: nx.Graph) -> bool:
 
 
 def back_to_original(
-    partition: List[Tuple[int]], node_to_idx: Tuple[nx.Graph, Dict[Any, int]]
+    partition: List[Tuple[int]],
+    node_to_idx: Union[NodeIndex, Dict[Any, int]],
 ) -> List[Tuple[Any]]:
     """Convert the given partition of the nodes of an integer graph to the
     representation which uses nodes from the original graph using the mapping
-    returned by :func:`convert_to_integer_graph`.
+    returned by :func:`convert_to_integer_graph` (or a :class:`NodeIndex`,
+    which avoids rebuilding the inverse mapping on each call).
 
     :param partition: The partition of the set of nodes of an integer graph.
     :param node_to_idx: The mapping returned by
-        :func:`convert_to_integer_graph`.
+        :func:`convert_to_integer_graph`, or a :class:`NodeIndex`.
     """
 
+    if isinstance(node_to_idx, NodeIndex):
+        return node_to_idx.to_original_partition(partition)
+
     # create a mapping from idx to the original nodes
-    idx_to_node = sorted(node_to_idx, key=lambda node: node_to_idx[node])
+    idx_to_node = [None] * len(node_to_idx)
+    for node, idx in node_to_idx.items():
+        idx_to_node[idx] = node
 
     # compute the RSCP of the original graph
     return [tuple(idx_to_node[idx] for idx in block) for block in partition]
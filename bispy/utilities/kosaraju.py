@@ -65,18 +65,25 @@ def kosaraju(
 
 
 def assign_scc(node: _Vertex, scc_instance: _SCC, based_scc_tree: bool):
+    # DFS of G^{-1} using an explicit stack of (vertex, counterimage iterator)
     scc_instance.add_vertex(node)
-
-    for edge in node.counterimage:
-        source = edge.source
-        if edge.source.scc is None and (
-            not based_scc_tree
-            or (
-                hasattr(source, "reachable_from_base")
-                and source.reachable_from_base
-            )
-        ):
-            assign_scc(edge.source, scc_instance, based_scc_tree)
+    stack = [(node, iter(node.counterimage))]
+
+    while stack:
+        for edge in stack[-1][1]:
+            source = edge.source
+            if source.scc is None and (
+                not based_scc_tree
+                or (
+                    hasattr(source, "reachable_from_base")
+                    and source.reachable_from_base
+                )
+            ):
+                scc_instance.add_vertex(source)
+                stack.append((source, iter(source.counterimage)))
+                break
+        else:
+            stack.pop()
 
     return scc_instance
 
@@ -85,18 +92,22 @@ def predecessors(node: _Vertex, reachable_vertexes: List[_Vertex]):
     node.visited = True
     node.reachable_from_base = True
     reachable_vertexes.append(node)
-
-    for edge in node.counterimage:
-        if not edge.source.visited:
-            predecessors(edge.source, reachable_vertexes)
-
-
-def visit(
-    node: _Vertex,
-    finishing_time_list: List[_Vertex],
-    available_labels: Dict[int, bool],
-    based_scc_tree: bool,
-):
+    stack = [iter(node.counterimage)]
+
+    while stack:
+        for edge in stack[-1]:
+            source = edge.source
+            if not source.visited:
+                source.visited = True
+                source.reachable_from_base = True
+                reachable_vertexes.append(source)
+                stack.append(iter(source.counterimage))
+                break
+        else:
+            stack.pop()
+
+
+def _visit_enter(node: _Vertex, available_labels: Dict[int, bool]):
     node.visited = True
     if node.scc is not None:
         # we want to destroy this SCC, but we want to know which labels we can
@@ -105,19 +116,30 @@ def visit(
         # clear SCC
         node.scc = None
 
-    for edge in node.image:
-        dest = edge.destination
-        if not dest.visited and (
-            not based_scc_tree
-            or (
-                hasattr(dest, "reachable_from_base")
-                and dest.reachable_from_base
-            )
-        ):
-            visit(
-                edge.destination,
-                finishing_time_list,
-                available_labels,
-                based_scc_tree,
-            )
-    finishing_time_list.append(node)
+
+def visit(
+    node: _Vertex,
+    finishing_time_list: List[_Vertex],
+    available_labels: Dict[int, bool],
+    based_scc_tree: bool,
+):
+    # DFS of G using an explicit stack of (vertex, image iterator), a vertex
+    # is appended to finishing_time_list when its iterator is exhausted
+    _visit_enter(node, available_labels)
+    stack = [(node, iter(node.image))]
+
+    while stack:
+        for edge in stack[-1][1]:
+            dest = edge.destination
+            if not dest.visited and (
+                not based_scc_tree
+                or (
+                    hasattr(dest, "reachable_from_base")
+                    and dest.reachable_from_base
+                )
+            ):
+                _visit_enter(dest, available_labels)
+                stack.append((dest, iter(dest.image)))
+                break
+        else:
+            finishing_time_list.append(stack.pop()[0])
@@ -0,0 +1,187 @@
+import os
+import numpy as np
+from typing import Iterable, Union
+
+from bispy.utilities.array_graph import (
+    ArrayGraph,
+    index_dtype,
+    partition_to_block_array,
+)
+
+# number of edges read from the edge file at a time
+_CHUNK_SIZE = 1 << 22
+
+
+def write_binary_edge_list(
+    path: str,
+    sources: Union[np.ndarray, Iterable[int]],
+    destinations: Union[np.ndarray, Iterable[int]],
+):
+    """Write the edges `(sources[i], destinations[i])` to a binary edge file
+    which can be read by :func:`memmap_array_graph`: a flat sequence of
+    pairs of `int32` (source, destination), sorted by source and then by
+    destination, without header.
+
+    :param path: The path of the file.
+    :param sources: Sources of the edges.
+    :param destinations: Destinations of the edges.
+    """
+
+    edges = np.empty((len(sources), 2), dtype=np.int32)
+    edges[:, 0] = sources
+    edges[:, 1] = destinations
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    edges.tofile(path)
+
+
+def _open_cache(cache_dir: str, name: str, dtype, length: int) -> np.memmap:
+    return np.lib.format.open_memmap(
+        os.path.join(cache_dir, name + ".npy"),
+        mode="w+",
+        dtype=dtype,
+        shape=(length,),
+    )
+
+
+def memmap_array_graph(
+    path: str,
+    nvertexes: int = None,
+    initial_partition: Iterable[Iterable[int]] = None,
+    cache_dir: str = None,
+) -> ArrayGraph:
+    """Build an :class:`bispy.utilities.array_graph.ArrayGraph` whose
+    adjacency is read from disk through memory-mapped files instead of
+    being loaded in memory, for graphs which are too large for the *BisPy*
+    (or even the *NetworkX*) representation.
+
+    The edges are read from a binary edge file (see
+    :func:`write_binary_edge_list`): since it's sorted by source, its second
+    column is the *CSR* `image` of the graph, and it's used in-place. The
+    offsets of the images and the *CSC* arrays (`counterimage_offsets`,
+    `counterimage` and `counterimage_edge`) are built by a counting sort
+    which processes the edges in chunks, and written to `.npy` files in
+    `cache_dir`, which are memory-mapped as well. Therefore adjacency is
+    read from the page cache, and the operating system keeps in memory only
+    the pages which are used.
+
+    The arrays of the state of the refinement (blocks, `count` slots of the
+    edges) are still allocated in memory by the engines (see
+    :mod:`bispy.paige_tarjan.array_paige_tarjan`).
+
+        >>> graph = memmap_array_graph("edges.bin", nvertexes=10**9)
+        >>> array_paige_tarjan(graph)
+
+    :param path: The path of the binary edge file.
+    :param nvertexes: The number of vertexes. Defaults to `None`, in which
+        case it's the maximum vertex in the file plus one.
+    :param initial_partition: The initial partition (or labeling set). Defaults
+        to `None`, in which case the trivial labeling set (one block which
+        contains all the nodes) is used.
+    :param cache_dir: The directory where the arrays built from the edge file
+        are written. Defaults to `None`, in which case the directory of
+        `path` is used (the files are named after `path`).
+    """
+
+    if cache_dir is None:
+        cache_dir = os.path.dirname(os.path.abspath(path))
+    prefix = os.path.basename(path)
+
+    size = os.path.getsize(path)
+    if size % 8 != 0:
+        raise ValueError(
+            "The size of {} is not a multiple of the size of a pair of "
+            "int32".format(path)
+        )
+    nedges = size // 8
+    if nedges > 0:
+        edges = np.memmap(path, dtype=np.int32, mode="r", shape=(nedges, 2))
+    else:
+        edges = np.zeros((0, 2), dtype=np.int32)
+    chunks = [
+        (start, min(start + _CHUNK_SIZE, nedges))
+        for start in range(0, nedges, _CHUNK_SIZE)
+    ]
+
+    # first pass: check the order and the vertexes
+    max_vertex = -1
+    previous_source = -1
+    for start, end in chunks:
+        sources = np.asarray(edges[start:end, 0])
+        destinations = np.asarray(edges[start:end, 1])
+        if sources[0] < previous_source or np.any(np.diff(sources) < 0):
+            raise ValueError("The edges in {} are not sorted".format(path))
+        previous_source = int(sources[-1])
+        if min(int(sources[0]), int(destinations.min())) < 0:
+            raise ValueError("Vertexes must be non-negative integers")
+        max_vertex = max(max_vertex, previous_source, int(destinations.max()))
+
+    if nvertexes is None:
+        nvertexes = max_vertex + 1
+    elif max_vertex >= nvertexes:
+        raise ValueError(
+            "The vertex {} is out of range, nvertexes is {}".format(
+                max_vertex, nvertexes
+            )
+        )
+
+    # second pass: count the degrees
+    out_degree = np.zeros(nvertexes, dtype=np.int64)
+    in_degree = np.zeros(nvertexes, dtype=np.int64)
+    for start, end in chunks:
+        out_degree += np.bincount(edges[start:end, 0], minlength=nvertexes)
+        in_degree += np.bincount(edges[start:end, 1], minlength=nvertexes)
+
+    image_offsets = _open_cache(
+        cache_dir, prefix + ".image_offsets", np.int64, nvertexes + 1
+    )
+    image_offsets[0] = 0
+    np.cumsum(out_degree, out=image_offsets[1:])
+    counterimage_offsets = _open_cache(
+        cache_dir, prefix + ".counterimage_offsets", np.int64, nvertexes + 1
+    )
+    counterimage_offsets[0] = 0
+    np.cumsum(in_degree, out=counterimage_offsets[1:])
+    del out_degree, in_degree
+
+    # third pass: counting sort of the edges by destination (stable, like
+    # the CSC built by array_graph_from_edges)
+    counterimage = _open_cache(
+        cache_dir, prefix + ".counterimage", np.int32, nedges
+    )
+    counterimage_edge = _open_cache(
+        cache_dir, prefix + ".counterimage_edge", index_dtype(nedges), nedges
+    )
+    cursor = np.array(counterimage_offsets[:-1])
+    for start, end in chunks:
+        destinations = np.asarray(edges[start:end, 1])
+        order = np.argsort(destinations, kind="stable")
+        sorted_destinations = destinations[order]
+        # the rank of each edge among the edges of the chunk with the same
+        # destination
+        group_start = np.flatnonzero(
+            np.concatenate(([True], np.diff(sorted_destinations) != 0))
+        )
+        group_size = np.diff(np.append(group_start, len(order)))
+        rank = np.arange(len(order)) - np.repeat(group_start, group_size)
+
+        positions = cursor[sorted_destinations] + rank
+        counterimage[positions] = edges[start:end, 0][order]
+        counterimage_edge[positions] = order + start
+        cursor[sorted_destinations[group_start]] += group_size
+    for array in (
+        image_offsets,
+        counterimage_offsets,
+        counterimage,
+        counterimage_edge,
+    ):
+        array.flush()
+
+    return ArrayGraph(
+        nvertexes=nvertexes,
+        image_offsets=image_offsets,
+        image=edges[:, 1],
+        counterimage_offsets=counterimage_offsets,
+        counterimage=counterimage,
+        counterimage_edge=counterimage_edge,
+        block=partition_to_block_array(initial_partition, nvertexes),
+    )
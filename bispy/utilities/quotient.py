@@ -0,0 +1,161 @@
+import numpy as np
+import networkx as nx
+from typing import Iterable, List, Tuple, Union
+
+from bispy.utilities.graph_entities import _Vertex
+from bispy.utilities.graph_normalization import (
+    check_normal_integer_graph,
+    NodeIndex,
+)
+from bispy.utilities.array_graph import (
+    as_array_graph,
+    partition_to_block_array,
+    sorted_unique,
+)
+from bispy.utilities.edge_list import is_edge_list, edge_list_to_arrays
+
+
+def vertexes_to_edge_arrays(
+    vertexes: List[_Vertex],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Collect the edges of the *BisPy* representation of a graph (the
+    images of the given vertexes) in two arrays.
+
+    :param vertexes: The vertexes of the graph.
+    :returns: The labels of the sources and of the destinations of the
+        edges.
+    """
+
+    out_degree = np.fromiter(
+        (len(vertex.image) for vertex in vertexes),
+        dtype=np.int64,
+        count=len(vertexes),
+    )
+    labels = np.fromiter(
+        (vertex.label for vertex in vertexes),
+        dtype=np.int64,
+        count=len(vertexes),
+    )
+    destinations = np.fromiter(
+        (
+            edge.destination.label
+            for vertex in vertexes
+            for edge in vertex.image
+        ),
+        dtype=np.int64,
+        count=int(out_degree.sum()),
+    )
+    return (np.repeat(labels, out_degree), destinations)
+
+
+def quotient_edges(
+    sources: np.ndarray, destinations: np.ndarray, block: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the edges of the quotient of a graph with respect to a
+    partition of its vertexes: there is an edge :math:`(B, C)` iff there is
+    an edge from a vertex of :math:`B` to a vertex of :math:`C`. The edges of
+    the graph are mapped to couples of blocks, whose duplicates are removed
+    by sorting them.
+
+    :param sources: Sources of the edges of the graph.
+    :param destinations: Destinations of the edges of the graph.
+    :param block: The block of each vertex (blocks are numbered from 0).
+    :returns: The sources and the destinations of the edges of the quotient
+        (sorted by source, and then by destination).
+    """
+
+    nblocks = int(block.max()) + 1 if len(block) > 0 else 0
+    block = block.astype(np.int64, copy=False)
+
+    keys = sorted_unique(block[sources] * nblocks + block[destinations])
+    return (keys // nblocks, keys % nblocks)
+
+
+def quotient_to_nx_graph(
+    sources: np.ndarray, destinations: np.ndarray, nblocks: int
+) -> nx.DiGraph:
+    """Build the *NetworkX* representation of a quotient graph, whose nodes
+    are the indexes of the blocks.
+
+    :param sources: Sources of the edges of the quotient.
+    :param destinations: Destinations of the edges of the quotient.
+    :param nblocks: The number of blocks.
+    """
+
+    quotient_graph = nx.DiGraph()
+    quotient_graph.add_nodes_from(range(nblocks))
+    quotient_graph.add_edges_from(zip(sources.tolist(), destinations.tolist()))
+    return quotient_graph
+
+
+def quotient(
+    graph: nx.Graph,
+    partition: Union[Iterable[Iterable], np.ndarray],
+    nvertexes: int = None,
+    is_integer_graph: bool = False,
+    as_arrays: bool = False,
+) -> Union[nx.DiGraph, Tuple[np.ndarray, np.ndarray]]:
+    """Build the quotient of the given graph with respect to the given
+    partition of its nodes (for instance the RSCP/maximum bisimulation, in
+    which case the quotient is the *minimized* graph). The nodes of the
+    quotient are the indexes of the blocks of `partition`, and there is an
+    edge :math:`(B, C)` iff there is an edge from a node of :math:`B` to a
+    node of :math:`C`.
+
+        >>> rscp = paige_tarjan(graph)
+        >>> quotient(graph, rscp)
+
+    :param graph: The input graph, as a *NetworkX* directed graph or as an
+        edge list (a *NumPy* array of shape `(m,2)`, a list of couples of
+        integers, or a *SciPy* sparse adjacency matrix).
+    :param partition: The partition, as a list of tuples of nodes or as an
+        array which maps each node (as an integer, see
+        :mod:`bispy.utilities.graph_normalization`) to the index of its block
+        (like the output `"labels"` of
+        :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`).
+    :param nvertexes: The number of vertexes, used only if `graph` is an edge
+        list. Defaults to `None`, in which case it's inferred from `graph`.
+    :param is_integer_graph: If `True`, we do not check if the given graph is
+        integer (saves time). Defaults to `False`.
+    :param as_arrays: If `True`, the quotient is returned as the arrays of
+        the sources and of the destinations of its edges. Defaults to
+        `False`.
+    :returns: The quotient graph, as a *NetworkX* directed graph (or as two
+        arrays if `as_arrays` is `True`).
+    """
+
+    if is_edge_list(graph):
+        sources, destinations, nvertexes = edge_list_to_arrays(
+            graph, nvertexes
+        )
+    else:
+        if not isinstance(graph, nx.DiGraph):
+            raise Exception("graph should be a directed graph (nx.DiGraph)")
+
+        nvertexes = len(graph.nodes)
+        node_index = None
+        if not (is_integer_graph or check_normal_integer_graph(graph)):
+            node_index = NodeIndex(graph.nodes)
+            if not isinstance(partition, np.ndarray):
+                partition = node_index.to_integer_partition(partition)
+        array_graph = as_array_graph(graph, node_index=node_index)
+        sources = array_graph.edge_sources()
+        destinations = array_graph.image
+
+    if isinstance(partition, np.ndarray):
+        block = partition
+    else:
+        block = partition_to_block_array(partition, nvertexes)
+
+    quotient_sources, quotient_destinations = quotient_edges(
+        np.asarray(sources, dtype=np.int64),
+        np.asarray(destinations, dtype=np.int64),
+        block,
+    )
+    if as_arrays:
+        return (quotient_sources, quotient_destinations)
+    return quotient_to_nx_graph(
+        quotient_sources,
+        quotient_destinations,
+        int(block.max()) + 1 if len(block) > 0 else 0,
+    )
@@ -1,15 +1,27 @@
+import numpy as np
 from bispy.utilities.graph_entities import _Vertex, _SCC
-from typing import List, Set, Dict
+from bispy.utilities.array_graph import sorted_unique, _ranges
+from typing import List, Set, Dict, Tuple
 from .kosaraju import kosaraju
 
+# layers of the condensation smaller than this are visited one SCC at a time
+_MIN_LAYER_SIZE = 32
 
-# visit an SCC and propagate the DFS to all the SCCs in its image
+
+# visit an SCC and propagate the DFS to all the SCCs in its image. the DFS
+# uses an explicit stack of (SCC, image iterator)
 def visit_scc(node: _SCC, finishing_time_list: List[_SCC]):
     node.visited = True
-    for dest in node.image:
-        if not dest.visited:
-            visit_scc(dest, finishing_time_list)
-    finishing_time_list.append(node)
+    stack = [(node, iter(node.image))]
+
+    while stack:
+        for dest in stack[-1][1]:
+            if not dest.visited:
+                dest.visited = True
+                stack.append((dest, iter(dest.image)))
+                break
+        else:
+            finishing_time_list.append(stack.pop()[0])
 
 
 def scc_finishing_time_list(sccs: List[_SCC]):
@@ -74,5 +86,309 @@ def compute_rank(vertexes: List[_Vertex], sccs=None):
                         scc._rank = image_scc.rank
 
     for scc in sccs:
+        # the property wf is computed lazily from the image, therefore we
+        # store it before the image is released below
+        scc._wf = scc.wf
         for vx in scc._vertexes:
             vx.visited = False
+    for scc in sccs:
+        scc.release_adjacency()
+
+
+def _csr_tarjan(
+    offsets: List[int], targets: List[int], nvertexes: int
+) -> np.ndarray:
+    """*Tarjan*'s algorithm (with an explicit stack) on a graph in *CSR*
+    form, used by :func:`strongly_connected_components` when *SciPy* is not
+    available.
+    """
+
+    index = [-1] * nvertexes
+    lowlink = [0] * nvertexes
+    on_stack = [False] * nvertexes
+    scc = [-1] * nvertexes
+    scc_stack = []
+    counter = 0
+    nsccs = 0
+
+    for root in range(nvertexes):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack[root] = True
+        # each item is a vertex and the position of its next edge
+        stack = [[root, offsets[root]]]
+
+        while stack:
+            top = stack[-1]
+            vertex = top[0]
+            end = offsets[vertex + 1]
+            while top[1] < end:
+                destination = targets[top[1]]
+                top[1] += 1
+                if index[destination] == -1:
+                    index[destination] = lowlink[destination] = counter
+                    counter += 1
+                    scc_stack.append(destination)
+                    on_stack[destination] = True
+                    stack.append([destination, offsets[destination]])
+                    break
+                elif on_stack[destination]:
+                    if index[destination] < lowlink[vertex]:
+                        lowlink[vertex] = index[destination]
+            else:
+                stack.pop()
+                if lowlink[vertex] == index[vertex]:
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack[member] = False
+                        scc[member] = nsccs
+                        if member == vertex:
+                            break
+                    nsccs += 1
+                if stack:
+                    parent = stack[-1][0]
+                    if lowlink[vertex] < lowlink[parent]:
+                        lowlink[parent] = lowlink[vertex]
+
+    return np.array(scc, dtype=np.int64)
+
+
+def strongly_connected_components(
+    sources: np.ndarray, destinations: np.ndarray, nvertexes: int
+) -> np.ndarray:
+    """
+    Compute the *strongly connected components* of the graph whose edges are
+    `(sources[i], destinations[i])`, using
+    :func:`scipy.sparse.csgraph.connected_components` if *SciPy* is
+    installed, or *Tarjan*'s algorithm otherwise.
+
+    :param sources: Sources of the edges.
+    :param destinations: Destinations of the edges.
+    :param nvertexes: The number of vertexes.
+    :returns: An array which maps each vertex to the index of its SCC (SCCs
+        are numbered from 0 without holes).
+    """
+
+    sources = np.asarray(sources, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+
+    try:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(nvertexes + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(sources, minlength=nvertexes), out=offsets[1:]
+        )
+        return _csr_tarjan(
+            offsets.tolist(), destinations[order].tolist(), nvertexes
+        )
+
+    adjacency = csr_matrix(
+        (np.ones(len(sources), dtype=np.int8), (sources, destinations)),
+        shape=(nvertexes, nvertexes),
+    )
+    _, scc = connected_components(
+        adjacency, directed=True, connection="strong"
+    )
+    return scc.astype(np.int64)
+
+
+def _sequential_condensation_rank(
+    layer: np.ndarray,
+    current_layer: int,
+    predecessor: np.ndarray,
+    predecessor_offsets: np.ndarray,
+    remaining: np.ndarray,
+    rank: np.ndarray,
+    wf: np.ndarray,
+    layer_index: np.ndarray,
+) -> Tuple[np.ndarray, int]:
+    """Go on with the visit of :func:`condensation_rank` one SCC at a time
+    (the arrays are updated in-place), while the SCCs ready to be visited
+    are fewer than `_MIN_LAYER_SIZE`. Each SCC gets its own layer.
+
+    :returns: The SCCs ready to be visited, which form the next layer, and
+        the index of the next layer.
+    """
+
+    queue = layer.tolist()
+    head = 0
+    while head < len(queue) and len(queue) - head < _MIN_LAYER_SIZE:
+        scc = queue[head]
+        head += 1
+        layer_index[scc] = current_layer
+        current_layer += 1
+
+        scc_wf = wf.item(scc)
+        scc_rank = rank.item(scc)
+        if scc_wf and scc_rank == float("-inf"):
+            scc_rank = 0
+            rank[scc] = 0
+        contribution = scc_rank + 1 if scc_wf else scc_rank
+
+        start = predecessor_offsets.item(scc)
+        end = predecessor_offsets.item(scc + 1)
+        for source in predecessor[start:end].tolist():
+            if contribution > rank.item(source):
+                rank[source] = contribution
+            if not scc_wf:
+                wf[source] = False
+            source_remaining = remaining.item(source) - 1
+            remaining[source] = source_remaining
+            if source_remaining == 0:
+                queue.append(source)
+
+    return (np.array(queue[head:], dtype=np.int64), current_layer)
+
+
+def condensation_rank(
+    sources: np.ndarray, destinations: np.ndarray, scc: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the *rank* and the *well-foundedness* of the SCCs of a graph,
+    given the SCC of each vertex. The edges of the graph of the SCCs (the
+    condensation) are computed by sorting, and the SCCs are visited layer by
+    layer (first the SCCs without successors, then the SCCs whose successors
+    have all been visited, and so on): the contribution of a layer to the
+    *rank* of its predecessors is accumulated with
+    :func:`numpy.maximum.at`, therefore the cost of a layer does not depend
+    on the number of the SCCs. Layers with fewer than `_MIN_LAYER_SIZE`
+    SCCs (for instance in a long path) would pay the overhead of
+    :mod:`numpy` for a few SCCs, therefore they are visited one SCC at a
+    time, until enough SCCs are ready to be visited to form a large layer
+    again.
+
+    :param sources: Sources of the edges of the graph.
+    :param destinations: Destinations of the edges of the graph.
+    :param scc: The SCC of each vertex (see
+        :func:`strongly_connected_components`).
+    :returns: A tuple whose items are, for each SCC:
+
+        0. The *rank* (`-inf` for the SCCs which reach only
+           non-well-founded SCCs), as an array of floats;
+        1. The *well-foundedness*;
+        2. The index of the layer, which is greater than the layer of each
+           SCC in its image (therefore sorting the SCCs by layer gives a
+           topological order of :math:`G^{-1}`). SCCs visited one at a time
+           get a layer each.
+    """
+
+    nsccs = int(scc.max()) + 1 if len(scc) > 0 else 0
+    source_scc = scc[sources].astype(np.int64)
+    destination_scc = scc[destinations].astype(np.int64)
+
+    # an SCC is cyclic if it has more than one vertex or a self loop
+    cyclic = np.bincount(scc, minlength=nsccs) > 1
+    cyclic[source_scc[source_scc == destination_scc]] = True
+
+    # edges of the condensation, sorted by destination
+    external = source_scc != destination_scc
+    keys = sorted_unique(
+        destination_scc[external] * nsccs + source_scc[external]
+    )
+    predecessor = keys % max(nsccs, 1)
+    successor = keys // max(nsccs, 1)
+    predecessor_offsets = np.zeros(nsccs + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(successor, minlength=nsccs), out=predecessor_offsets[1:]
+    )
+    remaining = np.bincount(predecessor, minlength=nsccs)
+
+    rank = np.full(nsccs, -np.inf)
+    wf = ~cyclic
+    layer_index = np.zeros(nsccs, dtype=np.int64)
+
+    layer = np.flatnonzero(remaining == 0)
+    current_layer = 0
+    while len(layer) > 0:
+        if len(layer) < _MIN_LAYER_SIZE:
+            layer, current_layer = _sequential_condensation_rank(
+                layer,
+                current_layer,
+                predecessor,
+                predecessor_offsets,
+                remaining,
+                rank,
+                wf,
+                layer_index,
+            )
+            continue
+
+        layer_index[layer] = current_layer
+        # the rank accumulated from the image, or the rank of a leaf
+        leaf = wf[layer] & (rank[layer] == -np.inf)
+        rank[layer[leaf]] = 0
+
+        edges = _ranges(
+            predecessor_offsets[layer], predecessor_offsets[layer + 1]
+        )
+        predecessors = predecessor[edges]
+        successors = successor[edges]
+        np.maximum.at(
+            rank, predecessors, rank[successors] + wf[successors]
+        )
+        wf[predecessors[~wf[successors]]] = False
+
+        np.subtract.at(remaining, predecessors, 1)
+        layer = sorted_unique(predecessors[remaining[predecessors] == 0])
+        current_layer += 1
+
+    return (rank, wf, layer_index)
+
+
+def compute_rank_from_edges(
+    vertexes: List[_Vertex],
+    sources: np.ndarray,
+    destinations: np.ndarray,
+    scc: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Compute the rank of the given list of vertexes, like
+    :func:`compute_rank`, using the arrays of the edges of the graph instead
+    of visiting the *BisPy* representation: SCCs (if not given), *rank* and
+    *well-foundedness* are computed by
+    :func:`strongly_connected_components` and :func:`condensation_rank`, and
+    written to the vertexes at the end. The order of the images does not
+    matter.
+
+    :param vertexes: Vertexes of the graph, the label of each vertex must be
+        its index in `vertexes`.
+    :param sources: Sources of the edges of the graph.
+    :param destinations: Destinations of the edges of the graph.
+    :param scc: The SCC of each vertex. Defaults to `None`, in which case
+        SCCs are computed by :func:`strongly_connected_components`.
+    :returns: An array which maps each vertex to the label of its SCC. SCCs
+        are labeled from 0 in a topological order of :math:`G^{-1}`.
+    """
+
+    sources = np.asarray(sources, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    if scc is None:
+        scc = strongly_connected_components(
+            sources, destinations, len(vertexes)
+        )
+    rank, wf, layer_index = condensation_rank(sources, destinations, scc)
+
+    # relabel the SCCs in the order of the layers
+    order = np.argsort(layer_index, kind="stable")
+    label = np.empty(len(order), dtype=np.int64)
+    label[order] = np.arange(len(order))
+
+    sccs = []
+    for scc_rank, scc_wf in zip(rank[order].tolist(), wf[order].tolist()):
+        scc_instance = _SCC(label=len(sccs))
+        scc_instance._rank = (
+            scc_rank if scc_rank == float("-inf") else int(scc_rank)
+        )
+        scc_instance._wf = scc_wf
+        sccs.append(scc_instance)
+
+    vertex_label = label[scc]
+    for vertex, scc_label in zip(vertexes, vertex_label.tolist()):
+        sccs[scc_label].add_vertex(vertex)
+    return vertex_label
@@ -0,0 +1,336 @@
+import pickle
+import numpy as np
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from bispy.utilities.graph_entities import (
+    _Vertex,
+    _Edge,
+    _QBlock,
+    _Count,
+    _SCC,
+)
+from bispy.utilities.graph_normalization import NodeIndex
+from bispy.utilities.array_graph import block_array_to_tuple_list
+from bispy.utilities.graph_decorator import check_output
+
+
+def nodes_to_array(nodes: List[Any]) -> np.ndarray:
+    """Serialize the given nodes (any picklable objects, for instance the
+    attribute `idx_to_node` of a
+    :class:`bispy.utilities.graph_normalization.NodeIndex`) to an array of
+    bytes, which can be stored in a `.npz` file without enabling `pickle`
+    for the whole file.
+
+    :param nodes: The nodes.
+    """
+
+    return np.frombuffer(
+        pickle.dumps(list(nodes), protocol=pickle.HIGHEST_PROTOCOL),
+        dtype=np.uint8,
+    )
+
+
+def array_to_nodes(array: np.ndarray) -> List[Any]:
+    """Undo :func:`nodes_to_array`.
+
+    .. warning::
+        This uses `pickle`, load only trusted files.
+
+    :param array: An array created by :func:`nodes_to_array`.
+    """
+
+    return pickle.loads(array.tobytes())
+
+
+def vertexes_to_arrays(
+    vertexes: List[_Vertex], position: Dict[int, int] = None
+) -> Dict[str, np.ndarray]:
+    """Represent the *BisPy* representation of a graph with arrays: the
+    labeling set, the SCC, the *rank* and the *well-foundedness* of each
+    vertex, the image and the counterimage of each vertex (in order), and
+    the instances of :class:`bispy.utilities.graph_entities._Count` shared by
+    the edges.
+
+    :param vertexes: The vertexes of the graph, `None` for the labels which
+        do not represent a vertex.
+    :param position: The position of each SCC in a topological order (see
+        :class:`bispy.saha.condensation.Condensation`), indexed by the label
+        of the SCC. Defaults to `None`.
+    :returns: A `dict` of arrays, which can be given to :func:`numpy.savez`.
+    """
+
+    present = [vertex is not None for vertex in vertexes]
+    alive = [vertex for vertex in vertexes if vertex is not None]
+
+    initial_partition_block_id = np.zeros(len(vertexes), dtype=np.int64)
+    scc = np.full(len(vertexes), -1, dtype=np.int64)
+    sccs = {}
+    for vertex in alive:
+        initial_partition_block_id[
+            vertex.label
+        ] = vertex.initial_partition_block_id
+        if vertex.scc is not None:
+            scc[vertex.label] = vertex.scc.label
+            sccs[vertex.scc.label] = vertex.scc
+
+    # edges are numbered in the order of the images
+    edge_idx = {}
+    image_size = np.zeros(len(vertexes), dtype=np.int64)
+    destinations = []
+    count_group = []
+    counts = {}
+    count_value = []
+    for vertex in alive:
+        image_size[vertex.label] = len(vertex.image)
+        for edge in vertex.image:
+            edge_idx[id(edge)] = len(edge_idx)
+            destinations.append(edge.destination.label)
+            if edge.count is None:
+                count_group.append(-1)
+            else:
+                if id(edge.count) not in counts:
+                    counts[id(edge.count)] = len(counts)
+                    count_value.append(edge.count.value)
+                count_group.append(counts[id(edge.count)])
+
+    counterimage_size = np.zeros(len(vertexes), dtype=np.int64)
+    counterimage = []
+    for vertex in alive:
+        counterimage_size[vertex.label] = len(vertex.counterimage)
+        counterimage.extend(edge_idx[id(edge)] for edge in vertex.counterimage)
+
+    scc_label = np.array(list(sccs.keys()), dtype=np.int64)
+    scc_rank = np.array(
+        [float(scc_obj.rank) for scc_obj in sccs.values()], dtype=np.float64
+    )
+    scc_wf = np.array(
+        [bool(scc_obj._wf) for scc_obj in sccs.values()], dtype=bool
+    )
+
+    arrays = {
+        "present": np.array(present, dtype=bool),
+        "initial_partition_block_id": initial_partition_block_id,
+        "image_size": image_size,
+        "image": np.array(destinations, dtype=np.int64),
+        "counterimage_size": counterimage_size,
+        "counterimage": np.array(counterimage, dtype=np.int64),
+        "count_group": np.array(count_group, dtype=np.int64),
+        "count_value": np.array(count_value, dtype=np.int64),
+        "scc": scc,
+        "scc_label": scc_label,
+        "scc_rank": scc_rank,
+        "scc_wf": scc_wf,
+    }
+    if position is not None:
+        arrays["scc_position"] = np.array(
+            [position[label] for label in scc_label.tolist()], dtype=np.int64
+        )
+    return arrays
+
+
+def arrays_to_vertexes(
+    arrays: Dict[str, np.ndarray]
+) -> Tuple[List[_Vertex], Dict[int, int]]:
+    """Undo :func:`vertexes_to_arrays`.
+
+    :param arrays: A `dict` of arrays created by :func:`vertexes_to_arrays`
+        (or the object returned by :func:`numpy.load`).
+    :returns: The vertexes of the graph (`None` for the labels which do not
+        represent a vertex), and the position of each SCC (`None` if it was
+        not stored).
+    """
+
+    present = arrays["present"]
+    initial_partition_block_id = arrays["initial_partition_block_id"].tolist()
+
+    vertexes = [None] * len(present)
+    for label in np.flatnonzero(present).tolist():
+        vertex = _Vertex(label)
+        vertex.initial_partition_block_id = initial_partition_block_id[label]
+        vertexes[label] = vertex
+
+    sccs = {}
+    for label, rank, wf in zip(
+        arrays["scc_label"].tolist(),
+        arrays["scc_rank"].tolist(),
+        arrays["scc_wf"].tolist(),
+    ):
+        scc = _SCC(label)
+        scc._rank = rank if rank == float("-inf") else int(rank)
+        scc._wf = wf
+        sccs[label] = scc
+    for label, scc_label in enumerate(arrays["scc"].tolist()):
+        if scc_label != -1:
+            sccs[scc_label].add_vertex(vertexes[label])
+
+    image_size = arrays["image_size"]
+    sources = np.repeat(np.arange(len(present)), image_size)
+    edges = list(
+        map(
+            _Edge,
+            [vertexes[label] for label in sources.tolist()],
+            [vertexes[label] for label in arrays["image"].tolist()],
+        )
+    )
+
+    # each _Count is created by the first of its edges
+    count_group = arrays["count_group"]
+    groups, first_edge = np.unique(count_group, return_index=True)
+    first_edge = first_edge[groups != -1]
+    counts = [
+        _Count(vertexes[label]) for label in sources[first_edge].tolist()
+    ]
+    for count, value in zip(counts, arrays["count_value"].tolist()):
+        count.value = value
+    # edges without a _Count are in the group -1
+    counts.append(None)
+    for edge, group in zip(edges, count_group.tolist()):
+        edge.count = counts[group]
+
+    end = 0
+    for label, size in enumerate(image_size.tolist()):
+        if vertexes[label] is not None:
+            vertexes[label].image = edges[end:end + size]
+        end += size
+
+    counterimage = arrays["counterimage"].tolist()
+    end = 0
+    for label, size in enumerate(arrays["counterimage_size"].tolist()):
+        if vertexes[label] is not None:
+            vertexes[label].counterimage = [
+                edges[idx] for idx in counterimage[end:end + size]
+            ]
+        end += size
+
+    if "scc_position" in arrays:
+        position = dict(
+            zip(
+                arrays["scc_label"].tolist(), arrays["scc_position"].tolist()
+            )
+        )
+    else:
+        position = None
+    return (vertexes, position)
+
+
+def qblocks_to_arrays(qblocks: List[_QBlock]) -> Dict[str, np.ndarray]:
+    """Represent the given partition with arrays (the labels of the
+    vertexes of each block, in order).
+
+    :param qblocks: A partition.
+    :returns: A `dict` of arrays, which can be given to :func:`numpy.savez`.
+    """
+
+    return {
+        "block_size": np.fromiter(
+            (qblock.size for qblock in qblocks),
+            dtype=np.int64,
+            count=len(qblocks),
+        ),
+        "block_vertexes": np.fromiter(
+            (vertex.label for qblock in qblocks for vertex in qblock.vertexes),
+            dtype=np.int64,
+        ),
+    }
+
+
+def arrays_to_qblocks(
+    arrays: Dict[str, np.ndarray], vertexes: List[_Vertex]
+) -> List[_QBlock]:
+    """Undo :func:`qblocks_to_arrays`.
+
+    :param arrays: A `dict` of arrays created by :func:`qblocks_to_arrays`.
+    :param vertexes: The vertexes of the graph, indexed by label.
+    """
+
+    block_vertexes = arrays["block_vertexes"].tolist()
+    qblocks = []
+    end = 0
+    for size in arrays["block_size"].tolist():
+        qblocks.append(
+            _QBlock(
+                [vertexes[label] for label in block_vertexes[end:end + size]],
+                None,
+            )
+        )
+        end += size
+    return qblocks
+
+
+def save_partition(
+    path: str,
+    partition: Union[
+        Iterable[Iterable[Any]], np.ndarray, Tuple[np.ndarray, NodeIndex]
+    ],
+):
+    """Save a partition (for instance the result of
+    :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`) to a `.npz` file,
+    as an array which maps each node to the index of its block.
+
+    :param path: The path of the file.
+    :param partition: The partition, as a list of tuples of nodes or in the
+        format of the output `"labels"` (an array, or a tuple made of an
+        array and a :class:`bispy.utilities.graph_normalization.NodeIndex`).
+    """
+
+    nodes = None
+    if isinstance(partition, np.ndarray):
+        block = partition
+    elif (
+        isinstance(partition, tuple)
+        and len(partition) == 2
+        and isinstance(partition[0], np.ndarray)
+        and isinstance(partition[1], NodeIndex)
+    ):
+        block, node_index = partition
+        nodes = node_index.idx_to_node
+    else:
+        partition = [tuple(nodes_block) for nodes_block in partition]
+        all_nodes = [node for nodes_block in partition for node in nodes_block]
+        block = np.repeat(
+            np.arange(len(partition), dtype=np.int64),
+            [len(nodes_block) for nodes_block in partition],
+        )
+        if all(
+            isinstance(node, (int, np.integer)) for node in all_nodes
+        ) and sorted(all_nodes) == list(range(len(all_nodes))):
+            integer_block = np.empty(len(all_nodes), dtype=np.int64)
+            integer_block[np.array(all_nodes, dtype=np.int64)] = block
+            block = integer_block
+        else:
+            nodes = all_nodes
+
+    arrays = {"block": np.asarray(block)}
+    if nodes is not None:
+        arrays["nodes"] = nodes_to_array(nodes)
+    np.savez(path, **arrays)
+
+
+def load_partition(
+    path: str, output: str = "tuples"
+) -> Union[List[Tuple], np.ndarray, Tuple[np.ndarray, NodeIndex]]:
+    """Load a partition saved by :func:`save_partition`.
+
+    .. warning::
+        If the nodes are not integers they are unpickled, load only trusted
+        files.
+
+    :param path: The path of the file.
+    :param output: The format of the partition, `"tuples"` or `"labels"`
+        (see :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`). Defaults
+        to `"tuples"`.
+    """
+
+    check_output(output)
+    with np.load(path) as arrays:
+        block = arrays["block"]
+        node_index = None
+        if "nodes" in arrays:
+            node_index = NodeIndex(array_to_nodes(arrays["nodes"]))
+
+    if output == "labels":
+        return block if node_index is None else (block, node_index)
+    rscp = block_array_to_tuple_list(block)
+    if node_index is None:
+        return rscp
+    return node_index.to_original_partition(rscp)
@@ -0,0 +1,107 @@
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Union
+
+
+class Stats:
+    """Opt-in instrumentation of the algorithms of *BisPy*. An instance can
+    be passed as the argument `stats` of
+    :func:`bispy.paige_tarjan.paige_tarjan.paige_tarjan`,
+    :func:`bispy.dovier_piazza_policriti.dovier_piazza_policriti
+    .dovier_piazza_policriti` and :func:`bispy.saha.saha_partition.saha`,
+    and is filled during the computation with:
+
+    - `phase_time`: the wall time (seconds) spent in each phase of the
+      algorithm (for instance `"split"` or `"update_counts"` for
+      *Paige-Tarjan*);
+    - `rank_time`: the wall time spent in each phase for each rank (only for
+      *Dovier-Piazza-Policriti*);
+    - `counters`: counters like the number of refinement steps
+      (`"refine_iterations"`), the number of new blocks
+      (`"blocks_created"`) and the number of edges which enter the splitters
+      (`"edges_scanned"`);
+    - `splitter_sizes`: the size of each splitter, in order.
+
+    The algorithms only touch the instance if it is not `None`, therefore
+    the instrumentation costs nothing when it is disabled.
+
+        >>> stats = Stats()
+        >>> rscp = paige_tarjan(graph, stats=stats)
+        >>> stats.counters["refine_iterations"]
+        3
+
+    :param callback: A function called after each measured phase, with the
+        name of the phase, its wall time and its rank (`None` if the phase
+        is not associated with a rank). Defaults to `None`.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, float, Union[int, float]], Any] = None,
+    ):
+        self.callback = callback
+        self.phase_time: Dict[str, float] = {}
+        self.rank_time: Dict[Union[int, float], Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.splitter_sizes: List[int] = []
+
+    @staticmethod
+    def clock() -> float:
+        """The current time, to be passed to :meth:`record`."""
+        return perf_counter()
+
+    def record(
+        self, phase: str, start: float, rank: Union[int, float] = None
+    ) -> float:
+        """Add the time elapsed since `start` to the given phase.
+
+        :param phase: The name of the phase.
+        :param start: The time at which the phase started (see
+            :meth:`clock`).
+        :param rank: The rank processed by the phase. Defaults to `None`.
+        :returns: The current time, which can be used as the start of the
+            next phase.
+        """
+
+        now = perf_counter()
+        elapsed = now - start
+        self.phase_time[phase] = self.phase_time.get(phase, 0.0) + elapsed
+        if rank is not None:
+            rank_phases = self.rank_time.setdefault(rank, {})
+            rank_phases[phase] = rank_phases.get(phase, 0.0) + elapsed
+        if self.callback is not None:
+            self.callback(phase, elapsed, rank)
+        return now
+
+    def count(self, counter: str, value: int = 1):
+        """Increment the given counter.
+
+        :param counter: The name of the counter.
+        :param value: The increment. Defaults to 1.
+        """
+
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """A summary of the collected data which can be serialized as JSON
+        (ranks are converted to strings, and splitter sizes are summarized).
+        """
+
+        sizes = self.splitter_sizes
+        return {
+            "phase_time": dict(self.phase_time),
+            "rank_time": {
+                str(rank): dict(phases)
+                for rank, phases in self.rank_time.items()
+            },
+            "counters": dict(self.counters),
+            "splitter_sizes": {
+                "count": len(sizes),
+                "total": int(sum(sizes)),
+                "max": int(max(sizes)) if len(sizes) > 0 else 0,
+            },
+        }
+
+    def __repr__(self):
+        return "Stats(phase_time={}, counters={})".format(
+            self.phase_time, self.counters
+        )
@@ -50,5 +50,5 @@ setuptools.setup(
 
     license='MIT',
 
-    install_requires=['networkx', 'llist'],
+    install_requires=['networkx', 'numpy'],
 )
@@ -1,5 +1,8 @@
 import pytest
 from bispy.dovier_piazza_policriti.ranked_partition import RankedPartition
+from bispy.dovier_piazza_policriti import (
+    dovier_piazza_policriti as dpp_module,
+)
 from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
     build_block_counterimage,
     split_upper_ranks,
@@ -22,6 +25,9 @@ from bispy.utilities.graph_entities import (
     _QBlock as _Block,
 )
 from bispy.utilities.graph_decorator import decorate_nx_graph, to_set
+from bispy.utilities.stats import Stats
+from bispy.utilities.array_graph import block_array_to_tuple_list
+from tests.paige_tarjan.random_graphs import random_graph_partition
 
 
 # DPP = Dovier-Piazza-Policriti
@@ -115,6 +121,18 @@ def test_dpp_rscp_correctness(graph, initial_partition, expected_q_partition):
     )
 
 
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_dpp_edge_list(graph, initial_partition, expected_q_partition):
+    assert to_set(
+        dovier_piazza_policriti(
+            list(graph.edges), initial_partition, nvertexes=len(graph.nodes)
+        )
+    ) == to_set(paige_tarjan(graph, initial_partition))
+
+
 # this is for particular cases which aren't covered in PTA tests
 @pytest.mark.parametrize(
     "graph",
@@ -133,3 +151,67 @@ def test_dpp_correctness_all_scc_leaf_with_initial_partition():
     assert to_set(dovier_piazza_policriti(graph, [(0, 1), (2,)])) == set(
         [frozenset([0]), frozenset([1]), frozenset([2])]
     )
+
+
+# the nested PTA used to drop the predecessors in the upper ranks, and to
+# receive blocks made of leafs and non-leafs of the subgraph
+@pytest.mark.parametrize("seed", range(50))
+def test_dpp_same_as_pt_random(seed):
+    graph, initial_partition = random_graph_partition(seed)
+    assert to_set(dovier_piazza_policriti(graph, initial_partition)) == to_set(
+        paige_tarjan(graph, initial_partition)
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dpp_parallel(monkeypatch, seed):
+    monkeypatch.setattr(dpp_module, "_PARALLEL_LAYER_SIZE", 0)
+
+    graph, initial_partition = random_graph_partition(seed)
+    assert to_set(
+        dovier_piazza_policriti(graph, initial_partition, workers=2)
+    ) == to_set(paige_tarjan(graph, initial_partition))
+
+
+def test_dpp_parallel_uses_workers(monkeypatch):
+    monkeypatch.setattr(dpp_module, "_PARALLEL_LAYER_SIZE", 0)
+
+    # three disjoint cycles with a chord, two of them are bisimilar
+    initial_partition = [(0, 4, 8), (1, 2, 3, 5, 6, 7, 9, 10, 11, 12)]
+    edges = []
+    for start, size in [(0, 4), (4, 4), (8, 5)]:
+        edges.extend(
+            (start + i, start + (i + 1) % size) for i in range(size)
+        )
+        edges.append((start, start + 2))
+
+    stats = Stats()
+    rscp = dovier_piazza_policriti(
+        edges, initial_partition, nvertexes=13, workers=2, stats=stats
+    )
+    assert stats.counters["parallel_layers"] == 1
+    assert to_set(rscp) == to_set(
+        paige_tarjan(edges, initial_partition, nvertexes=13)
+    )
+    assert frozenset([0, 4]) in to_set(rscp)
+
+
+@pytest.mark.parametrize("max_depth", [None, 1])
+@pytest.mark.parametrize("seed", range(10))
+def test_dpp_output_labels(seed, max_depth):
+    graph, initial_partition = random_graph_partition(seed)
+    block = dovier_piazza_policriti(
+        graph, initial_partition, max_depth=max_depth, output="labels"
+    )
+    assert set(block.tolist()) == set(range(block.max() + 1))
+    assert to_set(block_array_to_tuple_list(block)) == to_set(
+        dovier_piazza_policriti(graph, initial_partition, max_depth=max_depth)
+    )
+
+
+def test_dpp_output_labels_non_integer():
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("d", "e")])
+    block, node_index = dovier_piazza_policriti(graph, output="labels")
+    assert to_set(
+        node_index.to_original_partition(block_array_to_tuple_list(block))
+    ) == to_set([("a", "d"), ("c",), ("b", "e")])
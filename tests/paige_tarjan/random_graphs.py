@@ -0,0 +1,19 @@
+import random
+import networkx as nx
+
+
+def random_graph_partition(seed):
+    rnd = random.Random(seed)
+    nvertexes = rnd.randint(1, 30)
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 3 * nvertexes)):
+        graph.add_edge(rnd.randrange(nvertexes), rnd.randrange(nvertexes))
+
+    labels = [rnd.randrange(3) for _ in range(nvertexes)]
+    initial_partition = [
+        tuple(v for v in range(nvertexes) if labels[v] == label)
+        for label in set(labels)
+    ]
+    return (graph, initial_partition)
@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
+from tests.paige_tarjan.random_graphs import random_graph_partition
+from bispy.paige_tarjan import array_paige_tarjan as array_pt_module
+from bispy.paige_tarjan.array_paige_tarjan import array_paige_tarjan
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.utilities.array_graph import (
+    as_array_graph,
+    array_graph_from_edges,
+)
+from bispy.utilities.graph_decorator import to_set
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_array_pt_correctness(graph, initial_partition, expected_q_partition):
+    s = paige_tarjan(graph, initial_partition, engine="array")
+    assert to_set(s) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize("small_step", [0, 2, 32])
+@pytest.mark.parametrize("seed", range(50))
+def test_array_pt_same_as_object_pt(monkeypatch, seed, small_step):
+    # small_step controls which steps are vectorized
+    monkeypatch.setattr(array_pt_module, "_SMALL_STEP", small_step)
+
+    graph, initial_partition = random_graph_partition(seed)
+    assert to_set(
+        paige_tarjan(graph, initial_partition, engine="array")
+    ) == to_set(paige_tarjan(graph, initial_partition))
+
+
+def test_array_pt_no_initial_partition():
+    graph = test_cases.build_full_graphs(10)
+    assert to_set(paige_tarjan(graph, engine="array")) == to_set(
+        paige_tarjan(graph)
+    )
+
+
+def test_array_pt_no_integer_nodes():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", 0, 1, 2, 3, frozenset("x")])
+    graph.add_edges_from([("a", 0), (0, 1), (1, 2), (2, 3)])
+    s = paige_tarjan(
+        graph, [["a", 0, 1, 2], [3, frozenset("x")]], engine="array"
+    )
+    assert set(s) == set([("a",), (0,), (1,), (2,), (3, frozenset("x"))])
+
+
+def test_array_pt_chain():
+    array_graph = array_graph_from_edges(
+        np.arange(99), np.arange(1, 100), 100
+    )
+    block = array_paige_tarjan(array_graph)
+    assert len(np.unique(block)) == 100
+
+
+def test_array_pt_block_numbering():
+    graph, initial_partition = random_graph_partition(3)
+    block = array_paige_tarjan(as_array_graph(graph, initial_partition))
+    assert set(block.tolist()) == set(range(block.max() + 1))
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_array_pt_counts(graph, initial_partition, expected_q_partition):
+    array_graph = as_array_graph(graph, initial_partition)
+    block = array_paige_tarjan(array_graph)
+
+    # at the end X = Q, therefore the slot of each edge holds
+    # count(source, block of the destination)
+    sources = array_graph.edge_sources()
+    for edge, slot in enumerate(array_graph.count_slot):
+        destination_block = block[array_graph.image[edge]]
+        assert array_graph.counts[slot] == np.count_nonzero(
+            block[array_graph.vertex_image(sources[edge])]
+            == destination_block
+        )
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        paige_tarjan(test_cases.build_full_graphs(3), engine="foo")
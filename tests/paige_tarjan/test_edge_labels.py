@@ -0,0 +1,100 @@
+import pytest
+import random
+import numpy as np
+import networkx as nx
+
+from bispy.paige_tarjan import array_paige_tarjan as array_pt_module
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.utilities.graph_decorator import to_set
+
+
+def random_labeled_graph_partition(seed):
+    rnd = random.Random(seed)
+    nvertexes = rnd.randint(1, 30)
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 3 * nvertexes)):
+        graph.add_edge(
+            rnd.randrange(nvertexes),
+            rnd.randrange(nvertexes),
+            action=rnd.choice(["a", "b", None]),
+        )
+
+    labels = [rnd.randrange(2) for _ in range(nvertexes)]
+    initial_partition = [
+        tuple(v for v in range(nvertexes) if labels[v] == label)
+        for label in set(labels)
+    ]
+    return (graph, initial_partition)
+
+
+def materialized_rscp(graph, initial_partition):
+    # each labeled edge becomes a node, in the block of its label
+    encoded = nx.DiGraph()
+    encoded.add_nodes_from(graph.nodes)
+    label_blocks = {}
+    for source, destination, label in graph.edges(data="action"):
+        edge_node = ("edge", source, destination)
+        encoded.add_edge(source, edge_node)
+        encoded.add_edge(edge_node, destination)
+        label_blocks.setdefault(label, []).append(edge_node)
+
+    rscp = paige_tarjan(
+        encoded, list(initial_partition) + list(label_blocks.values())
+    )
+    return [
+        block for block in rscp if not isinstance(block[0], tuple)
+    ]
+
+
+@pytest.mark.parametrize("engine", ["array", "signature"])
+@pytest.mark.parametrize("small_step", [0, 32])
+@pytest.mark.parametrize("seed", range(40))
+def test_edge_labels_same_as_materialized(
+    monkeypatch, seed, small_step, engine
+):
+    monkeypatch.setattr(array_pt_module, "_SMALL_STEP", small_step)
+
+    graph, initial_partition = random_labeled_graph_partition(seed)
+    assert to_set(
+        paige_tarjan(
+            graph, initial_partition, engine=engine, edge_labels="action"
+        )
+    ) == to_set(materialized_rscp(graph, initial_partition))
+
+
+@pytest.mark.parametrize("engine", ["array", "signature"])
+def test_edge_labels_edge_list(engine):
+    # 0 and 2 reach sinks through edges with different labels, 4 reaches a
+    # sink through two edges with different labels
+    edges = np.array([(0, 1), (2, 3), (4, 5), (4, 5)])
+    rscp = paige_tarjan(
+        edges,
+        nvertexes=7,
+        engine=engine,
+        edge_labels=["a", "b", "a", "b"],
+    )
+    assert to_set(rscp) == to_set([(0,), (2,), (4,), (1, 3, 5, 6)])
+
+
+def test_edge_labels_array():
+    graph = nx.DiGraph([(0, 1), (1, 2), (3, 4), (4, 5)])
+    rscp = paige_tarjan(graph, engine="array", edge_labels=[0, 1, 1, 1])
+    assert to_set(rscp) == to_set([(0,), (3,), (1, 4), (2, 5)])
+
+
+def test_edge_labels_k_bisimulation():
+    graph = nx.DiGraph()
+    graph.add_edge(0, 1, action="a")
+    graph.add_edge(1, 2, action="a")
+    graph.add_edge(3, 4, action="a")
+    graph.add_edge(4, 5, action="b")
+
+    rscp = paige_tarjan(graph, max_depth=1, edge_labels="action")
+    assert to_set(rscp) == to_set([(0, 1, 3), (4,), (2, 5)])
+
+
+def test_edge_labels_object_engine():
+    with pytest.raises(ValueError):
+        paige_tarjan(nx.DiGraph([(0, 1)]), edge_labels=["a"])
@@ -1,6 +1,6 @@
 import pytest
 import networkx as nx
-from llist import dllist, dllistnode
+import numpy as np
 import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
 import itertools
 from bispy.utilities.graph_normalization import (
@@ -19,6 +19,7 @@ from bispy.utilities.graph_entities import (
     _Edge,
     _QBlock,
     _XBlock,
+    _LinkedList,
 )
 from bispy.paige_tarjan.paige_tarjan import (
     split,
@@ -30,7 +31,8 @@ from bispy.paige_tarjan.paige_tarjan import (
     paige_tarjan_qblocks,
     preprocess_initial_partition,
 )
-from bispy.utilities.graph_decorator import decorate_nx_graph
+from bispy.utilities.graph_decorator import decorate_nx_graph, to_set
+from bispy.utilities.array_graph import block_array_to_tuple_list
 import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
 
 
@@ -79,7 +81,7 @@ def test_initialize_right_types(graph, initial_partition):
     _, q_partition = decorate_nx_graph(graph, initial_partition)
 
     for qblock in q_partition:
-        assert isinstance(qblock.vertexes, dllist)
+        assert isinstance(qblock.vertexes, _LinkedList)
 
     for qblock in q_partition:
         for vertex in qblock.vertexes:
@@ -151,9 +153,7 @@ def test_choose_qblock():
     # check if compound block has been modified properly
     assert compoundblock.qblocks.size == 2
 
-    compoundblock_qblocks = set()
-    for i in range(2):
-        compoundblock_qblocks.add(compoundblock.qblocks.nodeat(i).value)
+    compoundblock_qblocks = set(compoundblock.qblocks)
     assert compoundblock_qblocks == set([qblocks[0], qblocks[2]])
 
 
@@ -235,12 +235,11 @@ def test_can_remove_any_vertex_from_its_list(graph, initial_partition):
     vertexes, q_partition = decorate_nx_graph(graph, initial_partition)
 
     for qblock in q_partition:
-        vertex = qblock.vertexes.first
-        while vertex != None:
-            qblock.vertexes.remove(vertex)
-            vertex = vertex.next
+        for vertex in qblock.vertexes:
             # check that this doesn't raise an exception
-            assert True
+            qblock.vertexes.remove(vertex)
+        assert qblock.vertexes.size == 0
+        assert qblock.vertexes.first is None
 
 
 @pytest.mark.parametrize(
@@ -490,6 +489,23 @@ def test_pt_correctness(graph, initial_partition, expected_q_partition):
     )
 
 
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+@pytest.mark.parametrize("engine", ["object", "array", "signature"])
+def test_pt_edge_list(graph, initial_partition, expected_q_partition, engine):
+    s = paige_tarjan(
+        np.array(graph.edges, dtype=int).reshape(-1, 2),
+        initial_partition,
+        engine=engine,
+        nvertexes=len(graph.nodes),
+    )
+    assert set(frozenset(tp) for tp in s) == set(
+        frozenset(tp) for tp in expected_q_partition
+    )
+
+
 def test_pt_no_initial_partition():
     graph = test_cases.build_full_graphs(10)
     paige_tarjan(graph)
@@ -564,3 +580,49 @@ def test_simp():
     initial_partition = [(0,1)]
 
     x = paige_tarjan(graph, is_integer_graph=True)
+
+
+def block_array_to_set(block, node_index=None):
+    # the partition given by output="labels", blocks numbered without holes
+    assert set(block.tolist()) == set(range(block.max() + 1))
+    rscp = block_array_to_tuple_list(block)
+    if node_index is not None:
+        rscp = node_index.to_original_partition(rscp)
+    return to_set(rscp)
+
+
+@pytest.mark.parametrize("engine", ["object", "array", "signature"])
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_pt_output_labels(
+    graph, initial_partition, expected_q_partition, engine
+):
+    block = paige_tarjan(
+        graph, initial_partition, engine=engine, output="labels"
+    )
+    assert isinstance(block, np.ndarray)
+    assert block_array_to_set(block) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize("engine", ["object", "array"])
+def test_pt_output_labels_edge_list(engine):
+    edges = np.array([(0, 1), (0, 2), (1, 3), (2, 4)])
+    block = paige_tarjan(edges, nvertexes=6, engine=engine, output="labels")
+    assert block_array_to_set(block) == to_set([(3, 4, 5), (1, 2), (0,)])
+
+
+@pytest.mark.parametrize("engine", ["object", "array"])
+def test_pt_output_labels_non_integer(engine):
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("d", "e")])
+    block, node_index = paige_tarjan(graph, engine=engine, output="labels")
+    assert block[node_index.index("b")] == block[node_index.index("e")]
+    assert block_array_to_set(block, node_index) == to_set(
+        [("a", "d"), ("c",), ("b", "e")]
+    )
+
+
+def test_pt_unknown_output():
+    with pytest.raises(ValueError):
+        paige_tarjan(nx.DiGraph([(0, 1)]), output="sets")
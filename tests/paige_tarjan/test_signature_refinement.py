@@ -0,0 +1,183 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
+from bispy.paige_tarjan import signature_refinement as signature_module
+from bispy.paige_tarjan.signature_refinement import signature_refinement
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
+    dovier_piazza_policriti,
+)
+from bispy.utilities.array_graph import (
+    as_array_graph,
+    array_graph_from_edges,
+)
+from bispy.utilities.graph_decorator import to_set
+from bispy.utilities.stats import Stats
+from tests.paige_tarjan.random_graphs import random_graph_partition
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_signature_correctness(graph, initial_partition, expected_q_partition):
+    s = paige_tarjan(graph, initial_partition, engine="signature")
+    assert to_set(s) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_signature_same_as_object_pt(seed):
+    graph, initial_partition = random_graph_partition(seed)
+    assert to_set(
+        paige_tarjan(graph, initial_partition, engine="signature")
+    ) == to_set(paige_tarjan(graph, initial_partition))
+
+
+def test_signature_chain():
+    array_graph = array_graph_from_edges(
+        np.arange(99), np.arange(1, 100), 100
+    )
+    block = signature_refinement(array_graph)
+    assert len(np.unique(block)) == 100
+    assert set(block.tolist()) == set(range(100))
+
+
+def test_signature_hash_collision(monkeypatch):
+    # the first round hashes every set to the same value
+    mix = signature_module._mix
+    calls = []
+
+    def colliding_mix(values, salt):
+        calls.append(salt)
+        if len(calls) == 1:
+            return np.zeros(len(values), dtype=np.uint64)
+        return mix(values, salt)
+
+    monkeypatch.setattr(signature_module, "_mix", colliding_mix)
+
+    # 0 -> 1, 2 -> 3 and 1, 3 have different labels: {1} and {3} have the
+    # same size, only the hash tells them apart
+    array_graph = array_graph_from_edges(
+        np.array([0, 2]), np.array([1, 3]), 4, [(0, 2), (1,), (3,)]
+    )
+    block = signature_refinement(array_graph)
+    assert to_set(
+        tuple(np.flatnonzero(block == idx)) for idx in range(block.max() + 1)
+    ) == to_set([(0,), (1,), (2,), (3,)])
+    assert len(calls) > 2
+
+
+def test_signature_stats():
+    graph, initial_partition = random_graph_partition(7)
+    stats = Stats()
+    block = signature_refinement(
+        as_array_graph(graph, initial_partition), stats
+    )
+
+    assert stats.counters["refine_iterations"] >= 1
+    assert stats.counters["blocks_created"] == block.max() + 1 - len(
+        initial_partition
+    )
+    assert set(stats.phase_time) == set(
+        ["signature", "split", "check_stability"]
+    )
+
+
+def naive_k_bisimulation(graph, initial_partition, k):
+    block = {
+        vertex: idx
+        for idx, partition_block in enumerate(initial_partition)
+        for vertex in partition_block
+    }
+    for _ in range(k):
+        signature = {
+            vertex: (
+                block[vertex],
+                frozenset(block[successor] for successor in graph[vertex]),
+            )
+            for vertex in graph.nodes
+        }
+        ids = {}
+        block = {
+            vertex: ids.setdefault(signature[vertex], len(ids))
+            for vertex in graph.nodes
+        }
+    blocks = {}
+    for vertex in graph.nodes:
+        blocks.setdefault(block[vertex], []).append(vertex)
+    return [tuple(vertexes) for vertexes in blocks.values()]
+
+
+@pytest.mark.parametrize("max_depth", range(5))
+@pytest.mark.parametrize("seed", range(30))
+def test_k_bisimulation(seed, max_depth):
+    graph, initial_partition = random_graph_partition(seed)
+    expected = to_set(
+        naive_k_bisimulation(graph, initial_partition, max_depth)
+    )
+
+    assert (
+        to_set(paige_tarjan(graph, initial_partition, max_depth=max_depth))
+        == expected
+    )
+    assert (
+        to_set(
+            dovier_piazza_policriti(
+                graph, initial_partition, max_depth=max_depth
+            )
+        )
+        == expected
+    )
+
+
+def test_k_bisimulation_deep():
+    # a tree, whose leaves have different labels, under a long chain
+    tree = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    graph = nx.disjoint_union(
+        nx.path_graph(50, create_using=nx.DiGraph), tree
+    )
+    graph.add_edge(49, 50)
+    initial_partition = [tuple(range(57)), tuple(range(57, 65))]
+
+    for max_depth in [1, 3, 10, 60]:
+        assert to_set(
+            paige_tarjan(graph, initial_partition, max_depth=max_depth)
+        ) == to_set(
+            naive_k_bisimulation(graph, initial_partition, max_depth)
+        )
+    assert to_set(
+        paige_tarjan(graph, initial_partition, max_depth=60)
+    ) == to_set(paige_tarjan(graph, initial_partition))
+
+
+def test_k_bisimulation_hash_collision(monkeypatch):
+    # the first round hashes every set to the same value
+    mix = signature_module._mix
+    calls = []
+
+    def colliding_mix(values, salt):
+        calls.append(salt)
+        if len(calls) == 1:
+            return np.zeros(len(values), dtype=np.uint64)
+        return mix(values, salt)
+
+    monkeypatch.setattr(signature_module, "_mix", colliding_mix)
+
+    # 0 -> 1 -> 4, 2 -> 3 -> 5: 0 and 2 are 0-bisimilar, not 1-bisimilar
+    array_graph = array_graph_from_edges(
+        np.array([0, 1, 2, 3]),
+        np.array([1, 4, 3, 5]),
+        6,
+        [(0, 2), (1,), (3,), (4, 5)],
+    )
+    block = signature_refinement(array_graph, max_depth=1)
+    assert to_set(
+        tuple(np.flatnonzero(block == idx)) for idx in range(block.max() + 1)
+    ) == to_set([(0,), (2,), (1,), (3,), (4, 5)])
+
+
+def test_k_bisimulation_negative_depth():
+    with pytest.raises(ValueError):
+        paige_tarjan(nx.DiGraph([(0, 1)]), max_depth=-1)
@@ -105,3 +105,14 @@ def test_kosaraju_unvisits():
 
     for v in vertexes:
         assert not v.visited
+
+
+def test_scc_long_cycle():
+    # deeper than the default recursion limit
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(5000))
+    graph.add_edges_from((i, (i + 1) % 5000) for i in range(5000))
+
+    vertexes, _ = decorate_nx_graph(graph)
+    assert len(kosaraju(vertexes, return_sccs=True)) == 1
+    assert len(kosaraju(vertexes[0], return_sccs=True)) == 1
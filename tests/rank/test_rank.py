@@ -1,8 +1,14 @@
+import sys
 import pytest
+import numpy as np
 import networkx as nx
 
+from bispy.utilities import rank_computation
 from bispy.utilities.rank_computation import (
     compute_rank,
+    compute_rank_from_edges,
+    condensation_rank,
+    strongly_connected_components,
 )
 from bispy.utilities.graph_decorator import (
     decorate_nx_graph,
@@ -74,3 +80,110 @@ def test_rank_clears_visited():
 
     for vx in vertexes:
         assert not vx.visited
+
+
+def test_rank_deep_chain():
+    # deeper than the default recursion limit
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(5000))
+    graph.add_edges_from((i, i + 1) for i in range(4999))
+    vertexes, _ = decorate_nx_graph(graph)
+
+    for vx in vertexes:
+        assert vx.rank == 4999 - vx.label
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_decorate_rank_same_as_compute_rank(seed):
+    graph = nx.gnm_random_graph(40, 60, directed=True, seed=seed)
+    graph.add_edges_from([(seed, seed), (seed + 1, seed + 2)])
+
+    vertexes, _ = decorate_nx_graph(graph)
+    sccs = set(
+        frozenset(vx.label for vx in vx.scc._vertexes) for vx in vertexes
+    )
+    ranks = [vx.rank for vx in vertexes]
+    wf = [vx.wf for vx in vertexes]
+
+    # SCCs computed with Kosaraju's algorithm
+    for vx in vertexes:
+        vx.scc = None
+    compute_rank(vertexes)
+    assert sccs == set(
+        frozenset(vx.label for vx in vx.scc._vertexes) for vx in vertexes
+    )
+    assert ranks == [vx.rank for vx in vertexes]
+    assert wf == [vx.wf for vx in vertexes]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_decorate_images_sorted(seed):
+    graph = nx.gnm_random_graph(40, 80, directed=True, seed=seed)
+    vertexes, _ = decorate_nx_graph(graph)
+
+    # SCCs are labeled in a topological order of G^{-1} by
+    # compute_rank_from_edges
+    for vx in vertexes:
+        labels = [edge.destination.scc.label for edge in vx.image]
+        assert labels == sorted(labels)
+
+
+@pytest.mark.parametrize("min_layer_size", [0, 3, 32])
+@pytest.mark.parametrize("seed", range(10))
+def test_compute_rank_from_edges(monkeypatch, seed, min_layer_size):
+    monkeypatch.setattr(
+        rank_computation, "_MIN_LAYER_SIZE", min_layer_size
+    )
+
+    graph = nx.gnm_random_graph(40, 60, directed=True, seed=seed)
+    graph.add_edges_from([(seed, seed), (seed + 1, seed + 2)])
+    vertexes, _ = decorate_nx_graph(graph, compute_rank=False)
+    compute_rank(vertexes)
+    expected = [(vx.rank, vx.wf) for vx in vertexes]
+
+    for vx in vertexes:
+        vx.scc = None
+    edges = np.array(graph.edges)
+    scc_label = compute_rank_from_edges(vertexes, edges[:, 0], edges[:, 1])
+    assert [(vx.rank, vx.wf) for vx in vertexes] == expected
+    assert np.all(scc_label[edges[:, 1]] <= scc_label[edges[:, 0]])
+
+
+def test_condensation_rank_small_layer_then_wide_layers():
+    # 10 layers of 100 vertexes above a single sink
+    layers = np.arange(1000).reshape(10, 100)
+    sources = np.concatenate([layers[1:].ravel(), layers[0]])
+    destinations = np.concatenate([layers[:-1].ravel(), np.full(100, 1000)])
+
+    rank, wf, layer_index = condensation_rank(
+        sources, destinations, np.arange(1001)
+    )
+
+    assert np.all(wf)
+    assert rank[1000] == 0
+    assert np.all(rank[layers] == np.arange(1, 11)[:, None])
+    # only the sink is visited alone, the other layers are vectorized
+    assert len(np.unique(layer_index)) == 11
+    assert np.all(layer_index[layers] == np.arange(1, 11)[:, None])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_strongly_connected_components_without_scipy(monkeypatch, seed):
+    graph = nx.gnm_random_graph(40, 60, directed=True, seed=seed)
+    edges = np.array(graph.edges)
+    scc = strongly_connected_components(edges[:, 0], edges[:, 1], 40)
+
+    monkeypatch.setitem(sys.modules, "scipy.sparse.csgraph", None)
+    fallback_scc = strongly_connected_components(
+        edges[:, 0], edges[:, 1], 40
+    )
+
+    expected = set(
+        frozenset(component)
+        for component in nx.strongly_connected_components(graph)
+    )
+    for labels in [scc, fallback_scc]:
+        assert expected == set(
+            frozenset(np.flatnonzero(labels == label).tolist())
+            for label in np.unique(labels)
+        )
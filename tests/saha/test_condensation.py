@@ -0,0 +1,193 @@
+import pytest
+import random
+import networkx as nx
+
+from bispy.saha.condensation import Condensation
+from bispy.saha.saha import add_edge
+from bispy.utilities.graph_decorator import decorate_nx_graph
+
+
+def random_graph(rnd):
+    nvertexes = rnd.randint(1, 15)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 2 * nvertexes)):
+        graph.add_edge(rnd.randrange(nvertexes), rnd.randrange(nvertexes))
+    return graph
+
+
+def check_condensation(condensation, vertexes, graph):
+    expected_vertexes, _ = decorate_nx_graph(graph)
+
+    for vx, expected_vx in zip(vertexes, expected_vertexes):
+        assert vx.rank == expected_vx.rank
+        assert vx.wf == expected_vx.wf
+
+        for other, expected_other in zip(vertexes, expected_vertexes):
+            assert (vx.scc is other.scc) == (
+                expected_vx.scc is expected_other.scc
+            )
+
+    # the order of SCCs is a topological order of G^{-1}
+    for vx in vertexes:
+        for edge in vx.image:
+            if edge.destination.scc is not vx.scc:
+                assert condensation.position(vx.scc) > condensation.position(
+                    edge.destination.scc
+                )
+                assert edge.destination.scc.label in vx.scc._image
+                assert vx.scc.label in edge.destination.scc._counterimage
+
+    assert condensation.max_rank == max(vx.rank for vx in expected_vertexes)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_add_edge(seed):
+    rnd = random.Random(seed)
+    graph = random_graph(rnd)
+    nvertexes = len(graph.nodes)
+
+    vertexes, _ = decorate_nx_graph(graph)
+    condensation = Condensation(vertexes)
+    check_condensation(condensation, vertexes, graph)
+
+    for _ in range(rnd.randint(1, 2 * nvertexes)):
+        source, destination = rnd.randrange(nvertexes), rnd.randrange(
+            nvertexes
+        )
+        if graph.has_edge(source, destination):
+            continue
+
+        # the new edge closes a cycle iff destination reaches source
+        closes_cycle = nx.has_path(graph, destination, source)
+
+        graph.add_edge(source, destination)
+        add_edge(vertexes[source], vertexes[destination])
+        assert (
+            condensation.add_edge(vertexes[source], vertexes[destination])
+            == closes_cycle
+        )
+        check_condensation(condensation, vertexes, graph)
+
+
+def test_merge_long_cycle():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(100))
+    graph.add_edges_from((i, i + 1) for i in range(99))
+
+    vertexes, _ = decorate_nx_graph(graph)
+    condensation = Condensation(vertexes)
+    assert condensation.max_rank == 99
+
+    graph.add_edge(99, 0)
+    add_edge(vertexes[99], vertexes[0])
+    assert condensation.add_edge(vertexes[99], vertexes[0])
+
+    assert len(vertexes[0].scc._vertexes) == 100
+    assert condensation.max_rank == float("-inf")
+    check_condensation(condensation, vertexes, graph)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_add_remove_edge(seed):
+    rnd = random.Random(seed)
+    graph = random_graph(rnd)
+    nvertexes = len(graph.nodes)
+
+    vertexes, _ = decorate_nx_graph(graph)
+    condensation = Condensation(vertexes)
+
+    for _ in range(3 * nvertexes):
+        if rnd.random() < 0.5 and graph.number_of_edges() > 0:
+            source, destination = rnd.choice(list(graph.edges))
+            graph.remove_edge(source, destination)
+
+            edge = next(
+                edge
+                for edge in vertexes[source].image
+                if edge.destination is vertexes[destination]
+            )
+            vertexes[source].image.remove(edge)
+            vertexes[destination].counterimage.remove(edge)
+            condensation.remove_edge(vertexes[source], vertexes[destination])
+        else:
+            source = rnd.randrange(nvertexes)
+            destination = rnd.randrange(nvertexes)
+            if graph.has_edge(source, destination):
+                continue
+            graph.add_edge(source, destination)
+            add_edge(vertexes[source], vertexes[destination])
+            condensation.add_edge(vertexes[source], vertexes[destination])
+
+        check_condensation(condensation, vertexes, graph)
+
+
+def test_split_long_cycle():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(100))
+    graph.add_edges_from((i, (i + 1) % 100) for i in range(100))
+
+    vertexes, _ = decorate_nx_graph(graph)
+    condensation = Condensation(vertexes)
+    assert condensation.max_rank == float("-inf")
+
+    graph.remove_edge(99, 0)
+    vertexes[99].image.clear()
+    vertexes[0].counterimage.clear()
+    condensation.remove_edge(vertexes[99], vertexes[0])
+
+    assert condensation.max_rank == 99
+    check_condensation(condensation, vertexes, graph)
+
+
+def remove_edge(condensation, vertexes, source, destination):
+    edge = next(
+        edge
+        for edge in vertexes[source].image
+        if edge.destination is vertexes[destination]
+    )
+    vertexes[source].image.remove(edge)
+    vertexes[destination].counterimage.remove(edge)
+    condensation.remove_edge(vertexes[source], vertexes[destination])
+
+
+def test_split_keeps_other_positions():
+    graph = nx.DiGraph()
+    graph.add_edges_from((i, i + 1) for i in range(9))
+    graph.add_edge(5, 4)
+
+    vertexes, _ = decorate_nx_graph(graph)
+    condensation = Condensation(vertexes)
+    positions = {
+        vx.label: condensation.position(vx.scc)
+        for vx in vertexes
+        if vx.label not in (4, 5)
+    }
+
+    graph.remove_edge(5, 4)
+    remove_edge(condensation, vertexes, 5, 4)
+
+    check_condensation(condensation, vertexes, graph)
+    assert positions == {
+        vx.label: condensation.position(vx.scc)
+        for vx in vertexes
+        if vx.label not in (4, 5)
+    }
+
+
+def test_split_without_room():
+    graph = nx.DiGraph()
+    graph.add_edges_from([(0, 1), (1, 2), (2, 1), (2, 3)])
+
+    vertexes, _ = decorate_nx_graph(graph)
+    # consecutive positions, there's no room for a new SCC
+    position = {
+        vertexes[3].scc.label: 0,
+        vertexes[1].scc.label: 1,
+        vertexes[0].scc.label: 2,
+    }
+    condensation = Condensation(vertexes, position)
+
+    graph.remove_edge(2, 1)
+    remove_edge(condensation, vertexes, 2, 1)
+    check_condensation(condensation, vertexes, graph)
@@ -8,14 +8,9 @@ from bispy.dovier_piazza_policriti.ranked_partition import RankedPartition
 from bispy.dovier_piazza_policriti.dovier_piazza_policriti import (
     build_block_counterimage,
 )
-from bispy.utilities.rank_computation import (
-    scc_finishing_time_list,
-)
 from bispy.saha.saha import (
     is_in_image,
     add_edge,
-    propagate_wf,
-    propagate_nwf,
     check_new_scc,
     exists_causal_splitter,
     both_blocks_go_or_dont_go_to_block,
@@ -23,7 +18,6 @@ from bispy.saha.saha import (
     recursive_merge,
     merge_phase,
     merge_split_phase,
-    build_well_founded_topological_list,
     saha,
 )
 from tests.rank.rank_test_cases import graphs
@@ -44,7 +38,6 @@ from bispy.paige_tarjan.paige_tarjan import paige_tarjan_qblocks, paige_tarjan
 from bispy.utilities.graph_entities import _Edge, _XBlock
 from bispy.saha.ranked_pta import pta as ranked_pta
 from itertools import chain, product
-from bispy.utilities.kosaraju import kosaraju
 
 
 def test_is_in_image():
@@ -85,26 +78,6 @@ def test_add_edge():
     assert edge2.count.value == 1
 
 
-def test_propagate_wf():
-    graph = nx.DiGraph()
-    graph.add_nodes_from(range(5))
-    graph.add_edges_from([(0, 1), (1, 2), (2, 3)])
-
-    vertexes, qblocks = decorate_nx_graph(graph, [(0,), (1,), (2,), (3, 4)])
-    max_rank = max(map(lambda vx: vx.rank, vertexes))
-
-    # be careful: for build_well_founded_topological vertexes in the same
-    # block have to be of the same rank
-    topo = build_well_founded_topological_list(qblocks, vertexes[3], max_rank)
-
-    add_edge(vertexes[3], vertexes[4])
-
-    propagate_wf(vertexes[3], topo, vertexes)
-
-    for idx in range(5):
-        assert vertexes[idx].rank == 4 - idx
-
-
 @pytest.mark.parametrize(
     "graph, new_edge, value",
     zip(new_scc_graphs, new_scc_new_edge, new_scc_correct_value),
@@ -331,37 +304,6 @@ def test_recursive_merge():
     assert vertexes[0].qblock != vertexes[1].qblock
 
 
-def test_update_rank():
-    g = nx.DiGraph()
-    g.add_nodes_from(range(5))
-    g.add_edges_from([(0, 1), (1, 0), (2, 3), (3, 1)])
-
-    vertexes, _ = decorate_nx_graph(g)
-
-    # now split
-    vertexes[2].qblock._mitosis([2], [3])
-
-    # and then add a new vertex
-    new_edge = _Edge(vertexes[3], vertexes[4])
-    vertexes[3].add_to_image(new_edge)
-    vertexes[4].add_to_counterimage(new_edge)
-
-    # update rank
-    vertexes[3].scc._rank = 1
-
-    sccs = kosaraju(vertexes[3], return_sccs=True)
-    for scc in sccs:
-        scc.compute_image()
-    scc_finishing_time = scc_finishing_time_list(sccs)
-    propagate_nwf(vertexes[3].scc, scc_finishing_time)
-
-    assert vertexes[0].rank == float("-inf")
-    assert vertexes[1].rank == float("-inf")
-    assert vertexes[2].rank == 1
-    assert vertexes[3].rank == 1
-    assert vertexes[4].rank == 0
-
-
 def test_merge_phase():
     g = nx.DiGraph()
     g.add_nodes_from(range(5))
@@ -379,9 +321,9 @@ def test_merge_phase():
     vertexes[3].add_to_image(new_edge)
     vertexes[4].add_to_counterimage(new_edge)
 
-    # update rank
+    # update rank (the new edge does not change the rank of the other
+    # vertexes)
     vertexes[3].rank = 1
-    propagate_nwf(vertexes[3].scc, kosaraju(vertexes, return_sccs=True))
 
     merge_phase(vertexes[3].qblock, vertexes[4].qblock)
 
@@ -459,33 +401,6 @@ def test_merge_split_resets_visited_triedmerge_qblocks():
     assert all([not block.tried_merge for block in qpartition])
 
 
-def test_well_founded_topological():
-    g = nx.DiGraph()
-    g.add_nodes_from(range(8))
-    g.add_edges_from([(0, 1), (1, 2), (3, 4), (4, 5), (6, 7), (7, 6)])
-
-    partition = [(0, 3), (1, 4), (2, 5), (6, 7)]
-
-    vertexes, _ = decorate_nx_graph(g, partition)
-
-    max_rank = max(map(lambda vx: vx.rank, vertexes))
-
-    qpartition = [block for ls in RankedPartition(vertexes) for block in ls]
-
-    topo = build_well_founded_topological_list(
-        qpartition, vertexes[5], max_rank
-    )
-
-    assert len(topo) == 6
-
-    last_rank = None
-    for vx in topo:
-        assert vx.wf
-        if last_rank is not None:
-            assert last_rank <= vx.rank
-        last_rank = vx.rank
-
-
 def all_possible_new_edges(graph, initial_partition):
     for source, dest in product(graph.nodes, graph.nodes):
         if not (source, dest) in graph.edges:
@@ -656,3 +571,42 @@ def test_reverse_incremental_update_rscp_correctness(
         qblocks_as_int = ints_to_set(qblocks_as_int)
 
         assert qblocks_as_int == rscp
+
+
+def build_chain(n):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from((i, i + 1) for i in range(n - 1))
+    return graph
+
+
+# the following tests use graphs deeper than the default recursion limit
+
+
+def test_check_new_scc_deep_chain():
+    vertexes, _ = decorate_nx_graph(build_chain(5000))
+    add_edge(vertexes[4999], vertexes[0])
+
+    finishing_time_list = []
+    assert check_new_scc(vertexes[4999], vertexes[0], finishing_time_list)
+    assert len(finishing_time_list) == 5000
+    assert finishing_time_list[-1] == vertexes[4999]
+    assert not any(vx.visited for vx in vertexes)
+
+
+def test_recursive_merge_deep_chains():
+    # two chains whose i-th vertexes are in different blocks
+    g = nx.DiGraph()
+    g.add_nodes_from(range(6000))
+    g.add_edges_from((i, i + 1) for i in range(2999))
+    g.add_edges_from((i, i + 1) for i in range(3000, 5999))
+
+    partition = [(i, 3000 + i) for i in range(3000)]
+    vertexes, _ = decorate_nx_graph(g, partition)
+    for i in range(3000):
+        vertexes[i].qblock._mitosis([i], [3000 + i])
+
+    recursive_merge(vertexes[2999].qblock, vertexes[5999].qblock)
+
+    for i in range(3000):
+        assert vertexes[i].qblock == vertexes[3000 + i].qblock
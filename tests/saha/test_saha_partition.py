@@ -1,6 +1,8 @@
 import pytest
+import random
 from bispy.saha.saha import saha
 from bispy.saha.saha_partition import saha as saha_partition
+from bispy.saha.saha_partition import SahaPartition
 from .saha_test_cases import (
     update_rscp_graphs,
     update_rscp_initial_partition,
@@ -10,6 +12,7 @@ from bispy.utilities.graph_decorator import to_set, to_tuple_list
 from itertools import chain
 import networkx as nx
 from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+from bispy.utilities.array_graph import block_array_to_tuple_list
 
 
 @pytest.mark.parametrize(
@@ -55,3 +58,319 @@ def test_graph_normalization():
     partition = saha_partition(graph)
 
     assert set(map(frozenset, partition.add_edge(('nodo2', 'nodo3')))) == set([frozenset(nodes)])
+
+
+def test_edge_list():
+    partition = saha_partition([(0, 1), (2, 0)], nvertexes=4)
+
+    assert to_set(partition.add_edge((1, 2))) == set([frozenset(range(3)), frozenset([3])])
+
+
+@pytest.mark.parametrize("rerun_threshold", [0, 1000])
+@pytest.mark.parametrize(
+    "goal_graph, initial_partition",
+    chain(
+        [(tp[0], tp[1]) for tp in graph_partition_rscp_tuples],
+        zip(
+            update_rscp_graphs,
+            update_rscp_initial_partition,
+        ),
+    ),
+)
+def test_add_edges(goal_graph, initial_partition, rerun_threshold):
+    initial_graph = nx.DiGraph()
+    initial_graph.add_nodes_from(goal_graph.nodes)
+
+    partition = saha_partition(initial_graph, initial_partition)
+
+    edges = list(goal_graph.edges)
+    for batch in [edges[: len(edges) // 2], edges[len(edges) // 2 :]]:
+        rscp = partition.add_edges(batch, rerun_threshold=rerun_threshold)
+
+    assert to_set(rscp) == set(
+        map(
+            frozenset,
+            paige_tarjan(goal_graph, initial_partition, is_integer_graph=True),
+        )
+    )
+
+
+def test_add_edges_normalization():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", "b", "c", "d"])
+
+    partition = saha_partition(graph, [("a", "b", "c"), ("d",)])
+    rscp = partition.add_edges(
+        [("a", "b"), ("c", "d"), ("a", "b")], rerun_threshold=0
+    )
+
+    assert set(map(frozenset, rscp)) == set(
+        [frozenset(["a"]), frozenset(["b"]), frozenset(["c"]),
+         frozenset(["d"])]
+    )
+    # the duplicate edge was added once
+    assert len(partition.vertexes[0].image) == 1
+
+
+@pytest.mark.parametrize("rerun_threshold", [0, 100])
+def test_add_existing_edges(rerun_threshold):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(4))
+    graph.add_edges_from([(0, 1), (1, 2), (3, 2)])
+
+    partition = saha_partition(graph, [(0, 1, 2, 3)])
+    partition.add_edges(
+        [(0, 1), (3, 2), (0, 2), (3, 1)], rerun_threshold=rerun_threshold
+    )
+    # existing edges are not added again
+    assert len(partition.vertexes[0].image) == 2
+    assert len(partition.vertexes[3].image) == 2
+
+    rscp = partition.remove_edge((0, 1))
+    graph.add_edges_from([(0, 2), (3, 1)])
+    graph.remove_edge(0, 1)
+    assert to_set(rscp) == to_set(paige_tarjan(graph, [(0, 1, 2, 3)]))
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition",
+    chain(
+        [(tp[0], tp[1]) for tp in graph_partition_rscp_tuples],
+        zip(
+            update_rscp_graphs,
+            update_rscp_initial_partition,
+        ),
+    ),
+)
+def test_remove_edge(graph, initial_partition):
+    graph = graph.copy()
+    partition = saha_partition(graph, initial_partition)
+
+    for edge in list(graph.edges):
+        graph.remove_edge(*edge)
+
+        rscp = partition.remove_edge(edge)
+        assert to_set(rscp) == set(
+            map(
+                frozenset,
+                paige_tarjan(graph, initial_partition, is_integer_graph=True),
+            )
+        )
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_remove_edges(seed):
+    rnd = random.Random(seed)
+    nvertexes = rnd.randint(1, 15)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 3 * nvertexes)):
+        graph.add_edge(rnd.randrange(nvertexes), rnd.randrange(nvertexes))
+    initial_partition = [
+        tuple(range(0, nvertexes, 2)),
+        tuple(range(1, nvertexes, 2)),
+    ]
+    initial_partition = [block for block in initial_partition if block]
+
+    partition = saha_partition(graph, initial_partition)
+    while graph.number_of_edges() > 0:
+        edges = rnd.sample(
+            list(graph.edges), min(3, graph.number_of_edges())
+        )
+        graph.remove_edges_from(edges)
+
+        rscp = partition.remove_edges(edges)
+        assert to_set(rscp) == to_set(paige_tarjan(graph, initial_partition))
+
+        # the count of each edge is |E(source) & block of the destination|
+        for vertex in partition.vertexes:
+            for edge in vertex.image:
+                assert edge.count.value == sum(
+                    1
+                    for other in vertex.image
+                    if other.destination.qblock is edge.destination.qblock
+                )
+
+
+def test_remove_edge_normalization():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", "b", "c"])
+    graph.add_edges_from([("a", "b"), ("b", "c")])
+
+    partition = saha_partition(graph)
+    rscp = partition.remove_edge(("b", "c"))
+    assert set(map(frozenset, rscp)) == set(
+        [frozenset(["a"]), frozenset(["b", "c"])]
+    )
+
+
+def test_remove_missing_edge():
+    partition = saha_partition([(0, 1), (1, 2)], nvertexes=3)
+    with pytest.raises(ValueError):
+        partition.remove_edges([(0, 1), (0, 2)])
+
+    # the graph was not modified
+    assert to_set(partition.remove_edge((1, 2))) == set(
+        [frozenset([0]), frozenset([1, 2])]
+    )
+
+
+def test_add_node():
+    partition = saha_partition([(0, 1)], nvertexes=2)
+    rscp = partition.add_node(2)
+    assert to_set(rscp) == set([frozenset([0]), frozenset([1, 2])])
+
+    # a new block of the labeling set
+    rscp = partition.add_node(3, label_block=1)
+    assert to_set(rscp) == set(
+        [frozenset([0]), frozenset([1, 2]), frozenset([3])]
+    )
+
+    rscp = partition.add_edges([(3, 2)], rerun_threshold=0)
+    assert to_set(rscp) == set(
+        [frozenset([0]), frozenset([1, 2]), frozenset([3])]
+    )
+
+
+def test_add_existing_node():
+    partition = saha_partition([(0, 1)], nvertexes=2)
+    with pytest.raises(ValueError):
+        partition.add_node(1)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_remove_node(seed):
+    rnd = random.Random(seed)
+    nvertexes = rnd.randint(2, 15)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 3 * nvertexes)):
+        graph.add_edge(rnd.randrange(nvertexes), rnd.randrange(nvertexes))
+
+    partition = saha_partition(graph)
+    for node in rnd.sample(range(nvertexes), nvertexes // 2):
+        graph.remove_node(node)
+        rscp = partition.remove_node(node)
+        assert to_set(rscp) == to_set(paige_tarjan(graph))
+
+    # labels are reused, and the new nodes are placed with the sinks
+    for _ in range(nvertexes // 2):
+        node = max(graph.nodes) + 1
+        graph.add_node(node)
+        rscp = partition.add_node(node)
+        assert to_set(rscp) == to_set(paige_tarjan(graph))
+    assert len(partition.vertexes) == nvertexes
+
+    edges = [
+        (rnd.choice(list(graph.nodes)), rnd.choice(list(graph.nodes)))
+        for _ in range(5)
+    ]
+    graph.add_edges_from(edges)
+    rscp = partition.add_edges(edges, rerun_threshold=0)
+    assert to_set(rscp) == to_set(paige_tarjan(graph))
+
+
+def test_add_remove_node_normalization():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", "b", "c"])
+    graph.add_edges_from([("a", "b"), ("b", "c")])
+
+    partition = saha_partition(graph)
+    rscp = partition.remove_node("b")
+    assert set(map(frozenset, rscp)) == set([frozenset(["a", "c"])])
+
+    rscp = partition.add_node("d")
+    assert set(map(frozenset, rscp)) == set([frozenset(["a", "c", "d"])])
+    assert partition.node_to_idx["d"] == 1
+
+    with pytest.raises(ValueError):
+        partition.remove_node("b")
+
+
+def test_output_labels():
+    graph = nx.balanced_tree(2, 2, create_using=nx.DiGraph)
+    partition = saha_partition(graph, output="labels")
+
+    block = partition.add_edge((1, 0))
+    graph.add_edge(1, 0)
+    assert to_set(block_array_to_tuple_list(block)) == to_set(
+        paige_tarjan(graph)
+    )
+
+    block = partition.remove_node(6)
+    assert block[6] == -1
+    assert block[3] == block[4] == block[5]
+
+
+def test_output_labels_non_integer():
+    graph = nx.DiGraph([("a", "b"), ("b", "c")])
+    partition = saha_partition(graph, output="labels")
+    block, node_index = partition.add_edge(("c", "a"))
+    assert len(set(block.tolist())) == 1
+    assert node_index.index("c") == partition.node_to_idx["c"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_save_load(tmp_path, seed):
+    rnd = random.Random(seed)
+    nvertexes = rnd.randint(2, 15)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    for _ in range(rnd.randint(0, 3 * nvertexes)):
+        graph.add_edge(rnd.randrange(nvertexes), rnd.randrange(nvertexes))
+
+    partition = saha_partition(graph)
+    partition.remove_node(rnd.randrange(nvertexes))
+    partition.save(tmp_path / "partition.npz")
+    loaded = SahaPartition.load(tmp_path / "partition.npz")
+
+    assert to_set(loaded._maximum_bisimulation()) == to_set(
+        partition._maximum_bisimulation()
+    )
+    for vertex, loaded_vertex in zip(partition.vertexes, loaded.vertexes):
+        if vertex is None:
+            assert loaded_vertex is None
+            continue
+        assert loaded_vertex.rank == vertex.rank
+        assert loaded_vertex.wf == vertex.wf
+        assert [edge.destination.label for edge in loaded_vertex.image] == [
+            edge.destination.label for edge in vertex.image
+        ]
+        assert [edge.count.value for edge in loaded_vertex.image] == [
+            edge.count.value for edge in vertex.image
+        ]
+
+    # the updates go on from the loaded state
+    nodes = [node for node in graph.nodes if partition._contains(node)]
+    for _ in range(5):
+        edge = (rnd.choice(nodes), rnd.choice(nodes))
+        if rnd.random() < 0.5 and len(loaded.vertexes[edge[0]].image) > 0:
+            edge = (
+                edge[0],
+                loaded.vertexes[edge[0]].image[0].destination.label,
+            )
+            assert to_set(loaded.remove_edge(edge)) == to_set(
+                partition.remove_edge(edge)
+            )
+        elif not any(
+            e.destination.label == edge[1]
+            for e in loaded.vertexes[edge[0]].image
+        ):
+            assert to_set(loaded.add_edge(edge)) == to_set(
+                partition.add_edge(edge)
+            )
+    assert to_set(loaded.add_node(nvertexes)) == to_set(
+        partition.add_node(nvertexes)
+    )
+
+
+def test_save_load_normalization(tmp_path):
+    graph = nx.DiGraph([("a", "b"), ("b", "c")])
+    partition = saha_partition(graph, output="labels")
+    partition.save(tmp_path / "partition.npz")
+
+    loaded = SahaPartition.load(tmp_path / "partition.npz")
+    assert loaded.output == "labels"
+    block, node_index = loaded.add_edge(("c", "a"))
+    assert len(set(block.tolist())) == 1
+    assert node_index.index("c") == 2
@@ -0,0 +1,186 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+from bispy.utilities.array_graph import (
+    as_array_graph,
+    array_graph_from_edges,
+    partition_to_block_array,
+    block_array_to_tuple_list,
+    weakly_connected_components,
+    well_founded_rank,
+)
+from bispy.utilities.graph_decorator import decorate_nx_graph
+from tests.paige_tarjan.paige_tarjan_test_cases import (
+    graph_partition_rscp_tuples,
+)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_adjacency(graph, initial_partition, expected_q_partition):
+    array_graph = as_array_graph(graph, initial_partition)
+
+    assert array_graph.nvertexes == len(graph.nodes)
+    assert array_graph.nedges == len(graph.edges)
+
+    for vertex in graph.nodes:
+        assert sorted(array_graph.vertex_image(vertex)) == sorted(
+            graph.successors(vertex)
+        )
+        assert sorted(array_graph.vertex_counterimage(vertex)) == sorted(
+            graph.predecessors(vertex)
+        )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_counterimage_edge(graph, initial_partition, expected_q_partition):
+    array_graph = as_array_graph(graph, initial_partition)
+    sources = array_graph.edge_sources()
+
+    # each position of the counterimage refers to an edge with the same source
+    # whose destination is the owner of that portion of the counterimage
+    for vertex in graph.nodes:
+        start = array_graph.counterimage_offsets[vertex]
+        end = array_graph.counterimage_offsets[vertex + 1]
+        edges = array_graph.counterimage_edge[start:end]
+
+        assert all(array_graph.image[edges] == vertex)
+        assert all(
+            sources[edges] == array_graph.counterimage[start:end]
+        )
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_initial_counts(graph, initial_partition, expected_q_partition):
+    array_graph = as_array_graph(graph, initial_partition)
+
+    for vertex in graph.nodes:
+        start = array_graph.image_offsets[vertex]
+        end = array_graph.image_offsets[vertex + 1]
+
+        assert all(array_graph.count_slot[start:end] == vertex)
+        assert array_graph.counts[vertex] == graph.out_degree(vertex)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_block_array(graph, initial_partition, expected_q_partition):
+    block = as_array_graph(graph, initial_partition).block
+
+    for idx, ip_block in enumerate(initial_partition):
+        assert all(block[list(ip_block)] == idx)
+
+
+def test_trivial_partition_block_array():
+    assert all(partition_to_block_array(None, 5) == 0)
+
+
+def test_from_edges_keeps_isolated_vertexes():
+    array_graph = array_graph_from_edges(
+        np.array([0, 0, 3]), np.array([1, 3, 0]), 6
+    )
+
+    assert list(array_graph.out_degree()) == [2, 0, 0, 1, 0, 0]
+    assert list(array_graph.in_degree()) == [1, 1, 0, 1, 0, 0]
+
+
+def test_image_edges():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(4))
+    graph.add_edges_from([(0, 1), (0, 2), (2, 3), (3, 0)])
+    array_graph = as_array_graph(graph)
+
+    edges = array_graph.image_edges(np.array([0, 3]))
+    assert sorted(array_graph.image[edges]) == [0, 1, 2]
+
+
+def test_block_array_to_tuple_list():
+    assert block_array_to_tuple_list(np.array([1, 0, 1, 2, 0])) == [
+        (1, 4),
+        (0, 2),
+        (3,),
+    ]
+    assert block_array_to_tuple_list(np.array([], dtype=int)) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_weakly_connected_components(seed):
+    rng = np.random.default_rng(seed)
+    nvertexes = int(rng.integers(1, 200))
+    nedges = int(rng.integers(0, nvertexes))
+    sources = rng.integers(0, nvertexes, nedges)
+    destinations = rng.integers(0, nvertexes, nedges)
+
+    component = weakly_connected_components(sources, destinations, nvertexes)
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    graph.add_edges_from(zip(sources.tolist(), destinations.tolist()))
+    expected = set(
+        frozenset(c) for c in nx.weakly_connected_components(graph)
+    )
+    assert set(
+        frozenset(np.flatnonzero(component == idx).tolist())
+        for idx in range(component.max() + 1)
+    ) == expected
+
+
+def test_weakly_connected_components_chain():
+    nvertexes = 1000
+    component = weakly_connected_components(
+        np.arange(nvertexes - 1), np.arange(1, nvertexes), nvertexes + 2
+    )
+    assert list(np.unique(component)) == [0, 1, 2]
+    assert all(component[:nvertexes] == 0)
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    graph_partition_rscp_tuples,
+)
+def test_well_founded_rank(graph, initial_partition, expected_q_partition):
+    rank = well_founded_rank(as_array_graph(graph, initial_partition))
+
+    vertexes, _ = decorate_nx_graph(graph, initial_partition)
+    for vertex in vertexes:
+        if vertex.wf:
+            assert rank[vertex.label] == vertex.rank
+        else:
+            assert rank[vertex.label] == -1
+
+
+def test_well_founded_rank_max_rank():
+    # a chain with a self loop in the middle, and a chain
+    graph = array_graph_from_edges(
+        np.array([0, 1, 1, 3, 4]), np.array([1, 2, 1, 4, 5]), 6
+    )
+    assert list(well_founded_rank(graph)) == [-1, -1, 0, 2, 1, 0]
+    assert list(well_founded_rank(graph, 1)) == [-1, -1, 0, -1, 1, 0]
+
+
+def test_labeled_initial_counts():
+    # 0 has two edges with label 1 and one edge with label 0
+    graph = array_graph_from_edges(
+        np.array([0, 0, 0, 1]),
+        np.array([1, 2, 3, 2]),
+        4,
+        labels=np.array([1, 0, 1, 1]),
+    )
+    assert graph.nlabels == 2
+
+    sources = graph.edge_sources()
+    for edge, slot in enumerate(graph.count_slot):
+        assert graph.counts[slot] == np.count_nonzero(
+            (sources == sources[edge]) & (graph.label == graph.label[edge])
+        )
@@ -0,0 +1,101 @@
+import json
+import pytest
+import networkx as nx
+
+from bispy.benchmarks import graph_generators
+from bispy.benchmarks.benchmark import (
+    FAMILIES,
+    ALGORITHMS,
+    benchmark,
+    measure,
+)
+from bispy.benchmarks.__main__ import main
+from bispy.paige_tarjan.paige_tarjan import paige_tarjan
+
+
+def to_nx(edges, nvertexes):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nvertexes))
+    graph.add_edges_from(edges.tolist())
+    return graph
+
+
+@pytest.mark.parametrize("family", FAMILIES.keys())
+def test_families_are_reproducible(family):
+    edges1, nvertexes1, partition1 = FAMILIES[family](0.01, 3)
+    edges2, nvertexes2, partition2 = FAMILIES[family](0.01, 3)
+    assert (edges1 == edges2).all()
+    assert nvertexes1 == nvertexes2 and partition1 == partition2
+
+    assert edges1.min() >= 0 and edges1.max() < nvertexes1
+    assert len(set(map(tuple, edges1.tolist()))) == len(edges1)
+
+
+def test_generators():
+    edges, nvertexes, _ = graph_generators.chain(10)
+    assert len(paige_tarjan(edges, nvertexes=nvertexes)) == 10
+
+    edges, nvertexes, _ = graph_generators.balanced_tree(2, 3)
+    assert len(paige_tarjan(edges, nvertexes=nvertexes)) == 4
+
+    edges, nvertexes, _ = graph_generators.random_dag(50, 200, seed=1)
+    assert nx.is_directed_acyclic_graph(to_nx(edges, nvertexes))
+
+    edges, nvertexes, _ = graph_generators.dense_cyclic(30, seed=1)
+    assert nx.is_strongly_connected(to_nx(edges, nvertexes))
+
+    edges, nvertexes, _ = graph_generators.many_sccs(20, 4, seed=1)
+    sccs = list(nx.strongly_connected_components(to_nx(edges, nvertexes)))
+    assert len(sccs) == 20 and all(len(scc) == 4 for scc in sccs)
+
+    _, nvertexes, partition = graph_generators.labeled_random_graph(
+        100, 50, 10, seed=1
+    )
+    assert sorted(v for block in partition for v in block) == list(
+        range(100)
+    )
+    assert len(partition) <= 10
+
+
+def test_measure():
+    result = measure(lambda size: bytearray(size), setup=lambda: 10 ** 6)
+    assert result["wall_time"] >= 0
+    assert result["peak_memory"] >= 10 ** 6
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS.keys())
+def test_benchmark(algorithm):
+    result = benchmark("random_dag", algorithm, scale=0.01, repeat=2)
+    assert "error" not in result
+    assert result["edges_per_second"] > 0
+
+
+def test_unknown_benchmark():
+    with pytest.raises(ValueError):
+        benchmark("foo", "paige_tarjan")
+    with pytest.raises(ValueError):
+        benchmark("chain", "foo")
+
+
+def test_main(tmp_path):
+    output = tmp_path / "results.json"
+    main(
+        [
+            "--family",
+            "chain",
+            "--family",
+            "many_sccs",
+            "--algorithm",
+            "paige_tarjan",
+            "--scale",
+            "0.01",
+            "--output",
+            str(output),
+        ]
+    )
+    with open(output) as f:
+        report = json.load(f)
+    assert [result["family"] for result in report["results"]] == [
+        "chain",
+        "many_sccs",
+    ]
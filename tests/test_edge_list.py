@@ -0,0 +1,153 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+from bispy.utilities.edge_list import (
+    is_edge_list,
+    edge_list_to_arrays,
+    edge_labels_to_array,
+    graph_edge_labels,
+    labeled_edge_list_to_arrays,
+)
+from bispy.utilities.graph_decorator import (
+    decorate_edge_list,
+    decorate_nx_graph,
+)
+
+
+def test_is_edge_list():
+    assert is_edge_list([(0, 1)])
+    assert is_edge_list(np.array([[0, 1]]))
+    assert not is_edge_list(nx.DiGraph())
+    assert not is_edge_list(5)
+
+
+@pytest.mark.parametrize(
+    "edges",
+    [
+        [(0, 1), (2, 1), (1, 3)],
+        ((0, 1), (2, 1), (1, 3)),
+        np.array([[0, 1], [2, 1], [1, 3]]),
+        np.array([[0, 1], [2, 1], [1, 3]], dtype=np.uint8),
+    ],
+)
+def test_edge_list_to_arrays(edges):
+    sources, destinations, nvertexes = edge_list_to_arrays(edges)
+
+    assert nvertexes == 4
+    assert set(zip(sources.tolist(), destinations.tolist())) == set(
+        [(0, 1), (2, 1), (1, 3)]
+    )
+
+
+def test_edge_list_removes_duplicates():
+    sources, destinations, _ = edge_list_to_arrays([(0, 1), (1, 0), (0, 1)])
+    assert sorted(zip(sources.tolist(), destinations.tolist())) == [
+        (0, 1),
+        (1, 0),
+    ]
+
+
+def test_edge_list_nvertexes():
+    assert edge_list_to_arrays([(0, 1)], 10)[2] == 10
+    assert edge_list_to_arrays([], 3)[2] == 3
+    assert edge_list_to_arrays([])[2] == 0
+
+
+@pytest.mark.parametrize(
+    "edges, nvertexes",
+    [
+        ([(0, 1, 2)], None),
+        ([(0, 1)], 1),
+        ([(0, -1)], None),
+        ([(0.5, 1)], None),
+    ],
+)
+def test_edge_list_invalid(edges, nvertexes):
+    with pytest.raises(ValueError):
+        edge_list_to_arrays(edges, nvertexes)
+
+
+def test_sparse_adjacency():
+    sparse = pytest.importorskip("scipy.sparse")
+
+    adjacency = sparse.csr_matrix(
+        (np.array([1, 1, 0]), (np.array([0, 2, 3]), np.array([1, 1, 0]))),
+        shape=(5, 5),
+    )
+    sources, destinations, nvertexes = edge_list_to_arrays(adjacency)
+
+    assert nvertexes == 5
+    # explicit zeros are not edges
+    assert sorted(zip(sources.tolist(), destinations.tolist())) == [
+        (0, 1),
+        (2, 1),
+    ]
+
+    with pytest.raises(ValueError):
+        edge_list_to_arrays(adjacency, 6)
+    with pytest.raises(ValueError):
+        edge_list_to_arrays(sparse.csr_matrix((2, 3)))
+
+
+def test_decorate_edge_list():
+    edges = [(0, 1), (1, 2), (2, 1), (3, 0)]
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(5))
+    graph.add_edges_from(edges)
+
+    vertexes, qblocks = decorate_edge_list(edges, 5, [(0, 1, 2), (3, 4)])
+    nx_vertexes, nx_qblocks = decorate_nx_graph(graph, [(0, 1, 2), (3, 4)])
+
+    assert len(vertexes) == 5
+    for vertex, nx_vertex in zip(vertexes, nx_vertexes):
+        assert vertex.rank == nx_vertex.rank
+        assert sorted(edge.destination.label for edge in vertex.image) == (
+            sorted(edge.destination.label for edge in nx_vertex.image)
+        )
+    assert len(qblocks) == len(nx_qblocks)
+
+
+@pytest.mark.parametrize(
+    "edge_labels",
+    [
+        ["b", "a", "b"],
+        [None, "a", None],
+        np.array([7, 3, 7]),
+        [(1,), 2, (1,)],
+    ],
+)
+def test_edge_labels_to_array(edge_labels):
+    labels = edge_labels_to_array(edge_labels)
+    assert sorted(set(labels.tolist())) == [0, 1]
+    assert labels[0] == labels[2] != labels[1]
+
+
+def test_labeled_edge_list_to_arrays():
+    # the same edge with two labels, and a duplicate
+    sources, destinations, labels, nvertexes = labeled_edge_list_to_arrays(
+        [(0, 1), (0, 1), (1, 2), (0, 1)], ["a", "b", "a", "a"]
+    )
+    assert nvertexes == 3
+    assert set(
+        zip(sources.tolist(), destinations.tolist(), labels.tolist())
+    ) == set([(0, 1, 0), (0, 1, 1), (1, 2, 0)])
+    assert len(sources) == 3
+
+    with pytest.raises(ValueError):
+        labeled_edge_list_to_arrays([(0, 1)], ["a", "b"])
+
+    # a string is not a sequence of labels
+    with pytest.raises(TypeError):
+        labeled_edge_list_to_arrays([(0, 1), (1, 2)], "ab")
+
+
+def test_graph_edge_labels():
+    graph = nx.DiGraph()
+    graph.add_edge(0, 1, action="a")
+    graph.add_edge(1, 2)
+    graph.add_edge(2, 0, action="a")
+
+    labels = graph_edge_labels(graph, "action")
+    assert labels[0] == labels[2] != labels[1]
+    assert list(graph_edge_labels(graph, [5, 5, 6])) == [0, 0, 1]
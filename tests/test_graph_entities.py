@@ -1,6 +1,15 @@
 import pytest
 import networkx as nx
-from bispy.utilities.graph_entities import _Vertex, _QBlock
+from bispy.utilities.graph_entities import (
+    _Vertex,
+    _Edge,
+    _QBlock,
+    _XBlock,
+    _Count,
+    _SCC,
+    _LinkedList,
+)
+from bispy.utilities.graph_decorator import decorate_nx_graph
 
 def test_fast_mitosis():
     vxs = list(map(_Vertex, range(10)))
@@ -14,3 +23,88 @@ def test_fast_mitosis():
     for v in qb2.vertexes:
         assert v.label == 2 or v.label == 3
     assert qb2.vertexes.size == 2
+
+
+def test_linked_list_remove_while_iterating():
+    vxs = list(map(_Vertex, range(6)))
+    qb = _QBlock(vxs, None)
+
+    for v in qb.vertexes:
+        if v.label % 2 == 0:
+            qb.remove_vertex(v)
+
+    assert [v.label for v in qb.vertexes] == [1, 3, 5]
+    assert qb.size == 3
+    assert qb.vertexes.first is vxs[1] and qb.vertexes.last is vxs[5]
+
+
+def test_merge_moves_vertexes():
+    vxs = list(map(_Vertex, range(5)))
+    qb1 = _QBlock(vxs[:2], None)
+    qb2 = _QBlock(vxs[2:], None)
+
+    qb1.merge(qb2)
+
+    assert [v.label for v in qb1.vertexes] == [0, 1, 2, 3, 4]
+    assert all(v.qblock is qb1 for v in vxs)
+    assert qb2.size == 0 and len(qb2.vertexes) == 0
+    assert qb2.deteached
+
+
+def test_xblock_qblocks_list():
+    qblocks = [_QBlock([_Vertex(i)], None) for i in range(3)]
+    xb = _XBlock()
+    for qb in qblocks:
+        xb.append_qblock(qb)
+
+    xb.remove_qblock(qblocks[1])
+
+    assert isinstance(xb.qblocks, _LinkedList)
+    assert list(xb.qblocks) == [qblocks[0], qblocks[2]]
+    assert xb.size == 2
+    assert qblocks[1].xblock is None
+
+
+def test_no_instance_dict():
+    vertex = _Vertex(0)
+    entities = [
+        vertex,
+        _Edge(vertex, vertex),
+        _QBlock([vertex], _XBlock()),
+        _XBlock(),
+        _Count(vertex),
+        _SCC(0),
+    ]
+    for entity in entities:
+        assert not hasattr(entity, "__dict__")
+
+
+def test_restrict_to_subgraph():
+    vertexes, _ = decorate_nx_graph(
+        nx.DiGraph([(0, 1), (0, 2), (3, 0)]), compute_rank=False
+    )
+    vertex = vertexes[0]
+    count = vertex.image[0].count
+
+    vertex.restrict_to_subgraph(lambda v: v.label != 2)
+    assert [edge.destination.label for edge in vertex.image] == [1]
+    assert vertex.image[0].count.value == 1
+    assert len(vertex.counterimage) == 1
+
+    vertex.back_to_original_graph()
+    assert len(vertex.image) == 2
+    assert all(edge.count is count for edge in vertex.image)
+
+    vertex.restrict_to_subgraph(lambda v: v.label != 3, keep_original=False)
+    assert len(vertex.counterimage) == 0
+    with pytest.raises(TypeError):
+        vertex.back_to_original_graph()
+
+
+def test_scc_adjacency_released_after_rank():
+    vertexes, _ = decorate_nx_graph(nx.DiGraph([(0, 1), (1, 2), (2, 1)]))
+    assert [vertex.rank for vertex in vertexes] == [float("-inf")] * 3
+    assert [vertex.wf for vertex in vertexes] == [False] * 3
+    for vertex in vertexes:
+        assert vertex.scc._image is None
+        assert len(vertex.scc.image) == 0
@@ -5,7 +5,9 @@ from bispy.utilities.graph_normalization import (
     check_normal_integer_graph,
     convert_to_integer_graph,
     back_to_original,
+    NodeIndex,
 )
+from bispy import paige_tarjan, dovier_piazza_policriti, saha
 
 
 def test_integer_graph():
@@ -69,3 +71,66 @@ def test_back_to_original():
         frozenset(tp)
         for tp in back_to_original(integer_partition, node_to_idx)
     ) == set(frozenset(tp) for tp in partition)
+
+
+def test_node_index():
+    nodes = [0, 1, 2, "a", "b", frozenset([5])]
+    node_index = NodeIndex(nodes)
+
+    assert len(node_index) == len(nodes)
+    assert "a" in node_index and "c" not in node_index
+    for node in nodes:
+        assert node_index.node(node_index.index(node)) == node
+
+    assert list(node_index.integer_edges([("a", 0), (2, "b")])) == [
+        (3, 0),
+        (2, 4),
+    ]
+
+    partition = [("a", "b"), (0, 1, 2), (frozenset([5]),)]
+    integer_partition = node_index.to_integer_partition(partition)
+    assert node_index.to_original_partition(integer_partition) == partition
+    assert back_to_original(integer_partition, node_index) == partition
+    assert node_index.to_integer_partition(None) is None
+
+
+def test_node_index_add_remove():
+    node_index = NodeIndex(["a", "b"])
+    assert node_index.remove("a") == 0
+    assert "a" not in node_index
+
+    with pytest.raises(ValueError):
+        node_index.add("c", 1)
+    node_index.add("c", 0)
+    node_index.add("d", 2)
+    assert [node_index.index(node) for node in "bcd"] == [1, 0, 2]
+    with pytest.raises(ValueError):
+        node_index.add("d", 3)
+
+
+def non_integer_graph():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["a", "b", "c", "d", "e"])
+    graph.add_edges_from([("a", "b"), ("c", "d")])
+    return graph
+
+
+@pytest.mark.parametrize(
+    "algorithm",
+    [
+        paige_tarjan,
+        lambda *args: paige_tarjan(*args, engine="array"),
+        dovier_piazza_policriti,
+    ],
+)
+def test_non_integer_graph(algorithm):
+    rscp = algorithm(non_integer_graph(), [("a", "c", "e"), ("b", "d")])
+    assert set(frozenset(block) for block in rscp) == set(
+        [frozenset(["a", "c"]), frozenset(["e"]), frozenset(["b", "d"])]
+    )
+
+
+def test_non_integer_graph_saha():
+    saha_partition = saha(non_integer_graph(), [("a", "c", "e"), ("b", "d")])
+    rscp = saha_partition.add_edge(("d", "b"))
+    assert set(rscp) == set([("a",), ("b",), ("c",), ("d",), ("e",)])
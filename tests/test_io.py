@@ -0,0 +1,108 @@
+import gzip
+import pytest
+import networkx as nx
+
+from bispy.io import (
+    read_edge_list,
+    read_adjlist,
+    iter_edge_list_chunks,
+)
+from bispy import paige_tarjan
+from bispy.utilities.graph_decorator import to_set
+
+
+def read_graph(edges, node_index):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(node_index.idx_to_node)
+    graph.add_edges_from(
+        (node_index.node(source), node_index.node(destination))
+        for source, destination in edges.tolist()
+    )
+    return graph
+
+
+def random_graph(seed):
+    graph = nx.gnm_random_graph(20, 50, directed=True, seed=seed)
+    graph.add_node(100)
+    return graph
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("threaded", [False, True])
+@pytest.mark.parametrize("chunk_bytes", [1, 30, None])
+def test_read_edge_list(tmp_path, seed, threaded, chunk_bytes):
+    graph = random_graph(seed)
+    graph.remove_node(100)
+    nx.write_edgelist(graph, tmp_path / "graph.edges", data=True)
+
+    edges, node_index = read_edge_list(
+        tmp_path / "graph.edges",
+        nodetype=int,
+        threaded=threaded,
+        chunk_bytes=chunk_bytes,
+    )
+    assert len(node_index) == len(graph.nodes)
+    assert set(read_graph(edges, node_index).edges) == set(graph.edges)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("chunk_bytes", [1, 30, None])
+def test_read_adjlist(tmp_path, seed, chunk_bytes):
+    graph = random_graph(seed)
+    nx.write_adjlist(graph, tmp_path / "graph.adj")
+
+    edges, node_index = read_adjlist(
+        tmp_path / "graph.adj", nodetype=int, chunk_bytes=chunk_bytes
+    )
+    result = read_graph(edges, node_index)
+    assert set(result.nodes) == set(graph.nodes)
+    assert set(result.edges) == set(graph.edges)
+
+
+def test_read_csv_gzip(tmp_path):
+    with gzip.open(tmp_path / "graph.csv.gz", "wt") as file:
+        file.write("# source,destination\n")
+        file.write("a, b\nc,d # comment\n\nd,e,label\n")
+
+    edges, node_index = read_edge_list(
+        tmp_path / "graph.csv.gz", delimiter=","
+    )
+    assert set(read_graph(edges, node_index).edges) == set(
+        [("a", "b"), ("c", "d"), ("d", "e")]
+    )
+
+    rscp = paige_tarjan(edges, nvertexes=len(node_index))
+    assert to_set(node_index.to_original_partition(rscp)) == to_set(
+        [("a", "d"), ("c",), ("b", "e")]
+    )
+
+
+def test_read_edge_list_bad_line(tmp_path):
+    with open(tmp_path / "graph.edges", "w") as file:
+        file.write("0 1 2\n3\n")
+
+    with pytest.raises(ValueError):
+        read_edge_list(tmp_path / "graph.edges")
+    with pytest.raises(ValueError):
+        read_edge_list(tmp_path / "graph.edges", threaded=True)
+
+
+def test_read_edge_list_empty(tmp_path):
+    with open(tmp_path / "graph.edges", "w") as file:
+        file.write("# nothing\n")
+
+    edges, node_index = read_edge_list(tmp_path / "graph.edges")
+    assert edges.shape == (0, 2)
+    assert len(node_index) == 0
+
+
+def test_iter_edge_list_chunks(tmp_path):
+    with open(tmp_path / "graph.edges", "w") as file:
+        file.write("0 1\n1 2\n2 0\n")
+
+    chunks = list(
+        iter_edge_list_chunks(tmp_path / "graph.edges", chunk_bytes=1)
+    )
+    assert len(chunks) == 3
+    for nodes, edges in chunks:
+        assert edges.shape == (1, 2)
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+
+from bispy.utilities import memmap_graph as memmap_module
+from bispy.utilities.memmap_graph import (
+    memmap_array_graph,
+    write_binary_edge_list,
+)
+from bispy.utilities.array_graph import array_graph_from_edges
+from bispy.paige_tarjan.array_paige_tarjan import array_paige_tarjan
+from bispy.utilities.graph_decorator import to_set
+from bispy.utilities.array_graph import block_array_to_tuple_list
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+@pytest.mark.parametrize("seed", range(5))
+def test_memmap_array_graph(tmp_path, monkeypatch, seed, chunk_size):
+    monkeypatch.setattr(memmap_module, "_CHUNK_SIZE", chunk_size)
+
+    rng = np.random.default_rng(seed)
+    nvertexes = int(rng.integers(1, 30))
+    nedges = int(rng.integers(0, 3 * nvertexes))
+    sources = rng.integers(0, nvertexes, nedges)
+    destinations = rng.integers(0, nvertexes, nedges)
+    initial_partition = [
+        tuple(range(0, nvertexes, 2)),
+        tuple(range(1, nvertexes, 2)),
+    ]
+
+    write_binary_edge_list(tmp_path / "edges.bin", sources, destinations)
+    graph = memmap_array_graph(
+        tmp_path / "edges.bin", nvertexes, initial_partition
+    )
+
+    order = np.lexsort((destinations, sources))
+    expected = array_graph_from_edges(
+        sources[order], destinations[order], nvertexes, initial_partition
+    )
+    for attribute in [
+        "image_offsets",
+        "image",
+        "counterimage_offsets",
+        "counterimage",
+        "counterimage_edge",
+        "count_slot",
+        "counts",
+    ]:
+        assert np.array_equal(
+            getattr(graph, attribute), getattr(expected, attribute)
+        )
+
+    assert to_set(block_array_to_tuple_list(array_paige_tarjan(graph))) == (
+        to_set(block_array_to_tuple_list(array_paige_tarjan(expected)))
+    )
+
+
+def test_memmap_array_graph_nvertexes(tmp_path):
+    write_binary_edge_list(tmp_path / "edges.bin", [0, 3], [1, 2])
+    graph = memmap_array_graph(tmp_path / "edges.bin")
+    assert graph.nvertexes == 4
+
+    with pytest.raises(ValueError):
+        memmap_array_graph(tmp_path / "edges.bin", nvertexes=3)
+
+
+def test_memmap_array_graph_cache_dir(tmp_path):
+    write_binary_edge_list(tmp_path / "edges.bin", [0, 1], [1, 2])
+    (tmp_path / "cache").mkdir()
+    memmap_array_graph(tmp_path / "edges.bin", cache_dir=tmp_path / "cache")
+    assert (tmp_path / "cache" / "edges.bin.counterimage.npy").exists()
+
+
+def test_memmap_array_graph_not_sorted(tmp_path):
+    np.array([(1, 0), (0, 1)], dtype=np.int32).tofile(tmp_path / "edges.bin")
+    with pytest.raises(ValueError):
+        memmap_array_graph(tmp_path / "edges.bin")
+
+
+def test_memmap_array_graph_empty(tmp_path):
+    write_binary_edge_list(tmp_path / "edges.bin", [], [])
+    graph = memmap_array_graph(tmp_path / "edges.bin", nvertexes=3)
+    assert graph.nedges == 0
+    assert len(np.unique(array_paige_tarjan(graph))) == 1
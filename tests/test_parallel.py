@@ -0,0 +1,119 @@
+import pytest
+import functools
+import numpy as np
+import networkx as nx
+
+import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
+from bispy import paige_tarjan, dovier_piazza_policriti
+from bispy.parallel import (
+    assign_components,
+    bisimulation_by_components,
+    coarsen_union,
+)
+from bispy.utilities.graph_decorator import to_set
+from bispy.utilities.array_graph import block_array_to_tuple_list
+from tests.paige_tarjan.random_graphs import random_graph_partition
+
+
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_bisimulation_by_components_single_process(
+    graph, initial_partition, expected_q_partition
+):
+    rscp = bisimulation_by_components(graph, initial_partition, workers=1)
+    assert to_set(rscp) == to_set(expected_q_partition)
+
+
+@pytest.mark.parametrize(
+    "algorithm",
+    [
+        paige_tarjan,
+        dovier_piazza_policriti,
+        functools.partial(paige_tarjan, engine="array"),
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_bisimulation_by_components(algorithm, seed):
+    graph, initial_partition = random_graph_partition(seed)
+    # more components
+    graph = nx.disjoint_union(graph, graph)
+    initial_partition = [
+        block + tuple(vertex + len(graph.nodes) // 2 for vertex in block)
+        for block in initial_partition
+    ]
+
+    rscp = bisimulation_by_components(
+        graph, initial_partition, algorithm=algorithm, workers=2
+    )
+    assert to_set(rscp) == to_set(paige_tarjan(graph, initial_partition))
+
+
+def test_bisimulation_by_components_merges_shards():
+    # four copies of the same tree, and a chain
+    tree = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    graph = nx.disjoint_union_all(
+        [tree, tree, tree, tree, nx.path_graph(4, create_using=nx.DiGraph)]
+    )
+
+    rscp = bisimulation_by_components(graph, workers=3)
+    assert to_set(rscp) == to_set(paige_tarjan(graph))
+    # the vertexes at the same height are bisimilar, even in the chain
+    assert len(rscp) == 4
+
+
+def test_bisimulation_by_components_edge_list():
+    edges = np.array([(0, 1), (2, 3), (4, 4), (5, 5)])
+    rscp = bisimulation_by_components(edges, nvertexes=7, workers=2)
+    assert to_set(rscp) == to_set([(0, 2), (1, 3, 6), (4, 5)])
+
+
+def test_bisimulation_by_components_non_integer():
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("e", "e"), ("f", "f")])
+    rscp = bisimulation_by_components(
+        graph, [("a", "c", "e"), ("b", "d", "f")], workers=2
+    )
+    assert to_set(rscp) == to_set([("a", "c"), ("b", "d"), ("e",), ("f",)])
+
+
+def test_assign_components():
+    # components of size 5, 1, 1, 1, 1 (vertexes), without edges
+    component = np.array([0, 0, 0, 0, 0, 1, 2, 3, 4])
+    shard = assign_components(component, np.array([], dtype=int), 2)
+
+    assert all(shard[:5] == shard[0])
+    assert all(shard[5:] != shard[0])
+
+
+def test_coarsen_union():
+    # two copies of the same chain, whose blocks are not merged yet
+    sources = np.array([0, 1, 3, 4])
+    destinations = np.array([1, 2, 4, 5])
+    block = np.zeros(6, dtype=int)
+    union_block = np.array([0, 1, 2, 3, 4, 5])
+
+    rscp_block = coarsen_union(sources, destinations, block, union_block)
+    assert to_set(
+        tuple(np.flatnonzero(rscp_block == idx))
+        for idx in range(rscp_block.max() + 1)
+    ) == to_set([(0, 3), (1, 4), (2, 5)])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("seed", range(5))
+def test_bisimulation_by_components_output_labels(seed, workers):
+    graph, initial_partition = random_graph_partition(seed)
+    forest = nx.disjoint_union(graph, graph)
+    initial_partition = [
+        tuple(block) + tuple(vertex + len(graph) for vertex in block)
+        for block in initial_partition
+    ]
+
+    block = bisimulation_by_components(
+        forest, initial_partition, workers=workers, output="labels"
+    )
+    assert set(block.tolist()) == set(range(block.max() + 1))
+    assert to_set(block_array_to_tuple_list(block)) == to_set(
+        paige_tarjan(forest, initial_partition)
+    )
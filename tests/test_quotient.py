@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+from bispy import paige_tarjan, dovier_piazza_policriti, quotient
+from bispy.utilities.quotient import quotient_edges, vertexes_to_edge_arrays
+from bispy.utilities.graph_decorator import decorate_nx_graph
+from tests.paige_tarjan.random_graphs import random_graph_partition
+
+
+def naive_quotient(graph, partition):
+    block = {
+        node: idx for idx, nodes in enumerate(partition) for node in nodes
+    }
+    return set((block[source], block[dest]) for source, dest in graph.edges)
+
+
+def test_quotient_edges():
+    sources = np.array([0, 1, 2, 3, 3])
+    destinations = np.array([2, 3, 2, 0, 1])
+    block = np.array([0, 0, 1, 2])
+
+    quotient_sources, quotient_destinations = quotient_edges(
+        sources, destinations, block
+    )
+    assert quotient_sources.tolist() == [0, 0, 1, 2]
+    assert quotient_destinations.tolist() == [1, 2, 1, 0]
+
+
+def test_vertexes_to_edge_arrays():
+    graph = nx.DiGraph([(0, 1), (0, 2), (2, 1)])
+    vertexes, _ = decorate_nx_graph(graph)
+    sources, destinations = vertexes_to_edge_arrays(vertexes)
+    assert set(zip(sources.tolist(), destinations.tolist())) == set(
+        graph.edges
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_quotient(seed):
+    graph, initial_partition = random_graph_partition(seed)
+    rscp = paige_tarjan(graph, initial_partition)
+
+    quotient_graph = quotient(graph, rscp)
+    assert set(quotient_graph.nodes) == set(range(len(rscp)))
+    assert set(quotient_graph.edges) == naive_quotient(graph, rscp)
+
+    edges = np.array(list(graph.edges), dtype=int).reshape(-1, 2)
+    quotient_sources, quotient_destinations = quotient(
+        edges, rscp, nvertexes=len(graph), as_arrays=True
+    )
+    assert set(
+        zip(quotient_sources.tolist(), quotient_destinations.tolist())
+    ) == naive_quotient(graph, rscp)
+
+
+def test_quotient_non_integer():
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("d", "e")])
+    quotient_graph = quotient(graph, [("a", "d"), ("c",), ("b", "e")])
+    assert set(quotient_graph.edges) == set([(0, 2), (1, 0)])
+
+
+@pytest.mark.parametrize(
+    "algorithm, kwargs",
+    [
+        (paige_tarjan, {}),
+        (paige_tarjan, {"engine": "array"}),
+        (paige_tarjan, {"engine": "signature"}),
+        (paige_tarjan, {"max_depth": 2}),
+        (dovier_piazza_policriti, {}),
+        (dovier_piazza_policriti, {"max_depth": 2}),
+    ],
+)
+@pytest.mark.parametrize("seed", range(10))
+def test_return_quotient(seed, algorithm, kwargs):
+    graph, initial_partition = random_graph_partition(seed)
+    rscp, quotient_graph = algorithm(
+        graph, initial_partition, return_quotient=True, **kwargs
+    )
+    assert set(quotient_graph.nodes) == set(range(len(rscp)))
+    assert set(quotient_graph.edges) == naive_quotient(graph, rscp)
+
+    block, (quotient_sources, quotient_destinations) = algorithm(
+        graph,
+        initial_partition,
+        return_quotient=True,
+        output="labels",
+        **kwargs
+    )
+    assert set(
+        zip(quotient_sources.tolist(), quotient_destinations.tolist())
+    ) == set(
+        (int(block[source]), int(block[dest]))
+        for source, dest in graph.edges
+    )
+
+
+@pytest.mark.parametrize("algorithm", [paige_tarjan, dovier_piazza_policriti])
+def test_return_quotient_edge_list(algorithm):
+    edges = np.array([(0, 1), (0, 2), (1, 3), (2, 4)])
+    rscp, quotient_graph = algorithm(edges, nvertexes=6, return_quotient=True)
+    assert set(quotient_graph.edges) == naive_quotient(
+        nx.DiGraph(edges.tolist()), rscp
+    )
+
+
+def test_return_quotient_edge_labels():
+    with pytest.raises(ValueError):
+        paige_tarjan(
+            nx.DiGraph([(0, 1)]),
+            engine="array",
+            edge_labels=["a"],
+            return_quotient=True,
+        )
@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+import networkx as nx
+
+from bispy import paige_tarjan
+from bispy.utilities.snapshot import (
+    save_partition,
+    load_partition,
+    nodes_to_array,
+    array_to_nodes,
+    vertexes_to_arrays,
+    arrays_to_vertexes,
+)
+from bispy.utilities.graph_decorator import decorate_nx_graph, to_set
+from tests.paige_tarjan.random_graphs import random_graph_partition
+
+
+def test_nodes_to_array():
+    nodes = ["a", (1, 2), None, 3]
+    assert array_to_nodes(nodes_to_array(nodes)) == nodes
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vertexes_to_arrays(seed):
+    graph, initial_partition = random_graph_partition(seed)
+    vertexes, _ = decorate_nx_graph(graph, initial_partition)
+
+    loaded, position = arrays_to_vertexes(vertexes_to_arrays(vertexes))
+    assert position is None
+    for vertex, loaded_vertex in zip(vertexes, loaded):
+        assert loaded_vertex.label == vertex.label
+        assert loaded_vertex.rank == vertex.rank
+        assert loaded_vertex.wf == vertex.wf
+        assert loaded_vertex.scc.label == vertex.scc.label
+        assert (
+            loaded_vertex.initial_partition_block_id
+            == vertex.initial_partition_block_id
+        )
+        assert [
+            (edge.source.label, edge.destination.label)
+            for edge in loaded_vertex.counterimage
+        ] == [
+            (edge.source.label, edge.destination.label)
+            for edge in vertex.counterimage
+        ]
+        # counterimages share the edges of the images
+        for edge in loaded_vertex.counterimage:
+            assert any(edge is other for other in edge.source.image)
+
+
+@pytest.mark.parametrize("output", ["tuples", "labels"])
+def test_save_load_partition(tmp_path, output):
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    rscp = paige_tarjan(graph, output=output)
+    save_partition(tmp_path / "rscp.npz", rscp)
+
+    loaded = load_partition(tmp_path / "rscp.npz", output=output)
+    if output == "labels":
+        assert np.array_equal(loaded, rscp)
+    else:
+        assert to_set(loaded) == to_set(rscp)
+
+
+def test_save_load_partition_non_integer(tmp_path):
+    graph = nx.DiGraph([("a", "b"), ("c", "d"), ("d", "e")])
+    rscp = paige_tarjan(graph)
+    save_partition(tmp_path / "rscp.npz", rscp)
+    assert to_set(load_partition(tmp_path / "rscp.npz")) == to_set(rscp)
+
+    save_partition(tmp_path / "rscp.npz", paige_tarjan(graph, output="labels"))
+    block, node_index = load_partition(tmp_path / "rscp.npz", output="labels")
+    assert block[node_index.index("b")] == block[node_index.index("e")]
+    assert to_set(load_partition(tmp_path / "rscp.npz")) == to_set(rscp)
@@ -0,0 +1,99 @@
+import json
+import pytest
+import networkx as nx
+
+import tests.paige_tarjan.paige_tarjan_test_cases as test_cases
+from bispy import paige_tarjan, dovier_piazza_policriti, saha
+from bispy.utilities.graph_decorator import to_set
+from bispy.utilities.stats import Stats
+
+
+@pytest.mark.parametrize("engine", ["object", "array"])
+@pytest.mark.parametrize(
+    "graph, initial_partition, expected_q_partition",
+    test_cases.graph_partition_rscp_tuples,
+)
+def test_paige_tarjan_stats(
+    graph, initial_partition, expected_q_partition, engine
+):
+    stats = Stats()
+    rscp = paige_tarjan(graph, initial_partition, engine=engine, stats=stats)
+    assert to_set(rscp) == to_set(expected_q_partition)
+
+    assert "decorate" in stats.phase_time
+    iterations = stats.counters.get("refine_iterations", 0)
+    if engine == "object":
+        assert len(stats.splitter_sizes) == iterations
+    # each splitter contains at least one vertex
+    assert sum(stats.splitter_sizes) >= iterations
+    assert all(time >= 0 for time in stats.phase_time.values())
+
+
+def test_paige_tarjan_phases():
+    stats = Stats()
+    paige_tarjan(nx.balanced_tree(2, 3, create_using=nx.DiGraph), stats=stats)
+    assert set(stats.phase_time) == set(
+        [
+            "decorate",
+            "extract_splitter",
+            "build_block_counterimage",
+            "split",
+            "build_exclusive_B_counterimage",
+            "update_counts",
+        ]
+    )
+    assert stats.counters["refine_iterations"] == 3
+    # a splitter contains at most half of the vertexes of its block of X
+    assert len(stats.splitter_sizes) == 3
+    assert max(stats.splitter_sizes) <= 7
+
+
+def test_dovier_piazza_policriti_stats():
+    graph = nx.balanced_tree(2, 3, create_using=nx.DiGraph)
+    graph.add_edges_from([(14, 14), (13, 0)])
+
+    stats = Stats()
+    rscp = dovier_piazza_policriti(graph, stats=stats)
+    assert to_set(rscp) == to_set(paige_tarjan(graph))
+
+    # a class for each rank, including -inf
+    assert float("-inf") in stats.rank_time
+    assert set(stats.rank_time[0]) <= set(
+        ["collapse", "split_upper_ranks", "pta"]
+    )
+    for phase in ["collapse", "split_upper_ranks", "pta"]:
+        assert stats.phase_time[phase] == pytest.approx(
+            sum(
+                phases.get(phase, 0)
+                for phases in stats.rank_time.values()
+            )
+        )
+
+
+def test_saha_stats():
+    events = []
+    stats = Stats(callback=lambda *event: events.append(event))
+
+    partition = saha([(0, 1), (1, 2), (3, 4)], nvertexes=5, stats=stats)
+    partition.add_edge((4, 0))
+    partition.add_edge((2, 0))
+    partition.remove_edge((2, 0))
+
+    assert stats.counters["added_edges"] == 2
+    assert stats.counters["removed_edges"] == 1
+    for phase in ["ranked_split", "condensation", "remove_edges"]:
+        assert phase in stats.phase_time
+
+    assert len(events) > 0
+    for phase, elapsed, rank in events:
+        assert phase in stats.phase_time and elapsed >= 0 and rank is None
+
+
+def test_as_dict():
+    stats = Stats()
+    dovier_piazza_policriti(
+        nx.balanced_tree(2, 3, create_using=nx.DiGraph), stats=stats
+    )
+    report = json.loads(json.dumps(stats.as_dict()))
+    assert report["splitter_sizes"]["count"] == len(stats.splitter_sizes)
+    assert "-inf" in report["rank_time"]